@@ -1,80 +1,117 @@
-"""
-Path: run.py
-
-"""
-
-import os
-from flask import Flask
-from flask_cors import CORS
-from dotenv import load_dotenv
-from src.controllers.data_controller import data_controller
-from src.model.database_connector import DatabaseConnector
-from src.model.database_initializer import DatabaseInitializer
-from src.model.table_creator import TableCreator
-from src.logs.config_logger import LoggerConfigurator
-from src.services.ssl_cert_service import create_self_signed_cert
-
-# Configuración del logger al inicio del script
-logger = LoggerConfigurator().configure()
-logger.debug("Logger configurado correctamente al inicio del servidor.")
-
-# Cargar variables de entorno desde el archivo .env
-try:
-    logger.debug("Intentando cargar el archivo .env")
-    if not load_dotenv():
-        raise FileNotFoundError(".env file not found")
-    logger.debug(".env file cargado correctamente")
-except FileNotFoundError as e:
-    logger.error("Error loading .env file: %s", e)
-    logger.debug("Asegúrate de que el archivo .env existe en el directorio raíz del proyecto")
-    print("Please create a .env file with the necessary environment variables.")
-    exit(1)
-
-app = Flask(__name__)
-CORS(app)
-
-
-# Inicializar la base de datos y las tablas
-try:
-    db_connector = DatabaseConnector()
-    table_creator = TableCreator()
-    db_initializer = DatabaseInitializer(db_connector, table_creator)
-    db_initializer.initialize_database()
-    logger.info("Base de datos inicializada correctamente.")
-except Exception as e:
-    logger.error("Error al inicializar la base de datos: %s", e)
-    exit(1)
-
-# Registrar el blueprint del controlador
-try:
-    app.register_blueprint(data_controller)
-    logger.info("Blueprint registrado correctamente.")
-except Exception as e:
-    logger.error("Error al registrar el blueprint: %s", e)
-    exit(1)
-
-# Verificar y crear certificados SSL si no existen
-cert_file = 'cert.pem'
-key_file = 'key.pem'
-if not os.path.isfile(cert_file) or not os.path.isfile(key_file):
-    logger.info("Certificados SSL no encontrados. Creando nuevos certificados...")
-    create_self_signed_cert(cert_file, key_file)
-    logger.info("Certificados SSL creados correctamente.")
-
-if __name__ == '__main__':
-    is_https = os.getenv('IS_HTTPS', 'false').lower() == 'true'
-
-    try:
-        if is_https:
-            # Iniciar el servidor HTTPS
-            app.run(host='0.0.0.0', port=5000, ssl_context=(cert_file, key_file))
-            logger.info("Servidor configurado para HTTPS.")
-        else:
-            # Iniciar el servidor HTTP
-            app.run(host='0.0.0.0', port=5000)
-            logger.info("Servidor configurado para HTTP.")
-    except FileNotFoundError as e:
-        logger.error("Error al cargar los archivos SSL: %s", e)
-        print("Please ensure 'cert.pem' and 'key.pem' files are present.")
-    except Exception as e:
+"""
+Path: run.py
+
+"""
+
+import os
+from src.services.startup_metrics import startup_metrics
+from flask import Flask
+from flask_cors import CORS
+from dotenv import load_dotenv
+from src.controllers.data_controller import PUBLIC_CORS_RESOURCES, data_controller, response_generator
+from src.model.database_connector_factory import create_database_connector, create_table_creator
+from src.model.database_initializer import DatabaseInitializer
+from src.logs.config_logger import LoggerConfigurator
+from src.services.conversation_writer import ConversationWriter
+from src.services.history_service import ConversationHistoryService
+from src.services.retention_service import RetentionJob
+from src.services.user_identity_service import UserIdentityService
+
+# Configuración del logger al inicio del script
+logger = LoggerConfigurator().configure()
+logger.debug("Logger configurado correctamente al inicio del servidor.")
+
+# Cargar variables de entorno desde el archivo .env
+try:
+    logger.debug("Intentando cargar el archivo .env")
+    if not load_dotenv():
+        raise FileNotFoundError(".env file not found")
+    logger.debug(".env file cargado correctamente")
+except FileNotFoundError as e:
+    logger.error("Error loading .env file: %s", e)
+    logger.debug("Asegúrate de que el archivo .env existe en el directorio raíz del proyecto")
+    print("Please create a .env file with the necessary environment variables.")
+    exit(1)
+
+app = Flask(__name__)
+CORS(app, resources=PUBLIC_CORS_RESOURCES)
+startup_metrics.mark('imports')
+
+# Inicializar el modelo de lenguaje (env LLM_WARMUP: background, eager o lazy)
+response_generator.start_warm_up()
+
+
+# Inicializar la base de datos y las tablas (env DB_INIT_MODE: background o blocking).
+# En background el servidor atiende el chat mientras el esquema se verifica con reintentos.
+try:
+    # Conector y estrategia de tablas según DB_BACKEND (mysql o sqlite)
+    db_connector = create_database_connector()
+    db_initializer = DatabaseInitializer(db_connector, create_table_creator())
+except Exception as e:
+    logger.error("Error al inicializar la base de datos: %s", e)
+    exit(1)
+if os.getenv('DB_INIT_MODE', 'background').lower() == 'blocking':
+    if not db_initializer.initialize_with_retry():
+        exit(1)
+    startup_metrics.mark('database')
+else:
+    db_initializer.start_background(on_ready=lambda: startup_metrics.mark('database'))
+app.extensions['database_initializer'] = db_initializer
+
+# Caché de ids de usuario compartida por el escritor y el historial
+user_identity = UserIdentityService()
+
+# Iniciar la persistencia diferida de conversaciones
+if os.getenv('CONVERSATION_LOG_ENABLED', 'true').lower() == 'true':
+    conversation_writer = ConversationWriter(db_connector, schema_ready=db_initializer.ready,
+                                             identity_service=user_identity)
+    conversation_writer.start()
+    app.extensions['conversation_writer'] = conversation_writer
+
+# Servicio de consulta del historial de conversaciones
+app.extensions['history_service'] = ConversationHistoryService(db_connector,
+                                                               schema_ready=db_initializer.ready,
+                                                               identity_service=user_identity)
+
+# Archivo y borrado periódico de mensajes vencidos (conviene activarlo en un solo proceso)
+if os.getenv('RETENTION_ENABLED', 'false').lower() == 'true':
+    retention_job = RetentionJob(db_connector, schema_ready=db_initializer.ready)
+    retention_job.start()
+    app.extensions['retention_job'] = retention_job
+
+# Registrar el blueprint del controlador
+try:
+    app.register_blueprint(data_controller)
+    logger.info("Blueprint registrado correctamente.")
+except Exception as e:
+    logger.error("Error al registrar el blueprint: %s", e)
+    exit(1)
+
+# Verificar y crear certificados SSL si no existen
+cert_file = 'cert.pem'
+key_file = 'key.pem'
+if not os.path.isfile(cert_file) or not os.path.isfile(key_file):
+    logger.info("Certificados SSL no encontrados. Creando nuevos certificados...")
+    # Importado solo cuando hace falta: carga la librería cryptography.
+    from src.services.ssl_cert_service import create_self_signed_cert  # pylint: disable=import-outside-toplevel
+    create_self_signed_cert(cert_file, key_file)
+    logger.info("Certificados SSL creados correctamente.")
+
+if __name__ == '__main__':
+    is_https = os.getenv('IS_HTTPS', 'false').lower() == 'true'
+    startup_metrics.mark('ready')
+
+    try:
+        if is_https:
+            # Iniciar el servidor HTTPS
+            app.run(host='0.0.0.0', port=5000, ssl_context=(cert_file, key_file))
+            logger.info("Servidor configurado para HTTPS.")
+        else:
+            # Iniciar el servidor HTTP
+            app.run(host='0.0.0.0', port=5000)
+            logger.info("Servidor configurado para HTTP.")
+    except FileNotFoundError as e:
+        logger.error("Error al cargar los archivos SSL: %s", e)
+        print("Please ensure 'cert.pem' and 'key.pem' files are present.")
+    except Exception as e:
         logger.error("Error al iniciar el servidor Flask: %s", e)
\ No newline at end of file
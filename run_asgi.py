@@ -0,0 +1,97 @@
+"""
+Path: run_asgi.py
+Inicia MadyBot en modo ASGI con uvicorn: las rutas son las mismas que en run.py,
+pero las llamadas al modelo se atienden sobre un event loop.
+"""
+
+import os
+from src.services.startup_metrics import startup_metrics
+import uvicorn
+from dotenv import load_dotenv
+from src.model.database_connector_factory import create_database_connector, create_table_creator
+from src.model.database_initializer import DatabaseInitializer
+from src.logs.config_logger import LoggerConfigurator
+from src.services.conversation_writer import ConversationWriter
+from src.services.history_service import ConversationHistoryService
+from src.services.retention_service import RetentionJob
+from src.services.user_identity_service import UserIdentityService
+
+# Configuración del logger al inicio del script
+logger = LoggerConfigurator().configure()
+
+# Cargar variables de entorno desde el archivo .env
+if not load_dotenv():
+    logger.error("Error loading .env file: .env file not found")
+    print("Please create a .env file with the necessary environment variables.")
+    exit(1)
+
+# pylint: disable=wrong-import-position
+from src.controllers.asgi_controller import AsgiChatApp
+startup_metrics.mark('imports')
+
+# Inicializar la base de datos y las tablas (env DB_INIT_MODE: background o blocking).
+# En background el servidor atiende el chat mientras el esquema se verifica con reintentos.
+try:
+    # Conector y estrategia de tablas según DB_BACKEND (mysql o sqlite)
+    db_connector = create_database_connector()
+    db_initializer = DatabaseInitializer(db_connector, create_table_creator())
+except Exception as e:
+    logger.error("Error al inicializar la base de datos: %s", e)
+    exit(1)
+if os.getenv('DB_INIT_MODE', 'background').lower() == 'blocking':
+    if not db_initializer.initialize_with_retry():
+        exit(1)
+    startup_metrics.mark('database')
+else:
+    db_initializer.start_background(on_ready=lambda: startup_metrics.mark('database'))
+
+# Caché de ids de usuario compartida por el escritor y el historial
+user_identity = UserIdentityService()
+
+# Iniciar la persistencia diferida de conversaciones
+conversation_writer = None
+if os.getenv('CONVERSATION_LOG_ENABLED', 'true').lower() == 'true':
+    conversation_writer = ConversationWriter(db_connector, schema_ready=db_initializer.ready,
+                                             identity_service=user_identity)
+    conversation_writer.start()
+
+# Archivo y borrado periódico de mensajes vencidos (conviene activarlo en un solo proceso)
+retention_job = None
+if os.getenv('RETENTION_ENABLED', 'false').lower() == 'true':
+    retention_job = RetentionJob(db_connector, schema_ready=db_initializer.ready)
+    retention_job.start()
+
+app = AsgiChatApp(
+    conversation_writer=conversation_writer,
+    history_service=ConversationHistoryService(db_connector, schema_ready=db_initializer.ready,
+                                               identity_service=user_identity),
+    database_initializer=db_initializer,
+    retention_job=retention_job
+)
+
+# Inicializar el modelo de lenguaje (env LLM_WARMUP: background, eager o lazy)
+app.response_generator.start_warm_up()
+
+if __name__ == '__main__':
+    is_https = os.getenv('IS_HTTPS', 'false').lower() == 'true'
+    ssl_options = {}
+    if is_https:
+        cert_file = 'cert.pem'
+        key_file = 'key.pem'
+        if not os.path.isfile(cert_file) or not os.path.isfile(key_file):
+            logger.info("Certificados SSL no encontrados. Creando nuevos certificados...")
+            # Importado solo cuando hace falta: carga la librería cryptography.
+            from src.services.ssl_cert_service import create_self_signed_cert  # pylint: disable=import-outside-toplevel
+            create_self_signed_cert(cert_file, key_file)
+        ssl_options = {'ssl_certfile': cert_file, 'ssl_keyfile': key_file}
+
+    uvicorn.run(
+        app,
+        host='0.0.0.0',
+        port=int(os.getenv('PORT', '5000')),
+        # Tope de conexiones abiertas; por encima uvicorn responde 503 de inmediato.
+        limit_concurrency=int(os.getenv('ASGI_MAX_CONNECTIONS', '10000')),
+        timeout_graceful_shutdown=int(float(os.getenv('ASGI_SHUTDOWN_TIMEOUT', '30'))),
+        log_config=None,
+        **ssl_options
+    )
@@ -0,0 +1,416 @@
+"""
+Path: src/controllers/asgi_controller.py
+Este módulo expone las mismas rutas que data_controller como una aplicación ASGI,
+para atenderlas sobre un event loop sin bloquear un hilo por cada llamada al modelo.
+"""
+
+import asyncio
+import json
+import math
+import os
+from urllib.parse import parse_qs, unquote
+from marshmallow import ValidationError
+from src.logs.config_logger import LoggerConfigurator
+from src.logs.request_event_logger import CLIENT_CLOSED_REQUEST, RequestEventLogger
+from src.services.data_validator import DataSchemaValidator
+from src.services.response_generator import ResponseGenerator
+from src.services.batch_processor import BatchProcessor, describe_error
+from src.services.admission_controller import AdmissionController, AdmissionRejectedError
+from src.services.admin_auth import AdminTokenAuth
+from src.services.circuit_breaker import CircuitOpenError
+from src.services.startup_metrics import startup_metrics
+from src.views.asgi_view import (
+    send_json, send_json_response, send_empty_response, send_redirect, send_stream_response,
+    send_batch_stream_response, send_ndjson_stream_response, send_rejection_response
+)
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+request_event_logger = RequestEventLogger(logger)
+
+MAX_BODY_BYTES = 1024 * 1024
+
+async def _prepend_chunk(first_chunk, chunks):
+    "Vuelve a anteponer el primer fragmento ya leído; al cerrarse cierra también el original."
+    try:
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await chunks.aclose()
+
+async def _log_stream(chunks, route, started, data):
+    """
+    Reenvía los fragmentos y registra el evento de la solicitud cuando el stream termina:
+    200 si se completó, 499 si el cliente se desconectó y el código del error si falló.
+    """
+    size = 0
+    status, error = 200, None
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    except (GeneratorExit, asyncio.CancelledError):
+        status, error = CLIENT_CLOSED_REQUEST, "El cliente se desconectó durante el streaming."
+        raise
+    except Exception as e:
+        status, error = describe_error(e)[1], e
+        raise
+    finally:
+        await chunks.aclose()
+        request_event_logger.emit(route, status, started, data, response=size, error=error)
+
+async def _log_batch(results, route, started, item_count):
+    "Reenvía los resultados del lote y registra el evento con la cantidad de items fallidos."
+    failed = 0
+    try:
+        async for result in results:
+            if result['code'] != 200:
+                failed += 1
+            yield result
+    finally:
+        await results.aclose()
+        request_event_logger.emit(route, 200, started, items=item_count, failed_items=failed)
+
+async def _record_stream(chunks, data, writer):
+    "Reenvía los fragmentos y, si el stream termina completo, encola el intercambio para persistirlo."
+    parts = []
+    try:
+        async for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+    finally:
+        await chunks.aclose()
+    await writer.enqueue_async(data['user_data']['id'], data['prompt_user'], ''.join(parts))
+
+async def _record_batch(results, items, writer):
+    "Reenvía los resultados del lote y encola para persistir cada item respondido con éxito."
+    try:
+        async for result in results:
+            if result['code'] == 200:
+                data = items[result['index']][0]
+                await writer.enqueue_async(data['user_data']['id'], data['prompt_user'],
+                                           result['response_MadyBot'])
+            yield result
+    finally:
+        await results.aclose()
+
+def _without_cors(send):
+    "Envuelve `send` para quitar Access-Control-Allow-Origin de las respuestas de uso interno."
+    async def send_private(message):
+        if message['type'] == 'http.response.start':
+            message = dict(message, headers=[(name, value) for name, value in message['headers']
+                                             if name != b'access-control-allow-origin'])
+        await send(message)
+    return send_private
+
+
+class AsgiChatApp:
+    """
+    Aplicación ASGI de MadyBot.
+
+    Las llamadas al modelo se esperan con `await`, por lo que miles de generaciones lentas
+    pueden estar en curso en un mismo proceso. Un semáforo limita cuántas se atienden a la
+    vez (env ASGI_MAX_CONCURRENCY) y, al apagarse, la aplicación deja de aceptar solicitudes
+    nuevas y espera a las que siguen en curso (env ASGI_SHUTDOWN_TIMEOUT). Las llamadas al
+    modelo pasan además por un AdmissionController (env ADMISSION_ENABLED), que rechaza con
+    429/503 lo que excede sus límites.
+    """
+
+    def __init__(self, response_generator=None, data_validator=None,
+                 max_concurrency=None, shutdown_timeout=None, conversation_writer=None,
+                 history_service=None, admission_controller=None, database_initializer=None,
+                 retention_job=None, history_auth=None):
+        self.response_generator = response_generator or ResponseGenerator()
+        self.history_auth = history_auth or AdminTokenAuth()
+        self.retention_job = retention_job
+        self.conversation_writer = conversation_writer
+        self.history_service = history_service
+        self.database_initializer = database_initializer
+        self.database_retry_after = int(os.getenv('DB_INIT_RETRY_AFTER', '5'))
+        self.data_validator = data_validator or DataSchemaValidator()
+        if admission_controller is None and os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true':
+            admission_controller = AdmissionController()
+        self.admission_controller = admission_controller
+        self.batch_processor = BatchProcessor(self.response_generator,
+                                              admission_controller=admission_controller)
+        self.max_concurrency = max_concurrency or int(os.getenv('ASGI_MAX_CONCURRENCY', '1000'))
+        self.shutdown_timeout = shutdown_timeout or float(os.getenv('ASGI_SHUTDOWN_TIMEOUT', '30'))
+        self._semaphore = None
+        self._in_flight = 0
+        self._idle = None
+        self._shutting_down = False
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        if self._shutting_down:
+            await send_json_response(send, 503, "El servidor se está apagando.")
+            return
+        self._ensure_primitives()
+        startup_metrics.record_first_request()
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            await self._dispatch(scope, receive, send)
+            startup_metrics.record_first_response()
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+
+    def _ensure_primitives(self):
+        """Crea las primitivas de asyncio dentro del event loop en ejecución."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._idle = asyncio.Event()
+            self._idle.set()
+
+    async def _lifespan(self, receive, send):
+        """Atiende los eventos de arranque y apagado del servidor ASGI."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._ensure_primitives()
+                startup_metrics.mark('ready')
+                logger.info("Aplicación ASGI iniciada (concurrencia máxima: %d).", self.max_concurrency)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def shutdown(self):
+        """Deja de aceptar solicitudes y espera a que terminen las que están en curso."""
+        self._shutting_down = True
+        self._ensure_primitives()
+        logger.info("Apagando la aplicación ASGI, %d solicitudes en curso.", self._in_flight)
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            logger.error("Tiempo de apagado agotado con %d solicitudes en curso.", self._in_flight)
+        if self.database_initializer is not None:
+            self.database_initializer.stop()
+        if self.conversation_writer is not None:
+            await asyncio.to_thread(self.conversation_writer.stop)
+
+    async def _dispatch(self, scope, receive, send):
+        """Resuelve la ruta y el método de la solicitud."""
+        path = scope['path']
+        method = scope['method']
+        url_frontend = os.getenv('URL_FRONTEND')
+        if path in ('/', '/None') and method == 'GET':
+            await send_redirect(send, url_frontend)
+        elif path == '/receive-data' and method == 'HEAD':
+            await send_empty_response(send, 200)
+        elif path == '/receive-data' and method == 'GET':
+            await send_redirect(send, url_frontend)
+        elif path == '/receive-data' and method == 'POST':
+            await self._receive_data(scope, receive, send)
+        elif path == '/receive-data/batch' and method == 'POST':
+            await self._receive_data_batch(receive, send)
+        elif path == '/health-check' and method == 'GET':
+            logger.info("Health check solicitado. El servidor está funcionando correctamente.")
+            await send_json_response(send, 200, "El servidor está operativo.")
+        elif path == '/stats' and method == 'GET':
+            stats = self.response_generator.get_stats()
+            if self.admission_controller is not None:
+                stats['admission'] = self.admission_controller.get_stats()
+            if self.conversation_writer is not None:
+                stats['conversation_writer'] = self.conversation_writer.get_stats()
+            logging_stats = LoggerConfigurator().get_stats()
+            if logging_stats is not None:
+                stats['logging'] = logging_stats
+            if self.database_initializer is not None:
+                stats['database'] = self.database_initializer.get_stats()
+            if self.history_service is not None:
+                stats['user_identity'] = self.history_service.identity_service.get_stats()
+            if self.retention_job is not None:
+                stats['retention'] = self.retention_job.get_stats()
+            stats['startup'] = startup_metrics.get_stats()
+            await send_json(send, 200, stats)
+        elif path.startswith('/history/') and method == 'GET':
+            await self._history(scope, _without_cors(send))
+        else:
+            await send_json_response(send, 404, "Recurso no encontrado.")
+
+    @staticmethod
+    async def _read_body(receive):
+        """Lee el cuerpo completo de la solicitud, con un límite de tamaño."""
+        body = b''
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                raise ConnectionError("El cliente se desconectó antes de enviar el cuerpo.")
+            body += message.get('body', b'')
+            if len(body) > MAX_BODY_BYTES:
+                raise ValueError("El cuerpo de la solicitud es demasiado grande.")
+            more_body = message.get('more_body', False)
+        return body
+
+    async def _receive_data(self, scope, receive, send):
+        "Recibe un mensaje y un ID de usuario y responde con un JSON."
+        route = 'POST /receive-data'
+        started = request_event_logger.start()
+        try:
+            body = await self._read_body(receive)
+            payload = json.loads(body or b'null')
+            data = self.data_validator.validate(payload)
+        except ConnectionError as e:
+            logger.info("%s", e)
+            return
+        except (ValueError, ValidationError) as err:
+            logger.warning("Error de validación en la solicitud: %s", err)
+            request_event_logger.emit(route, 400, started, error=err)
+            await send_json_response(send, 400, "Datos inválidos en la solicitud.")
+            return
+        headers = dict(scope.get('headers') or [])
+        ndjson = b'application/x-ndjson' in headers.get(b'accept', b'')
+        user_id = data['user_data']['id']
+        use_cache = not data['no_cache']
+        if self.admission_controller is not None:
+            try:
+                await self.admission_controller.acquire_async(user_id)
+            except AdmissionRejectedError as e:
+                request_event_logger.emit(route, e.status, started, data, error=e)
+                await send_rejection_response(send, e.status, str(e), e.retry_after)
+                return
+        error = None
+        retry_after = None
+        try:
+            async with self._semaphore:
+                try:
+                    if data.get('stream'):
+                        logger.info("Generando respuesta en modo streaming.")
+                        chunks = self.response_generator.generate_response_streaming_async(
+                            data['prompt_user'], user_id, use_cache=use_cache)
+                        first_chunk = await anext(chunks, '')
+                        chunks = _prepend_chunk(first_chunk, chunks)
+                        if self.conversation_writer is not None:
+                            chunks = _record_stream(chunks, data, self.conversation_writer)
+                        chunks = _log_stream(chunks, route, started, data)
+                        await send_stream_response(send, chunks, ndjson=ndjson)
+                        return
+                    logger.info("Generando respuesta en modo normal.")
+                    message_output = await self.response_generator.generate_response_async(
+                        data['prompt_user'], user_id, use_cache=use_cache)
+                    if self.conversation_writer is not None:
+                        await self.conversation_writer.enqueue_async(user_id, data['prompt_user'], message_output)
+                    code = 200
+                except CircuitOpenError as e:
+                    message_output = str(e)
+                    logger.info("Solicitud rechazada con el circuito abierto: %s", e)
+                    code = 503
+                    error = e
+                    retry_after = max(1, math.ceil(e.retry_after))
+                except (ConnectionError, TimeoutError) as e:
+                    message_output = "Error de conexión al generar la respuesta."
+                    logger.error("Error de conexión: %s", e)
+                    code = 503  # Servicio no disponible
+                    error = e
+                except RuntimeError as e:
+                    message_output = "Error de ejecución en el generador de respuesta."
+                    logger.error("Error de ejecución: %s", e)
+                    code = 500
+                    error = e
+                except Exception as e:  # pylint: disable=W0718
+                    message_output = "Error desconocido en la generación de la respuesta."
+                    logger.error("Error no anticipado: %s", e)
+                    code = 500
+                    error = e
+        finally:
+            if self.admission_controller is not None:
+                self.admission_controller.release()
+        request_event_logger.emit(route, code, started, data,
+                                  response=message_output if error is None else None, error=error)
+        if retry_after is not None:
+            await send_rejection_response(send, code, message_output, retry_after)
+            return
+        await send_json_response(send, code, message_output)
+
+    async def _receive_data_batch(self, receive, send):
+        "Recibe un lote de mensajes y responde con el resultado de cada uno."
+        route = 'POST /receive-data/batch'
+        started = request_event_logger.start()
+        try:
+            body = await self._read_body(receive)
+            envelope, items = self.data_validator.validate_batch(json.loads(body or b'null'))
+        except ConnectionError as e:
+            logger.info("%s", e)
+            return
+        except (ValueError, ValidationError) as err:
+            logger.warning("Error de validación en el lote: %s", err)
+            request_event_logger.emit(route, 400, started, error=err)
+            await send_json_response(send, 400, "Datos inválidos en la solicitud.")
+            return
+        logger.info("Lote recibido con %d items.", len(items))
+        try:
+            self.batch_processor.admit(items)
+        except AdmissionRejectedError as e:
+            request_event_logger.emit(route, e.status, started, items=len(items), error=e)
+            await send_rejection_response(send, e.status, str(e), e.retry_after)
+            return
+        async with self._semaphore:
+            results = _log_batch(self.batch_processor.process_async(items), route, started, len(items))
+            if self.conversation_writer is not None:
+                results = _record_batch(results, items, self.conversation_writer)
+            if envelope['stream']:
+                await send_batch_stream_response(send, results)
+                return
+            collected = [result async for result in results]
+        collected.sort(key=lambda result: result['index'])
+        await send_json(send, 200, {"results": collected})
+
+    async def _history(self, scope, send):
+        """
+        Atiende /history/<user_id> (una página) y /history/<user_id>/export (NDJSON completo),
+        con `Authorization: Bearer <HISTORY_ADMIN_TOKEN>`. Las consultas a la base de datos se
+        ejecutan en un hilo para no bloquear el event loop.
+        """
+        headers = dict(scope.get('headers') or [])
+        rejection = self.history_auth.check(headers.get(b'authorization', b'').decode('latin-1') or None)
+        if rejection is not None:
+            code, message = rejection
+            await send_json_response(send, code, message,
+                                     [(b'www-authenticate', b'Bearer')] if code == 401 else None)
+            return
+        # Se separa la ruta sin decodificar para que un id con '%2F' no parezca otro segmento.
+        raw_path = scope.get('raw_path') or scope['path'].encode('utf-8')
+        parts = [unquote(part.decode('latin-1')) for part in raw_path[len(b'/history/'):].split(b'/')]
+        export = len(parts) == 2 and parts[1] == 'export'
+        if not parts[0] or not (len(parts) == 1 or export):
+            await send_json_response(send, 404, "Recurso no encontrado.")
+            return
+        user_id = parts[0]
+        if self.history_service is None:
+            await send_json_response(send, 503, "El historial no está disponible.")
+            return
+        if not self.history_service.is_available():
+            await send_rejection_response(send, 503, "El historial no está disponible todavía.",
+                                          self.database_retry_after)
+            return
+        if export:
+            batches = self.history_service.iter_history_batches(user_id)
+            await send_ndjson_stream_response(send, batches)
+            return
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        try:
+            limit = int(query['limit'][0]) if 'limit' in query else None
+            page = await asyncio.to_thread(
+                self.history_service.get_page, user_id,
+                cursor=query.get('cursor', [None])[0], limit=limit,
+                descending=query.get('order', ['asc'])[0] == 'desc'
+            )
+        except ValueError as e:  # Incluye InvalidCursorError del servicio de historial.
+            logger.warning("Parámetros de historial inválidos: %s", e)
+            await send_json_response(send, 400, "Datos inválidos en la solicitud.")
+            return
+        except Exception as e:  # pylint: disable=W0718
+            logger.error("Error al consultar el historial: %s", e)
+            await send_json_response(send, 500, "Error al consultar el historial.")
+            return
+        await send_json(send, 200, page)
@@ -1,89 +1,342 @@
-"""
-Path: src/controllers/data_controller.py
-"""
-
-import os
-from flask import Blueprint, request, redirect
-from flask_cors import CORS
-from marshmallow import ValidationError
-from dotenv import load_dotenv
-from src.views.data_view import render_json_response
-from src.logs.config_logger import LoggerConfigurator
-from src.services.data_validator import DataSchemaValidator
-from src.services.response_generator import ResponseGenerator
-
-# Configuración del logger
-logger = LoggerConfigurator().configure()
-
-load_dotenv()
-
-# Crear un blueprint para el controlador
-data_controller = Blueprint('data_controller', __name__)
-CORS(data_controller)
-
-# Instancias de servicios
-data_validator = DataSchemaValidator()
-response_generator = ResponseGenerator()
-
-@data_controller.route('/', methods=['GET'])
-def redirect_to_frontend():
-    "Redirige a la URL del frontend."
-    url_frontend = os.getenv('URL_FRONTEND')
-    return redirect(url_frontend)
-
-@data_controller.route('/None', methods=['GET'])
-def redirect_to_frontend_none():
-    "Redirige a la URL del frontend."
-    url_frontend = os.getenv('URL_FRONTEND')
-    return redirect(url_frontend)
-
-@data_controller.route('/receive-data', methods=['GET', 'POST', 'HEAD'])
-def receive_data():
-    "Recibe un mensaje y un ID de usuario y responde con un JSON."
-    if request.method == 'HEAD':
-        return '', 200
-
-    if request.method == 'GET':
-        url_frontend = os.getenv('URL_FRONTEND')
-        return redirect(url_frontend)
-    try:
-        logger.info("Request JSON: \n| %s \n", request.json)
-        data = data_validator.validate(request.json)
-        logger.info("Datos validados: %s", data)
-    except ValidationError as err:
-        logger.warning("Error de validación en la solicitud: %s", err.messages)
-        message_output = "Datos inválidos en la solicitud."
-        return render_json_response(400, message_output, stream=False)
-    try:
-        # Verificar el valor de 'stream' en el JSON de la solicitud
-        if data.get('stream'):
-            logger.info("Generando respuesta en modo streaming.")
-            # Usar generate_response_streaming si 'stream' es True
-            message_output = ''.join(response_generator.generate_response_streaming(data['prompt_user']))
-        else:
-            logger.info("Generando respuesta en modo normal.")
-            # Usar generate_response si 'stream' es None o False
-            message_output = response_generator.generate_response(data['prompt_user'])
-        code = 200
-    except (ConnectionError, TimeoutError) as e:
-        message_output = "Error de conexión al generar la respuesta."
-        logger.error("Error de conexión: %s", e)
-        code = 503  # Servicio no disponible
-    except RuntimeError as e:
-        message_output = "Error de ejecución en el generador de respuesta."
-        logger.error("Error de ejecución: %s", e)
-        code = 500
-    except Exception as e:  # pylint: disable=W0718
-        message_output = "Error desconocido en la generación de la respuesta."
-        logger.error("Error no anticipado: %s", e)
-        code = 500
-    logger.info("Generated: \n| %s", message_output)
-    return render_json_response(code, message_output, stream=False)
-
-@data_controller.route('/health-check', methods=['GET'])
-def health_check():
-    """
-    Endpoint para verificar el estado del servidor.
-    """
-    logger.info("Health check solicitado. El servidor está funcionando correctamente.")
-    return render_json_response(200, "El servidor está operativo.")
+"""
+Path: src/controllers/data_controller.py
+"""
+
+import math
+import os
+from flask import Blueprint, request, redirect, current_app
+from flask_cors import CORS
+from marshmallow import ValidationError
+from dotenv import load_dotenv
+from src.views.data_view import (
+    render_json_response, render_stream_response, render_stats_response,
+    render_batch_response, render_batch_stream_response, render_history_response,
+    render_ndjson_stream_response, render_rejection_response
+)
+from src.logs.config_logger import LoggerConfigurator
+from src.logs.request_event_logger import CLIENT_CLOSED_REQUEST, RequestEventLogger
+from src.services.data_validator import DataSchemaValidator
+from src.services.response_generator import ResponseGenerator
+from src.services.batch_processor import BatchProcessor, describe_error
+from src.services.admission_controller import AdmissionController, AdmissionRejectedError
+from src.services.admin_auth import AdminTokenAuth
+from src.services.circuit_breaker import CircuitOpenError
+from src.services.startup_metrics import startup_metrics
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+request_event_logger = RequestEventLogger(logger)
+
+load_dotenv()
+
+# Rutas abiertas a cualquier origen: todas menos /history, que es de uso interno
+PUBLIC_CORS_RESOURCES = {r'^(?!/history/).*': {}}
+
+# Crear un blueprint para el controlador
+data_controller = Blueprint('data_controller', __name__)
+CORS(data_controller, resources=PUBLIC_CORS_RESOURCES)
+
+# Instancias de servicios
+data_validator = DataSchemaValidator()
+response_generator = ResponseGenerator()
+admission_controller = (AdmissionController()
+                        if os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true' else None)
+batch_processor = BatchProcessor(response_generator, admission_controller=admission_controller)
+history_auth = AdminTokenAuth()
+# Segundos sugeridos en Retry-After mientras la base de datos se inicializa
+DATABASE_RETRY_AFTER = int(os.getenv('DB_INIT_RETRY_AFTER', '5'))
+
+def _authorize_history():
+    "Devuelve la respuesta de rechazo si la solicitud no trae el token de administración."
+    rejection = history_auth.check(request.headers.get('Authorization'))
+    if rejection is None:
+        return None
+    response, code = render_json_response(*rejection)
+    if code == 401:
+        response.headers['WWW-Authenticate'] = 'Bearer'
+    return response, code
+
+def _prepend_chunk(first_chunk, chunks):
+    "Vuelve a anteponer el primer fragmento ya leído; al cerrarse cierra también el original."
+    yield first_chunk
+    yield from chunks
+
+def _release_after(chunks):
+    "Reenvía los fragmentos y libera el lugar de admisión cuando el stream termina o se cierra."
+    try:
+        yield from chunks
+    finally:
+        chunks.close()
+        admission_controller.release()
+
+def _log_stream(chunks, route, started, data):
+    """
+    Reenvía los fragmentos y registra el evento de la solicitud cuando el stream termina:
+    200 si se completó, 499 si el cliente se desconectó y el código del error si falló.
+    """
+    size = 0
+    status, error = 200, None
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    except GeneratorExit:
+        status, error = CLIENT_CLOSED_REQUEST, "El cliente se desconectó durante el streaming."
+        raise
+    except Exception as e:
+        status, error = describe_error(e)[1], e
+        raise
+    finally:
+        chunks.close()
+        request_event_logger.emit(route, status, started, data, response=size, error=error)
+
+def _log_batch(results, route, started, item_count):
+    "Reenvía los resultados del lote y registra el evento con la cantidad de items fallidos."
+    failed = 0
+    try:
+        for result in results:
+            if result['code'] != 200:
+                failed += 1
+            yield result
+    finally:
+        results.close()
+        request_event_logger.emit(route, 200, started, items=item_count, failed_items=failed)
+
+@data_controller.before_app_request
+def _record_first_request():
+    "Registra el tiempo hasta la primera solicitud atendida por el servidor."
+    startup_metrics.record_first_request()
+
+@data_controller.after_app_request
+def _record_first_response(response):
+    "Registra el tiempo hasta la primera respuesta del servidor."
+    startup_metrics.record_first_response()
+    return response
+
+def _record_stream(chunks, data, writer):
+    "Reenvía los fragmentos y, si el stream termina completo, encola el intercambio para persistirlo."
+    parts = []
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+    finally:
+        chunks.close()
+    writer.enqueue(data['user_data']['id'], data['prompt_user'], ''.join(parts))
+
+def _record_batch(results, items, writer):
+    "Reenvía los resultados del lote y encola para persistir cada item respondido con éxito."
+    try:
+        for result in results:
+            if result['code'] == 200:
+                data = items[result['index']][0]
+                writer.enqueue(data['user_data']['id'], data['prompt_user'], result['response_MadyBot'])
+            yield result
+    finally:
+        results.close()
+
+@data_controller.route('/', methods=['GET'])
+def redirect_to_frontend():
+    "Redirige a la URL del frontend."
+    url_frontend = os.getenv('URL_FRONTEND')
+    return redirect(url_frontend)
+
+@data_controller.route('/None', methods=['GET'])
+def redirect_to_frontend_none():
+    "Redirige a la URL del frontend."
+    url_frontend = os.getenv('URL_FRONTEND')
+    return redirect(url_frontend)
+
+@data_controller.route('/receive-data', methods=['GET', 'POST', 'HEAD'])
+def receive_data():
+    "Recibe un mensaje y un ID de usuario y responde con un JSON."
+    if request.method == 'HEAD':
+        return '', 200
+
+    if request.method == 'GET':
+        url_frontend = os.getenv('URL_FRONTEND')
+        return redirect(url_frontend)
+    route = 'POST /receive-data'
+    started = request_event_logger.start()
+    try:
+        data = data_validator.validate(request.json)
+    except ValidationError as err:
+        logger.warning("Error de validación en la solicitud: %s", err.messages)
+        request_event_logger.emit(route, 400, started, error=err.messages)
+        message_output = "Datos inválidos en la solicitud."
+        return render_json_response(400, message_output, stream=False)
+    if admission_controller is not None:
+        try:
+            admission_controller.acquire(data['user_data']['id'])
+        except AdmissionRejectedError as e:
+            request_event_logger.emit(route, e.status, started, data, error=e)
+            return render_rejection_response(e.status, str(e), e.retry_after)
+    # El stream libera su lugar al terminar; en los demás casos se libera al salir.
+    releases_on_close = False
+    error = None
+    retry_after = None
+    try:
+        # Verificar el valor de 'stream' en el JSON de la solicitud
+        if data.get('stream'):
+            logger.info("Generando respuesta en modo streaming.")
+            # Se obtiene el primer fragmento antes de responder para que los errores
+            # de conexión sigan devolviendo su código HTTP y no un stream vacío.
+            chunks = response_generator.generate_response_streaming(
+                data['prompt_user'], data['user_data']['id'], use_cache=not data['no_cache'])
+            first_chunk = next(chunks, '')
+            chunks = _prepend_chunk(first_chunk, chunks)
+            if admission_controller is not None:
+                chunks = _release_after(chunks)
+                releases_on_close = True
+            writer = current_app.extensions.get('conversation_writer')
+            if writer is not None:
+                chunks = _record_stream(chunks, data, writer)
+            chunks = _log_stream(chunks, route, started, data)
+            ndjson = 'application/x-ndjson' in request.headers.get('Accept', '')
+            return render_stream_response(chunks, ndjson=ndjson)
+        else:
+            logger.info("Generando respuesta en modo normal.")
+            # Usar generate_response si 'stream' es None o False
+            message_output = response_generator.generate_response(
+                data['prompt_user'], data['user_data']['id'], use_cache=not data['no_cache'])
+            writer = current_app.extensions.get('conversation_writer')
+            if writer is not None:
+                writer.enqueue(data['user_data']['id'], data['prompt_user'], message_output)
+        code = 200
+    except CircuitOpenError as e:
+        message_output = str(e)
+        logger.info("Solicitud rechazada con el circuito abierto: %s", e)
+        code = 503
+        error = e
+        retry_after = max(1, math.ceil(e.retry_after))
+    except (ConnectionError, TimeoutError) as e:
+        message_output = "Error de conexión al generar la respuesta."
+        logger.error("Error de conexión: %s", e)
+        code = 503  # Servicio no disponible
+        error = e
+    except RuntimeError as e:
+        message_output = "Error de ejecución en el generador de respuesta."
+        logger.error("Error de ejecución: %s", e)
+        code = 500
+        error = e
+    except Exception as e:  # pylint: disable=W0718
+        message_output = "Error desconocido en la generación de la respuesta."
+        logger.error("Error no anticipado: %s", e)
+        code = 500
+        error = e
+    finally:
+        if admission_controller is not None and not releases_on_close:
+            admission_controller.release()
+    request_event_logger.emit(route, code, started, data,
+                              response=message_output if error is None else None, error=error)
+    if retry_after is not None:
+        return render_rejection_response(code, message_output, retry_after)
+    return render_json_response(code, message_output, stream=False)
+
+@data_controller.route('/receive-data/batch', methods=['POST'])
+def receive_data_batch():
+    "Recibe un lote de mensajes y responde con el resultado de cada uno."
+    route = 'POST /receive-data/batch'
+    started = request_event_logger.start()
+    try:
+        envelope, items = data_validator.validate_batch(request.json)
+    except ValidationError as err:
+        logger.warning("Error de validación en el lote: %s", err.messages)
+        request_event_logger.emit(route, 400, started, error=err.messages)
+        return render_json_response(400, "Datos inválidos en la solicitud.", stream=False)
+    logger.info("Lote recibido con %d items.", len(items))
+    try:
+        batch_processor.admit(items)
+    except AdmissionRejectedError as e:
+        request_event_logger.emit(route, e.status, started, items=len(items), error=e)
+        return render_rejection_response(e.status, str(e), e.retry_after)
+    results = _log_batch(batch_processor.process(items), route, started, len(items))
+    writer = current_app.extensions.get('conversation_writer')
+    if writer is not None:
+        results = _record_batch(results, items, writer)
+    if envelope['stream']:
+        return render_batch_stream_response(results)
+    return render_batch_response(sorted(results, key=lambda result: result['index']))
+
+@data_controller.route('/history/<user_id>', methods=['GET'])
+def history(user_id):
+    """
+    Devuelve una página del historial de conversaciones del usuario.
+    Parámetros: `limit`, `cursor` (de la respuesta anterior) y `order` (`asc` o `desc`).
+    Requiere `Authorization: Bearer <HISTORY_ADMIN_TOKEN>`.
+    """
+    # Importado acá: history_service carga SQLAlchemy y el controlador no debe arrastrarlo.
+    from src.services.history_service import InvalidCursorError  # pylint: disable=import-outside-toplevel
+    rejection = _authorize_history()
+    if rejection is not None:
+        return rejection
+    history_service = current_app.extensions.get('history_service')
+    if history_service is None:
+        return render_json_response(503, "El historial no está disponible.")
+    if not history_service.is_available():
+        return render_rejection_response(503, "El historial no está disponible todavía.",
+                                         DATABASE_RETRY_AFTER)
+    try:
+        limit = request.args.get('limit', type=int)
+        page = history_service.get_page(
+            user_id, cursor=request.args.get('cursor'), limit=limit,
+            descending=request.args.get('order', 'asc') == 'desc'
+        )
+    except InvalidCursorError as e:
+        logger.warning("Cursor de historial inválido: %s", e)
+        return render_json_response(400, "Datos inválidos en la solicitud.")
+    except Exception as e:  # pylint: disable=W0718
+        logger.error("Error al consultar el historial: %s", e)
+        return render_json_response(500, "Error al consultar el historial.")
+    return render_history_response(page)
+
+@data_controller.route('/history/<user_id>/export', methods=['GET'])
+def history_export(user_id):
+    """
+    Exporta el historial completo del usuario como NDJSON, leyendo por bloques.
+    Requiere `Authorization: Bearer <HISTORY_ADMIN_TOKEN>`.
+    """
+    rejection = _authorize_history()
+    if rejection is not None:
+        return rejection
+    history_service = current_app.extensions.get('history_service')
+    if history_service is None:
+        return render_json_response(503, "El historial no está disponible.")
+    if not history_service.is_available():
+        return render_rejection_response(503, "El historial no está disponible todavía.",
+                                         DATABASE_RETRY_AFTER)
+    return render_ndjson_stream_response(history_service.iter_history(user_id))
+
+@data_controller.route('/health-check', methods=['GET'])
+def health_check():
+    """
+    Endpoint para verificar el estado del servidor.
+    """
+    logger.info("Health check solicitado. El servidor está funcionando correctamente.")
+    return render_json_response(200, "El servidor está operativo.")
+
+@data_controller.route('/stats', methods=['GET'])
+def stats():
+    """
+    Endpoint que expone las métricas internas del servidor.
+    """
+    stats_output = response_generator.get_stats()
+    if admission_controller is not None:
+        stats_output['admission'] = admission_controller.get_stats()
+    writer = current_app.extensions.get('conversation_writer')
+    if writer is not None:
+        stats_output['conversation_writer'] = writer.get_stats()
+    logging_stats = LoggerConfigurator().get_stats()
+    if logging_stats is not None:
+        stats_output['logging'] = logging_stats
+    db_initializer = current_app.extensions.get('database_initializer')
+    if db_initializer is not None:
+        stats_output['database'] = db_initializer.get_stats()
+    history_service = current_app.extensions.get('history_service')
+    if history_service is not None:
+        stats_output['user_identity'] = history_service.identity_service.get_stats()
+    retention_job = current_app.extensions.get('retention_job')
+    if retention_job is not None:
+        stats_output['retention'] = retention_job.get_stats()
+    stats_output['startup'] = startup_metrics.get_stats()
+    return render_stats_response(stats_output)
@@ -1,95 +1,171 @@
-"""
-src/logs/config_logger.py
-This module configures the logging for the application using a 
-YAML configuration file with dynamic reloading.
-"""
-
-import logging.config
-import os
-from watchdog.observers import Observer
-import yaml
-from src.logs.info_error_filter import InfoErrorFilter
-from src.logs.yaml_config_strategy import YAMLConfigStrategy
-from src.logs.config_change_handler import ConfigChangeHandler
-
-class LoggerConfigurator:
-    """Configures logging for the application using YAML configuration with dynamic reloading."""
-    _instance = None  # Singleton instance
-
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super(LoggerConfigurator, cls).__new__(cls)
-        return cls._instance
-
-    def __init__(self, config_strategy=None, default_level=logging.INFO):
-        if not hasattr(self, "_initialized"):
-            self.config_strategy = config_strategy or YAMLConfigStrategy()
-            self.default_level = default_level
-            self._configured = False
-            self._initialized = True  # Singleton initialization flag
-
-    def configure(self):
-        """Initial configuration of the logger."""
-        if self._configured:
-            return logging.getLogger()
-
-        self.reload_config()  # Initial configuration
-        self._configured = True
-        self.start_watchdog()
-        return logging.getLogger()
-
-    def reload_config(self):
-        """Reloads logging configuration from YAML file."""
-        try:
-            config = self.config_strategy.load_config()
-            if config:
-                environment = os.getenv("ENV", "dev")
-                console_handler = "console_dev" if environment == "dev" else "console_prod"
-                
-                # Verificar la existencia de las claves antes de acceder a ellas
-                if 'loggers' in config and '' in config['loggers']:
-                    config['loggers']['']['handlers'].append(console_handler)
-                    logging.config.dictConfig(config)
-                    logging.debug("Logger reconfigured for %s environment.", environment)
-                else:
-                    raise ValueError("Invalid logging configuration structure. Key 'loggers' or default logger missing.")
-            else:
-                raise ValueError("Empty configuration loaded.")
-        except yaml.YAMLError as e:
-            logging.basicConfig(level=self.default_level)
-            logging.error(
-                "YAML error loading logging configuration: %s. Using default settings.", e)
-        except ValueError as e:
-            logging.basicConfig(level=self.default_level)
-            logging.error("Invalid configuration loaded: %s. Using default settings.", e)
-        except (OSError, IOError) as e:
-            logging.basicConfig(level=self.default_level)
-            logging.error(
-                "File-related error loading logging configuration: %s. Using default settings.", e)
-        root_logger = logging.getLogger()
-        self._add_custom_filters(root_logger)
-
-    def start_watchdog(self):
-        """Starts a watchdog observer to monitor changes in the logging config file."""
-        config_dir = os.path.dirname(self.config_strategy.config_path)
-        
-        if not os.path.exists(config_dir):
-            logging.error("Config directory does not exist: %s", config_dir)
-            return  # Evita iniciar el observador si la ruta no es válida
-        
-        observer = Observer()
-        event_handler = ConfigChangeHandler(self)
-        observer.schedule(event_handler, path=config_dir, recursive=False)
-        observer.start()
-        logging.info("Started watchdog for dynamic logging configuration reloading.")
-
-    @staticmethod
-    def _add_custom_filters(log):
-        info_error_filter = InfoErrorFilter()
-        for handler in log.handlers:
-            handler.addFilter(info_error_filter)
-        logging.debug("Custom filters added to logger handlers.")
-
-# Configuración inicial
-logger_configurator = LoggerConfigurator()
-logger = logger_configurator.configure()
+"""
+src/logs/config_logger.py
+This module configures the logging for the application using a 
+YAML configuration file with dynamic reloading.
+"""
+
+import atexit
+import logging.config
+import os
+import queue
+import yaml
+from src.logs.info_error_filter import InfoErrorFilter
+from src.logs.json_formatter import JsonFormatter
+from src.logs.queue_logging import BoundedQueueHandler, BackgroundQueueListener
+from src.logs.yaml_config_strategy import YAMLConfigStrategy
+
+class LoggerConfigurator:
+    """
+    Configures logging for the application using YAML configuration with dynamic reloading.
+
+    The handlers from the configuration are moved behind a BoundedQueueHandler and served
+    by a background QueueListener, so request threads never wait on console or file I/O.
+    With LOG_FORMAT=json every handler writes one JSON object per line.
+    Environment: LOG_QUEUE_ENABLED (default true), LOG_QUEUE_SIZE (default 10000),
+    LOG_QUEUE_OVERFLOW ('drop' or 'block') and LOG_QUEUE_BLOCK_TIMEOUT (seconds).
+    LOG_CONFIG_WATCH=false skips the watchdog observer (and the watchdog import).
+    """
+    _instance = None  # Singleton instance
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(LoggerConfigurator, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, config_strategy=None, default_level=logging.INFO):
+        if not hasattr(self, "_initialized"):
+            self.config_strategy = config_strategy or YAMLConfigStrategy()
+            self.default_level = default_level
+            self._configured = False
+            self._queue_handler = None
+            self._listener = None
+            self._initialized = True  # Singleton initialization flag
+
+    def configure(self):
+        """Initial configuration of the logger."""
+        if self._configured:
+            return logging.getLogger()
+
+        self.reload_config()  # Initial configuration
+        self._configured = True
+        atexit.register(self.stop_listener)
+        self.start_watchdog()
+        return logging.getLogger()
+
+    def reload_config(self):
+        """Reloads logging configuration from YAML file."""
+        self.stop_listener()
+        try:
+            config = self.config_strategy.load_config()
+            if config:
+                environment = os.getenv("ENV", "dev")
+                console_handler = "console_dev" if environment == "dev" else "console_prod"
+                
+                # Verificar la existencia de las claves antes de acceder a ellas
+                if 'loggers' in config and '' in config['loggers']:
+                    config['loggers']['']['handlers'].append(console_handler)
+                    logging.config.dictConfig(config)
+                    logging.debug("Logger reconfigured for %s environment.", environment)
+                else:
+                    raise ValueError("Invalid logging configuration structure. Key 'loggers' or default logger missing.")
+            else:
+                raise ValueError("Empty configuration loaded.")
+        except yaml.YAMLError as e:
+            logging.basicConfig(level=self.default_level)
+            logging.error(
+                "YAML error loading logging configuration: %s. Using default settings.", e)
+        except ValueError as e:
+            logging.basicConfig(level=self.default_level)
+            logging.error("Invalid configuration loaded: %s. Using default settings.", e)
+        except (OSError, IOError) as e:
+            logging.basicConfig(level=self.default_level)
+            logging.error(
+                "File-related error loading logging configuration: %s. Using default settings.", e)
+        root_logger = logging.getLogger()
+        if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+            self._use_json_format(root_logger)
+        self._add_custom_filters(root_logger)
+        self._start_listener(root_logger)
+
+    @staticmethod
+    def _use_json_format(log):
+        """Replaces the formatter of every handler with JsonFormatter (env LOG_FORMAT=json)."""
+        json_formatter = JsonFormatter()
+        for handler in log.handlers:
+            handler.setFormatter(json_formatter)
+
+    def _start_listener(self, root_logger):
+        """Moves the root handlers behind the queue and starts the background listener."""
+        if os.getenv('LOG_QUEUE_ENABLED', 'true').lower() != 'true':
+            return
+        handlers = [handler for handler in root_logger.handlers if handler is not self._queue_handler]
+        if not handlers:
+            return
+        if self._queue_handler is None:
+            # The queue and its handler survive reloads; only the listener is replaced.
+            self._queue_handler = BoundedQueueHandler(
+                queue.Queue(maxsize=int(os.getenv('LOG_QUEUE_SIZE', '10000'))),
+                overflow_policy=os.getenv('LOG_QUEUE_OVERFLOW', 'drop').lower(),
+                block_timeout=float(os.getenv('LOG_QUEUE_BLOCK_TIMEOUT', '0.05')),
+            )
+        for handler in handlers:
+            root_logger.removeHandler(handler)
+        self._queue_handler.setLevel(min(handler.level for handler in handlers))
+        root_logger.addHandler(self._queue_handler)
+        self._listener = BackgroundQueueListener(
+            self._queue_handler.queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+
+    def stop_listener(self):
+        """
+        Stops the listener after it writes the queued records, and puts its handlers back
+        on the root logger so nothing is lost while the configuration is replaced.
+        """
+        if self._listener is None:
+            return
+        listener, self._listener = self._listener, None
+        root_logger = logging.getLogger()
+        for handler in listener.handlers:
+            root_logger.addHandler(handler)
+        root_logger.removeHandler(self._queue_handler)
+        listener.stop()
+
+    def get_stats(self):
+        """Returns the logging queue counters, or None when the queue is disabled."""
+        if self._queue_handler is None:
+            return None
+        stats = self._queue_handler.get_stats()
+        stats['listener_running'] = self._listener is not None
+        return stats
+
+    def start_watchdog(self):
+        """Starts a watchdog observer to monitor changes in the logging config file."""
+        if os.getenv('LOG_CONFIG_WATCH', 'true').lower() != 'true':
+            return
+        # Imported here so processes that do not watch the config never load watchdog.
+        # pylint: disable=import-outside-toplevel
+        from watchdog.observers import Observer
+        from src.logs.config_change_handler import ConfigChangeHandler
+
+        config_dir = os.path.dirname(self.config_strategy.config_path)
+        
+        if not os.path.exists(config_dir):
+            logging.error("Config directory does not exist: %s", config_dir)
+            return  # Evita iniciar el observador si la ruta no es válida
+        
+        observer = Observer()
+        event_handler = ConfigChangeHandler(self)
+        observer.schedule(event_handler, path=config_dir, recursive=False)
+        observer.start()
+        logging.info("Started watchdog for dynamic logging configuration reloading.")
+
+    @staticmethod
+    def _add_custom_filters(log):
+        info_error_filter = InfoErrorFilter()
+        for handler in log.handlers:
+            handler.addFilter(info_error_filter)
+        logging.debug("Custom filters added to logger handlers.")
+
+# Configuración inicial
+logger_configurator = LoggerConfigurator()
+logger = logger_configurator.configure()
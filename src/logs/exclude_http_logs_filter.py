@@ -1,13 +1,30 @@
-"""
-src/logs/ExcludeHTTPLogsFilter.py
-Filter module for excluding specific HTTP logs.
-"""
-
-import logging
-
-class ExcludeHTTPLogsFilter(logging.Filter):
-    """Filters out HTTP GET and POST requests from logs."""
-    # pylint: disable=too-few-public-methods
-    def filter(self, record):
-        """Exclude log records containing 'GET /' or 'POST /'."""
-        return 'GET /' not in record.getMessage() and 'POST /' not in record.getMessage()
+"""
+src/logs/ExcludeHTTPLogsFilter.py
+Filter module for excluding specific HTTP logs.
+"""
+
+import logging
+
+_MARKERS = ('GET /', 'POST /')
+# Access log lines carry the request line near the start of the template or of an argument.
+_PREFIX_CHARS = 64
+
+class ExcludeHTTPLogsFilter(logging.Filter):
+    """Filters out HTTP GET and POST requests from logs."""
+    # pylint: disable=too-few-public-methods
+    def filter(self, record):
+        """
+        Exclude log records containing 'GET /' or 'POST /'.
+
+        Only the start of the message template and of its string arguments is inspected,
+        so the cost does not depend on the size of the logged payload and the message is
+        never formatted here.
+        """
+        parts = [record.msg] if isinstance(record.msg, str) else []
+        if isinstance(record.args, tuple):
+            parts.extend(arg for arg in record.args if isinstance(arg, str))
+        for part in parts:
+            prefix = part[:_PREFIX_CHARS]
+            if any(marker in prefix for marker in _MARKERS):
+                return False
+        return True
@@ -0,0 +1,37 @@
+"""
+src/logs/json_formatter.py
+Formatter module that writes each log record as a single JSON line.
+"""
+
+import json
+import logging
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line with timestamp, level, logger and
+    source location. Records carrying an `event` dict (see RequestEventLogger) are
+    written with the event fields instead of the text message.
+    """
+
+    def format(self, record):
+        """Serialize the record as JSON."""
+        entry = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'source': f"{record.filename}:{record.lineno}",
+        }
+        event = getattr(record, 'event', None)
+        if isinstance(event, dict):
+            entry.update(event)
+        else:
+            entry['message'] = record.getMessage()
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Traceback already rendered by BoundedQueueHandler.prepare
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
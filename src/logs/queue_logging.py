@@ -0,0 +1,96 @@
+"""
+src/logs/queue_logging.py
+Queue-based logging components: request threads only enqueue log records and a
+background listener does the filtering, formatting and I/O.
+"""
+
+import copy
+import logging
+import logging.handlers
+import queue
+import threading
+
+# Renders tracebacks in the calling thread; handlers append `exc_text` as is
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler over a bounded queue with an overflow policy.
+
+    - 'drop': records below WARNING are discarded immediately when the queue is full;
+      WARNING and above wait up to `block_timeout` seconds before being discarded.
+    - 'block': every record waits up to `block_timeout` seconds.
+
+    The number of discarded records is reported with an ERROR record (so it passes
+    InfoErrorFilter) as soon as the queue accepts records again.
+    """
+
+    def __init__(self, log_queue, overflow_policy='drop', block_timeout=0.05):
+        super().__init__(log_queue)
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self._counter_lock = threading.Lock()
+        self._unreported = 0
+        self.dropped = 0
+        self.enqueued = 0
+
+    def prepare(self, record):
+        """
+        Merge `msg % args` and render the traceback to text before the record crosses
+        threads: the arguments may change after the call returns, and a live traceback
+        keeps every frame of the failing request in memory until the listener runs.
+        Formatting with each handler's formatter is still left to the listener thread.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        """Put the record in the queue applying the overflow policy."""
+        try:
+            if self.overflow_policy == 'block' or record.levelno >= logging.WARNING:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped += 1
+                self._unreported += 1
+            return
+        with self._counter_lock:
+            self.enqueued += 1
+            unreported, self._unreported = self._unreported, 0
+        if unreported:
+            self._report_dropped(unreported)
+
+    def _report_dropped(self, count):
+        """Enqueue an ERROR with the number of records dropped since the last report."""
+        report = logging.LogRecord(
+            __name__, logging.ERROR, __file__, 0,
+            "Logging queue full: %d log records were dropped.", (count,), None)
+        try:
+            self.queue.put_nowait(report)
+        except queue.Full:
+            with self._counter_lock:
+                self._unreported += count
+
+    def get_stats(self):
+        """Return the queue depth and the enqueued/dropped counters."""
+        with self._counter_lock:
+            stats = {'enqueued': self.enqueued, 'dropped': self.dropped}
+        stats['queue_depth'] = self.queue.qsize()
+        stats['queue_capacity'] = self.queue.maxsize
+        return stats
+
+
+class BackgroundQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop sentinel waits for room in a full bounded queue."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
@@ -0,0 +1,101 @@
+"""
+src/logs/request_event_logger.py
+Module that logs one structured event per request (sizes, hashes, timing and status)
+instead of the full request and response bodies.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+
+# Status logged when the client closes the connection before the response ends (nginx convention)
+CLIENT_CLOSED_REQUEST = 499
+
+
+def _digest(text):
+    """Short, stable hash used to correlate payloads without logging them."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+
+
+def _truncate(text, limit):
+    if text is None or len(text) <= limit:
+        return text
+    return text[:limit] + f"... [{len(text) - limit} more chars]"
+
+
+class _LazyJson:
+    """Defers the JSON encoding of an event until a handler formats the record."""
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('event',)
+
+    def __init__(self, event):
+        self.event = event
+
+    def __str__(self):
+        return json.dumps(self.event, ensure_ascii=False, default=str)
+
+
+class RequestEventLogger:
+    """
+    Emits a single `request` event per request through the application logger.
+
+    The event always carries the route, status, duration, stream flag, hashed user id and
+    the size and hash of the prompt and the response. The bodies themselves are included
+    only for a sample of requests (env PAYLOAD_LOG_SAMPLE_RATE, 0.0 by default) and for
+    every request with status >= 400, truncated to PAYLOAD_LOG_MAX_CHARS characters.
+    """
+
+    def __init__(self, logger=None, sample_rate=None, max_chars=None):
+        self.logger = logger or logging.getLogger()
+        self.sample_rate = (sample_rate if sample_rate is not None
+                            else float(os.getenv('PAYLOAD_LOG_SAMPLE_RATE', '0')))
+        self.max_chars = max_chars or int(os.getenv('PAYLOAD_LOG_MAX_CHARS', '2000'))
+
+    @staticmethod
+    def start():
+        """Returns the start timestamp to pass to `emit`."""
+        return time.perf_counter()
+
+    def emit(self, route, status, started, data=None, response=None, error=None, **fields):
+        """
+        Logs the request event.
+
+        :param route: Route name, for example 'POST /receive-data'.
+        :param status: HTTP status returned to the client.
+        :param started: Value returned by `start`.
+        :param data: Validated request data, if validation succeeded.
+        :param response: Generated text (or its length when only the size is known).
+        :param error: Exception or description of the error, if any.
+        :param fields: Additional event fields, for example the number of items of a batch.
+        """
+        event = {
+            'event': 'request',
+            'route': route,
+            'status': status,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
+        event.update(fields)
+        prompt = None
+        if data is not None:
+            prompt = data.get('prompt_user') or ''
+            event['stream'] = bool(data.get('stream'))
+            event['user'] = _digest(str(data['user_data']['id']))
+            event['prompt_chars'] = len(prompt)
+            event['prompt_sha256'] = _digest(prompt)
+        if isinstance(response, int):
+            event['response_chars'] = response
+            response = None
+        elif response is not None:
+            event['response_chars'] = len(response)
+            event['response_sha256'] = _digest(response)
+        if error is not None:
+            event['error'] = f"{type(error).__name__}: {error}" if isinstance(error, BaseException) else str(error)
+        has_payload = prompt is not None or response is not None
+        if has_payload and (status >= 400 or (self.sample_rate and random.random() < self.sample_rate)):
+            event['prompt'] = _truncate(prompt, self.max_chars)
+            event['response'] = _truncate(response, self.max_chars)
+        level = logging.ERROR if status >= 500 else logging.INFO
+        self.logger.log(level, "request %s", _LazyJson(event), extra={'event': event}, stacklevel=2)
@@ -1,44 +1,108 @@
-"""
-Path: src/model/database_connector.py
-
-"""
-
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from dotenv import load_dotenv, find_dotenv
-from src.logs.config_logger import LoggerConfigurator
-from src.model.database_connector_interface import DatabaseConnectorInterface
-
-# Configuración del logger al inicio del script
-logger = LoggerConfigurator().configure()
-
-# Cargar variables de entorno desde el archivo .env
-try:
-    if not find_dotenv():
-        raise FileNotFoundError(".env file not found")
-    load_dotenv()
-except FileNotFoundError as e:
-    logger.error("Error loading .env file: %s", e)
-    print(".env file not found. Please create a .env file with the necessary environment variables.")
-    exit()
-
-class DatabaseConnector(DatabaseConnectorInterface):
-    """Clase para manejar la conexión a la base de datos MySQL utilizando SQLAlchemy."""
-    def __init__(self):
-        self.engine = create_engine(
-            f"mysql+mysqlconnector://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}",
-            pool_size=10,
-            max_overflow=20,
-            pool_timeout=30,
-            pool_recycle=1800
-        )
-        self.Session = sessionmaker(bind=self.engine)
-
-    def get_session(self) -> Session:
-        """Obtiene una nueva sesión de la base de datos."""
-        return self.Session()
-
-    def close_engine(self):
-        """Cierra el motor de la base de datos."""
-        self.engine.dispose()
+"""
+Path: src/model/database_connector.py
+
+"""
+
+import os
+import re
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker, Session
+from dotenv import load_dotenv, find_dotenv
+from src.logs.config_logger import LoggerConfigurator
+from src.model.database_connector_interface import DatabaseConnectorInterface
+from src.model.pool_metrics import InstrumentedQueuePool, attach_pool_metrics, warm_up_pool
+from src.model.replica_router import RoutingSession, create_replica_router
+
+# Configuración del logger al inicio del script
+logger = LoggerConfigurator().configure()
+
+# Cargar variables de entorno desde el archivo .env
+try:
+    if not find_dotenv():
+        raise FileNotFoundError(".env file not found")
+    load_dotenv()
+except FileNotFoundError as e:
+    logger.error("Error loading .env file: %s", e)
+    print(".env file not found. Please create a .env file with the necessary environment variables.")
+    exit()
+
+class DatabaseConnector(DatabaseConnectorInterface):
+    """
+    Clase para manejar la conexión a la base de datos MySQL utilizando SQLAlchemy.
+
+    El pool se configura con DB_POOL_SIZE (10), DB_MAX_OVERFLOW (20), DB_POOL_TIMEOUT (30 s),
+    DB_POOL_RECYCLE (1800 s) y DB_POOL_PRE_PING ('false'; con 'true' verifica cada conexión
+    antes de entregarla, útil si el servidor corta las inactivas). `warm_up_pool` abre
+    DB_POOL_WARMUP conexiones por adelantado.
+
+    Con DB_REPLICA_URLS (URLs de SQLAlchemy separadas por coma) las sesiones de
+    `get_read_session` leen de réplicas al día y escriben en el primario (ver ReplicaRouter).
+    """
+    def __init__(self):
+        self.pool_size = int(os.getenv('DB_POOL_SIZE', '10'))
+        self.max_overflow = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+        self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+        self.pool_recycle = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+        self.pool_pre_ping = os.getenv('DB_POOL_PRE_PING', 'false').lower() == 'true'
+        self.pool_warmup = int(os.getenv('DB_POOL_WARMUP', '2'))
+        self.engine = self._create_engine(
+            f"mysql+mysqlconnector://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
+        )
+        self.pool_metrics = attach_pool_metrics(self.engine, 'primary')
+        self.Session = sessionmaker(bind=self.engine)
+        self.replica_router = create_replica_router(self.engine, self._create_engine)
+
+    def _create_engine(self, url):
+        """Crea un motor con la configuración de pool compartida por primario y réplicas."""
+        return create_engine(
+            url,
+            poolclass=InstrumentedQueuePool,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=self.pool_pre_ping
+        )
+
+    def create_database(self):
+        """Crea la base de datos configurada en DB_NAME si no existe."""
+        database = self.engine.url.database
+        if not database or not re.fullmatch(r'[A-Za-z0-9_$]+', database):
+            raise ValueError(f"Nombre de base de datos inválido: {database!r}")
+        # Conexión al servidor sin seleccionar una base, que todavía no existe.
+        server_engine = create_engine(self.engine.url.set(database=None))
+        try:
+            with server_engine.begin() as connection:
+                connection.execute(text(
+                    f"CREATE DATABASE IF NOT EXISTS `{database}` CHARACTER SET utf8mb4"))
+        finally:
+            server_engine.dispose()
+        logger.info("Base de datos %s creada.", database)
+
+    def get_session(self) -> Session:
+        """Obtiene una nueva sesión de la base de datos."""
+        return self.Session()
+
+    def get_read_session(self) -> Session:
+        """Obtiene una sesión que lee de una réplica al día, o del primario si no hay."""
+        if self.replica_router is None:
+            return self.Session()
+        return RoutingSession(self.engine, self.replica_router)
+
+    def warm_up_pool(self, count=None):
+        """Abre `count` (o DB_POOL_WARMUP) conexiones en el primario y en cada réplica."""
+        engines = [self.engine] + (self.replica_router.engines() if self.replica_router else [])
+        return sum(warm_up_pool(engine, self.pool_warmup if count is None else count) for engine in engines)
+
+    def get_stats(self):
+        """Devuelve las métricas del pool del primario y de las réplicas."""
+        stats = {'primary': self.pool_metrics.get_stats(self.engine.pool)}
+        if self.replica_router is not None:
+            stats.update(self.replica_router.get_stats())
+        return stats
+
+    def close_engine(self):
+        """Cierra el motor de la base de datos."""
+        if self.replica_router is not None:
+            self.replica_router.stop()
+        self.engine.dispose()
@@ -0,0 +1,46 @@
+"""
+Path: src/model/database_connector_factory.py
+Este módulo selecciona el conector de base de datos y la estrategia de creación de
+tablas según la configuración.
+"""
+
+import os
+from src.logs.config_logger import LoggerConfigurator
+from src.model.fingerprint_table_creator import FingerprintTableCreator
+from src.model.table_creator import MetadataTableCreator, TableCreator
+
+# Configuración del logger al inicio del script
+logger = LoggerConfigurator().configure()
+
+def _backend_name(name=None):
+    return (name or os.getenv('DB_BACKEND', 'mysql')).lower()
+
+def create_database_connector(name=None):
+    """
+    Crea el conector indicado por `name` o por la variable de entorno DB_BACKEND.
+
+    :param name: 'mysql' (por defecto) o 'sqlite'.
+    :return: Instancia de DatabaseConnectorInterface.
+    """
+    name = _backend_name(name)
+    logger.info("Usando el backend de base de datos: %s", name)
+    # Los conectores se importan acá para que SQLite no requiera el driver de MySQL.
+    if name == 'sqlite':
+        from src.model.sqlite_database_connector import SQLiteDatabaseConnector  # pylint: disable=import-outside-toplevel
+        return SQLiteDatabaseConnector()
+    if name == 'mysql':
+        from src.model.database_connector import DatabaseConnector  # pylint: disable=import-outside-toplevel
+        return DatabaseConnector()
+    raise ValueError(f"Backend de base de datos desconocido: {name}")
+
+def create_table_creator(name=None):
+    """
+    Crea la estrategia de creación de tablas para el backend: el DDL de TableCreator en
+    MySQL y el de `models.Base.metadata` en SQLite, envuelta en FingerprintTableCreator
+    salvo que SCHEMA_FINGERPRINT_ENABLED sea 'false'.
+    """
+    table_creator = MetadataTableCreator() if _backend_name(name) == 'sqlite' else TableCreator()
+    if os.getenv('SCHEMA_FINGERPRINT_ENABLED', 'true').lower() == 'true':
+        # Solo envía DDL cuando cambió la huella del esquema guardada en schema_metadata
+        table_creator = FingerprintTableCreator(table_creator)
+    return table_creator
@@ -1,20 +1,44 @@
-
-"""
-# Path: src/model/database_connector_interface.py
-Este archivo define la interfaz DatabaseConnectorInterface, 
-que es una interfaz para los conectores de bases de datos.
-"""
-from abc import ABC, abstractmethod
-from sqlalchemy.orm import Session
-
-class DatabaseConnectorInterface(ABC):
-    """Interfaz para los conectores de bases de datos."""
-    @abstractmethod
-    def get_session(self) -> Session:
-        """Obtiene una nueva sesión de la base de datos."""
-        pass
-
-    @abstractmethod
-    def close_engine(self):
-        """Cierra el motor de la base de datos."""
-        pass
+
+"""
+# Path: src/model/database_connector_interface.py
+Este archivo define la interfaz DatabaseConnectorInterface, 
+que es una interfaz para los conectores de bases de datos.
+"""
+from abc import ABC, abstractmethod
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+class DatabaseConnectorInterface(ABC):
+    """Interfaz para los conectores de bases de datos."""
+    @abstractmethod
+    def get_session(self) -> Session:
+        """Obtiene una nueva sesión de la base de datos."""
+        pass
+
+    @abstractmethod
+    def close_engine(self):
+        """Cierra el motor de la base de datos."""
+        pass
+
+    def bulk_insert(self, session: Session, model, rows):
+        """
+        Inserta varias filas en la transacción de la sesión con un único INSERT de
+        varias filas. Los conectores pueden redefinirlo según los límites de su motor.
+        """
+        if rows:
+            session.execute(insert(model).values(rows))
+
+    def get_read_session(self) -> Session:
+        """
+        Obtiene una sesión para consultas de solo lectura. Sin réplicas configuradas es
+        una sesión común del primario.
+        """
+        return self.get_session()
+
+    def warm_up_pool(self, count=None):
+        """Abre conexiones por adelantado; devuelve cuántas. Por defecto no hace nada."""
+        return 0
+
+    def get_stats(self):
+        """Devuelve las métricas del conector (pools y réplicas), si las tiene."""
+        return {}
@@ -1,27 +1,145 @@
-"""
-Path: src/model/database_initializer.py
-
-"""
-
-from src.logs.config_logger import LoggerConfigurator
-from src.model.database_connector import DatabaseConnector
-from src.model.table_creation_strategy import TableCreationStrategy
-
-# Configuración del logger al inicio del script
-logger = LoggerConfigurator().configure()
-
-class DatabaseInitializer:
-    """Clase para inicializar la base de datos y manejar la sesión."""
-    def __init__(self, connector: DatabaseConnector, table_creator: TableCreationStrategy):
-        self.connector = connector
-        self.session = None
-        self.table_creator = table_creator
-
-    def initialize_database(self):
-        """Inicializa la base de datos y las tablas necesarias."""
-        self.session = self.connector.get_session()
-        try:
-            # Usar la estrategia de creación de tablas proporcionada
-            self.table_creator.create_tables(self.session)
-        finally:
-            self.session.close()
+"""
+Path: src/model/database_initializer.py
+
+"""
+
+import os
+import threading
+import time
+import sqlalchemy
+from src.logs.config_logger import LoggerConfigurator
+from src.model.database_connector_interface import DatabaseConnectorInterface
+from src.model.table_creation_strategy import TableCreationStrategy
+
+# Configuración del logger al inicio del script
+logger = LoggerConfigurator().configure()
+
+# Código de error de MySQL para "Unknown database"
+MYSQL_UNKNOWN_DATABASE = 1049
+
+class DatabaseInitializer:
+    """
+    Clase para inicializar la base de datos y manejar la sesión.
+
+    `initialize_database` hace un único intento. `initialize_with_retry` reintenta con
+    espera exponencial (DB_INIT_RETRY_BASE y DB_INIT_RETRY_MAX en segundos, DB_INIT_MAX_ATTEMPTS
+    intentos, 0 = sin límite) y `start_background` lo hace en un hilo, para que el servidor
+    atienda el chat mientras la base no responde. `ready` se activa cuando el esquema quedó
+    verificado. Si la base de datos no existe (error 1049 de MySQL) se crea, salvo que
+    DB_CREATE_DATABASE sea 'false'.
+    """
+    def __init__(self, connector: DatabaseConnectorInterface, table_creator: TableCreationStrategy,
+                 retry_base=None, retry_max=None, max_attempts=None):
+        self.connector = connector
+        self.session = None
+        self.table_creator = table_creator
+        self.retry_base = retry_base or float(os.getenv('DB_INIT_RETRY_BASE', '1'))
+        self.retry_max = retry_max or float(os.getenv('DB_INIT_RETRY_MAX', '60'))
+        self.max_attempts = (max_attempts if max_attempts is not None
+                             else int(os.getenv('DB_INIT_MAX_ATTEMPTS', '0')))
+        self.create_missing_database = os.getenv('DB_CREATE_DATABASE', 'true').lower() == 'true'
+        self.ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self._stats = {'status': 'pending', 'attempts': 0, 'last_error': None, 'ready_after_s': None}
+
+    def initialize_database(self):
+        """Inicializa la base de datos y las tablas necesarias."""
+        self.session = self.connector.get_session()
+        try:
+            # Usar la estrategia de creación de tablas proporcionada
+            self.table_creator.create_tables(self.session)
+        finally:
+            self.session.close()
+        self.ready.set()
+
+    @staticmethod
+    def _is_unknown_database(error):
+        """Indica si el error es el 1049 de MySQL (la base de datos configurada no existe)."""
+        return getattr(getattr(error, 'orig', None), 'errno', None) == MYSQL_UNKNOWN_DATABASE
+
+    def _attempt(self):
+        """Un intento de inicialización, creando la base de datos si no existe."""
+        try:
+            self.initialize_database()
+        except sqlalchemy.exc.DBAPIError as e:
+            if not (self.create_missing_database and self._is_unknown_database(e)):
+                raise
+            logger.warning("La base de datos no existe; se creará antes de crear las tablas.")
+            self.connector.create_database()
+            self.initialize_database()
+
+    def _set_stats(self, **values):
+        with self._stats_lock:
+            self._stats.update(values)
+
+    def initialize_with_retry(self, on_ready=None):
+        """
+        Inicializa la base de datos reintentando ante cualquier error.
+
+        :param on_ready: Función opcional que se llama una vez que el esquema está listo.
+        :return: True si la base quedó lista; False si se agotaron los intentos o se llamó a `stop`.
+        """
+        started = time.monotonic()
+        delay = self.retry_base
+        attempt = 0
+        while not self._stop.is_set():
+            attempt += 1
+            self._set_stats(status='initializing', attempts=attempt)
+            try:
+                self._attempt()
+            except Exception as e:  # pylint: disable=W0718
+                self._set_stats(status='retrying', last_error=f"{type(e).__name__}: {e}")
+                if self.max_attempts and attempt >= self.max_attempts:
+                    self._set_stats(status='failed')
+                    logger.error("Error al inicializar la base de datos (intento %d de %d): %s",
+                                 attempt, self.max_attempts, e)
+                    return False
+                logger.error("Error al inicializar la base de datos (intento %d), reintentando en %.1f s: %s",
+                             attempt, delay, e)
+                self._stop.wait(delay)
+                delay = min(delay * 2, self.retry_max)
+                continue
+            elapsed = time.monotonic() - started
+            self._set_stats(status='ready', ready_after_s=round(elapsed, 2))
+            logger.info("Base de datos inicializada correctamente en %.1f s (intento %d).", elapsed, attempt)
+            self._warm_up_pool()
+            if on_ready is not None:
+                on_ready()
+            return True
+        return False
+
+    def _warm_up_pool(self):
+        """Abre las conexiones de DB_POOL_WARMUP; un fallo acá no impide usar la base."""
+        try:
+            opened = self.connector.warm_up_pool()
+        except Exception as e:  # pylint: disable=W0718
+            logger.error("No se pudieron abrir las conexiones iniciales del pool: %s", e)
+            return
+        if opened:
+            logger.info("Pool de conexiones precalentado con %d conexiones.", opened)
+
+    def start_background(self, on_ready=None):
+        """Inicializa la base de datos en un hilo en segundo plano, sin bloquear el arranque."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.initialize_with_retry, args=(on_ready,),
+                                        name='db-init', daemon=True)
+        self._thread.start()
+        logger.info("Inicialización de la base de datos en segundo plano.")
+
+    def stop(self):
+        """Cancela los reintentos pendientes."""
+        self._stop.set()
+
+    def get_stats(self):
+        """Devuelve el estado de la inicialización, los intentos, el último error y las métricas del conector."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        if hasattr(self.table_creator, 'get_stats'):
+            stats['schema'] = self.table_creator.get_stats()
+        connector_stats = self.connector.get_stats() if hasattr(self.connector, 'get_stats') else None
+        if connector_stats:
+            stats['connector'] = connector_stats
+        return stats
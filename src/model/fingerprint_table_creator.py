@@ -0,0 +1,95 @@
+"""
+Path: src/model/fingerprint_table_creator.py
+Este módulo evita repetir el DDL en cada arranque: guarda una huella del esquema de
+`models.Base.metadata` en la tabla schema_metadata y solo aplica la estrategia de
+creación de tablas cuando la huella guardada no coincide.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+import sqlalchemy
+from sqlalchemy import Column, MetaData, String, Table, TIMESTAMP, delete, insert, select
+from sqlalchemy.orm import Session
+from src.logs.config_logger import LoggerConfigurator
+from src.model.models import Base
+from src.model.table_creation_strategy import TableCreationStrategy
+
+# Configuración del logger al inicio del script
+logger = LoggerConfigurator().configure()
+
+# Tabla propia, fuera de Base.metadata, para que no forme parte de la huella
+schema_metadata = Table(
+    'schema_metadata', MetaData(),
+    Column('component', String(64), primary_key=True),
+    Column('fingerprint', String(64), nullable=False),
+    Column('updated_at', TIMESTAMP, default=datetime.utcnow),
+)
+
+def compute_schema_fingerprint(metadata=Base.metadata):
+    """
+    Calcula una huella estable (sha256) de las tablas, columnas, claves foráneas e índices
+    de `metadata`. Cambia cada vez que cambian los modelos.
+    """
+    description = []
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        description.append({
+            'table': table.name,
+            'columns': [[column.name, str(column.type), column.nullable, column.primary_key,
+                         sorted(fk.target_fullname for fk in column.foreign_keys)]
+                        for column in table.columns],
+            'indexes': sorted(([index.name, [column.name for column in index.columns], bool(index.unique)]
+                               for index in table.indexes), key=lambda index: index[0] or ''),
+        })
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class FingerprintTableCreator(TableCreationStrategy):
+    """
+    Estrategia que envuelve a otra (por ejemplo TableCreator). En un arranque con el
+    esquema al día hace una sola lectura de schema_metadata y no envía DDL; si la huella
+    falta o es distinta aplica la estrategia envuelta y guarda la huella nueva.
+    """
+
+    def __init__(self, table_creator: TableCreationStrategy, metadata=Base.metadata, component='models'):
+        self.table_creator = table_creator
+        self.component = component
+        self.fingerprint = compute_schema_fingerprint(metadata)
+        self.last_result = None
+
+    def _stored_fingerprint(self, session: Session):
+        """Devuelve la huella guardada, o None si no hay una o la tabla todavía no existe."""
+        try:
+            return session.execute(
+                select(schema_metadata.c.fingerprint).where(schema_metadata.c.component == self.component)
+            ).scalar()
+        except (sqlalchemy.exc.ProgrammingError, sqlalchemy.exc.OperationalError) as e:
+            session.rollback()
+            logger.info("No se pudo leer la huella del esquema, se aplicará el DDL: %s", e.orig)
+            return None
+
+    def create_tables(self, session: Session):
+        """Aplica el DDL solo si la huella del esquema cambió."""
+        stored = self._stored_fingerprint(session)
+        if stored == self.fingerprint:
+            self.last_result = 'skipped'
+            logger.info("Esquema al día (huella %s), no se envía DDL.", self.fingerprint[:12])
+            return
+        self.table_creator.create_tables(session)
+        schema_metadata.create(session.connection(), checkfirst=True)
+        try:
+            session.execute(delete(schema_metadata).where(schema_metadata.c.component == self.component))
+            session.execute(insert(schema_metadata).values(component=self.component,
+                                                           fingerprint=self.fingerprint,
+                                                           updated_at=datetime.utcnow()))
+            session.commit()
+        except sqlalchemy.exc.IntegrityError:
+            # Otro proceso aplicó el mismo esquema y guardó la huella al mismo tiempo.
+            session.rollback()
+        self.last_result = 'applied'
+        logger.info("Esquema actualizado, huella %s -> %s.",
+                    stored[:12] if stored else None, self.fingerprint[:12])
+
+    def get_stats(self):
+        """Devuelve la huella esperada y si el último arranque aplicó u omitió el DDL."""
+        return {'fingerprint': self.fingerprint[:12], 'ddl': self.last_result}
@@ -0,0 +1,122 @@
+"""
+Path: src/model/pool_metrics.py
+Este módulo mide el uso de los pools de conexiones de SQLAlchemy: cuántas conexiones
+se piden, cuánto se espera por una, cuántas esperas terminan en timeout y cuántas
+conexiones nuevas se abren. También permite abrirlas por adelantado al arrancar.
+"""
+
+import bisect
+import threading
+import time
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+# Límites superiores (ms) de los intervalos del histograma de espera por una conexión
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+class PoolMetrics:
+    """Contadores de un pool de conexiones, seguros entre hilos."""
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._wait_buckets = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+        self._connects = 0
+
+    def record_checkout(self, wait_seconds):
+        """Registra una conexión entregada después de esperar `wait_seconds`."""
+        bucket = bisect.bisect_left(CHECKOUT_BUCKETS_MS, wait_seconds * 1000)
+        with self._lock:
+            self._checkouts += 1
+            self._wait_total += wait_seconds
+            self._wait_max = max(self._wait_max, wait_seconds)
+            self._wait_buckets[bucket] += 1
+
+    def record_connect(self):
+        """Registra una conexión nueva abierta contra la base de datos."""
+        with self._lock:
+            self._connects += 1
+
+    def record_timeout(self):
+        """Registra una espera que superó pool_timeout."""
+        with self._lock:
+            self._timeouts += 1
+
+    def get_stats(self, pool=None):
+        """Devuelve los contadores y, si se recibe el pool, su ocupación actual."""
+        with self._lock:
+            stats = {'checkouts': self._checkouts, 'timeouts': self._timeouts,
+                     'wait_ms_mean': round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                     'wait_ms_max': round(self._wait_max * 1000, 3),
+                     'wait_ms_histogram': dict(zip(
+                         [f"<={limit}" for limit in CHECKOUT_BUCKETS_MS] + [f">{CHECKOUT_BUCKETS_MS[-1]}"],
+                         self._wait_buckets)),
+                     'connects': self._connects}
+        if isinstance(pool, QueuePool):
+            stats.update({'size': pool.size(), 'in_use': pool.checkedout(),
+                          'idle': pool.checkedin(), 'overflow': max(0, pool.overflow())})
+        return stats
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que registra en `metrics` (un PoolMetrics) la espera de cada checkout y
+    los timeouts. Se usa con `create_engine(..., poolclass=InstrumentedQueuePool)` y
+    `attach_pool_metrics`.
+    """
+
+    metrics = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except sqlalchemy.exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+        if self.metrics is not None:
+            self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # dispose() reemplaza el pool; las métricas pasan al nuevo.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def attach_pool_metrics(engine, name):
+    """
+    Asocia un PoolMetrics al pool del motor si es un InstrumentedQueuePool.
+
+    :return: El PoolMetrics, o None si el pool no está instrumentado.
+    """
+    if not isinstance(engine.pool, InstrumentedQueuePool):
+        return None
+    metrics = PoolMetrics(name)
+    engine.pool.metrics = metrics
+    event.listen(engine, 'connect', lambda *_: metrics.record_connect())
+    return metrics
+
+def warm_up_pool(engine, count):
+    """
+    Abre hasta `count` conexiones (sin pasar del tamaño del pool) y las devuelve al pool,
+    para que las primeras peticiones no paguen el costo de conectarse.
+
+    :return: Cantidad de conexiones abiertas.
+    """
+    size = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+    connections = []
+    try:
+        for _ in range(min(count, size)):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
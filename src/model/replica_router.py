@@ -0,0 +1,211 @@
+"""
+Path: src/model/replica_router.py
+Este módulo reparte las lecturas entre réplicas de la base de datos: vigila el retraso
+de cada réplica y solo envía lecturas a las que están al día; las escrituras y las
+lecturas sin réplica disponible van al primario.
+"""
+
+import itertools
+import os
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, delete, insert, select
+from sqlalchemy.orm import Session
+from src.logs.config_logger import LoggerConfigurator
+from src.model.pool_metrics import attach_pool_metrics
+
+# Configuración del logger al inicio del script
+logger = LoggerConfigurator().configure()
+
+# Latido que el primario escribe para medir el retraso de réplicas que no son MySQL
+replica_heartbeat = Table(
+    'replica_heartbeat', MetaData(),
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('beat_at', DateTime, nullable=False),
+)
+
+class _Replica:
+    """Estado de una réplica: motor, métricas del pool, retraso y contadores."""
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, name, engine):
+        self.name = name
+        self.engine = engine
+        self.pool_metrics = attach_pool_metrics(engine, name)
+        self.healthy = False
+        self.lag = None
+        self.last_error = None
+        self.reads = 0
+
+
+class ReplicaRouter:
+    """
+    ReplicaRouter mantiene las réplicas de lectura y elige una para cada sesión de lectura.
+
+    Un hilo revisa cada DB_REPLICA_CHECK_INTERVAL segundos el retraso de cada réplica:
+    en MySQL con SHOW REPLICA STATUS y en otros motores con la tabla replica_heartbeat, que
+    el primario actualiza en cada revisión. Una réplica recibe lecturas mientras responde y
+    su retraso no supera DB_REPLICA_MAX_LAG segundos (0 desactiva el control de retraso).
+    Hasta la primera revisión, o si ninguna réplica está al día, se lee del primario.
+    """
+
+    def __init__(self, primary_engine, replica_engines, max_lag=None, check_interval=None):
+        self.primary_engine = primary_engine
+        self.replicas = [_Replica(f"replica{index}", engine)
+                         for index, engine in enumerate(replica_engines, start=1)]
+        self.max_lag = max_lag if max_lag is not None else float(os.getenv('DB_REPLICA_MAX_LAG', '5'))
+        self.check_interval = check_interval or float(os.getenv('DB_REPLICA_CHECK_INTERVAL', '5'))
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+        self._primary_reads = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._heartbeat_ready = False
+
+    def start(self):
+        """Inicia el hilo que revisa el retraso de las réplicas."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='replica-monitor', daemon=True)
+        self._thread.start()
+        logger.info("Lecturas repartidas entre %d réplicas (retraso máximo %.1f s).",
+                    len(self.replicas), self.max_lag)
+
+    def stop(self):
+        """Detiene el hilo de revisión."""
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check_replicas()
+            self._stop.wait(self.check_interval)
+
+    def _write_heartbeat(self):
+        """Actualiza el latido en el primario (solo si hay réplicas que no son MySQL)."""
+        with self.primary_engine.begin() as connection:
+            if not self._heartbeat_ready:
+                replica_heartbeat.create(connection, checkfirst=True)
+                self._heartbeat_ready = True
+            connection.execute(delete(replica_heartbeat).where(replica_heartbeat.c.id == 1))
+            connection.execute(insert(replica_heartbeat).values(id=1, beat_at=datetime.utcnow()))
+
+    @staticmethod
+    def _measure_lag(engine):
+        """
+        Devuelve el retraso de la réplica en segundos, o None si no se puede saber
+        (por ejemplo, la replicación está detenida).
+        """
+        with engine.connect() as connection:
+            if engine.dialect.name == 'mysql':
+                for statement, column in (("SHOW REPLICA STATUS", 'Seconds_Behind_Source'),
+                                          ("SHOW SLAVE STATUS", 'Seconds_Behind_Master')):
+                    try:
+                        row = connection.exec_driver_sql(statement).mappings().first()
+                    except Exception:  # pylint: disable=W0718
+                        continue
+                    if row is None or row.get(column) is None:
+                        return None
+                    return float(row[column])
+                return None
+            beat_at = connection.execute(
+                select(replica_heartbeat.c.beat_at).where(replica_heartbeat.c.id == 1)
+            ).scalar()
+            if beat_at is None:
+                return None
+            return max(0.0, (datetime.utcnow() - beat_at).total_seconds())
+
+    def check_replicas(self):
+        """Mide el retraso de cada réplica y actualiza cuáles reciben lecturas."""
+        if self.max_lag and any(r.engine.dialect.name != 'mysql' for r in self.replicas):
+            try:
+                self._write_heartbeat()
+            except Exception as e:  # pylint: disable=W0718
+                logger.error("No se pudo escribir el latido de réplicas en el primario: %s", e)
+        for replica in self.replicas:
+            try:
+                if self.max_lag:
+                    lag = self._measure_lag(replica.engine)
+                else:
+                    with replica.engine.connect() as connection:
+                        connection.exec_driver_sql("SELECT 1")
+                    lag = 0.0
+                error = None
+            except Exception as e:  # pylint: disable=W0718
+                lag, error = None, f"{type(e).__name__}: {e}"
+            healthy = lag is not None and (not self.max_lag or lag <= self.max_lag)
+            if healthy != replica.healthy:
+                if healthy:
+                    logger.info("Réplica %s disponible para lecturas (retraso %.1f s).", replica.name, lag)
+                else:
+                    logger.error("Réplica %s fuera de servicio (retraso %s, error %s); se lee del primario.",
+                                 replica.name, lag, error)
+            with self._lock:
+                replica.lag, replica.last_error, replica.healthy = lag, error, healthy
+
+    def engines(self):
+        """Devuelve los motores de todas las réplicas."""
+        return [replica.engine for replica in self.replicas]
+
+    def choose(self):
+        """Devuelve el motor de una réplica al día (por turnos) o el primario si no hay ninguna."""
+        with self._lock:
+            healthy = [replica for replica in self.replicas if replica.healthy]
+            if not healthy:
+                self._primary_reads += 1
+                return self.primary_engine
+            replica = healthy[next(self._round_robin) % len(healthy)]
+            replica.reads += 1
+            return replica.engine
+
+    def get_stats(self):
+        """Devuelve el estado, el retraso y las métricas del pool de cada réplica."""
+        with self._lock:
+            replicas = {replica.name: {'healthy': replica.healthy, 'lag_s': replica.lag,
+                                       'last_error': replica.last_error, 'reads': replica.reads}
+                        for replica in self.replicas}
+            primary_reads = self._primary_reads
+        for replica in self.replicas:
+            if replica.pool_metrics is not None:
+                replicas[replica.name]['pool'] = replica.pool_metrics.get_stats(replica.engine.pool)
+        return {'replicas': replicas, 'reads_on_primary': primary_reads}
+
+
+class RoutingSession(Session):
+    """
+    Sesión de lectura: los SELECT van a la réplica elegida al empezar la sesión y todo
+    lo demás (INSERT/UPDATE/DELETE, flush, SQL textual) va al primario. Después de la
+    primera escritura la sesión queda fija en el primario, para leer lo que escribió.
+    """
+
+    def __init__(self, primary_engine, router, **kwargs):
+        super().__init__(**kwargs)
+        self._primary_engine = primary_engine
+        self._router = router
+        self._read_engine = None
+        self._pinned_to_primary = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._pinned_to_primary or self._flushing or not getattr(clause, 'is_select', False):
+            self._pinned_to_primary = True
+            return self._primary_engine
+        if self._read_engine is None:
+            self._read_engine = self._router.choose()
+        return self._read_engine
+
+
+def create_replica_router(primary_engine, engine_factory):
+    """
+    Crea un ReplicaRouter con las URLs de DB_REPLICA_URLS (separadas por coma).
+
+    :param primary_engine: Motor del primario.
+    :param engine_factory: Función que crea el motor de una réplica a partir de su URL,
+        con la misma configuración que el primario.
+    :return: El ReplicaRouter ya iniciado, o None si no hay réplicas configuradas.
+    """
+    urls = [url.strip() for url in os.getenv('DB_REPLICA_URLS', '').split(',') if url.strip()]
+    if not urls:
+        return None
+    router = ReplicaRouter(primary_engine, [engine_factory(url) for url in urls])
+    router.start()
+    return router
@@ -0,0 +1,131 @@
+"""
+Path: src/model/sqlite_database_connector.py
+Este módulo define un conector de base de datos SQLite en archivo para despliegues
+de un solo nodo, sin el viaje de red a MySQL en cada escritura.
+"""
+
+import os
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker, Session
+from src.logs.config_logger import LoggerConfigurator
+from src.model.database_connector_interface import DatabaseConnectorInterface
+from src.model.pool_metrics import InstrumentedQueuePool, attach_pool_metrics, warm_up_pool
+from src.model.replica_router import RoutingSession, create_replica_router
+
+# Configuración del logger al inicio del script
+logger = LoggerConfigurator().configure()
+
+class SQLiteDatabaseConnector(DatabaseConnectorInterface):
+    """
+    Conector SQLite en archivo, configurado para un servidor con varios hilos.
+
+    Cada conexión se abre en modo WAL (los lectores no bloquean al escritor), con
+    synchronous=NORMAL, caché de páginas, mmap y busy_timeout para esperar al escritor
+    en lugar de fallar con "database is locked". El pool entrega una conexión distinta a
+    cada hilo que trabaja a la vez; `check_same_thread` se desactiva porque el pool reusa
+    las conexiones entre hilos, nunca en dos hilos al mismo tiempo.
+
+    - SQLITE_PATH: archivo de la base (por defecto data/madybot.db).
+    - SQLITE_BUSY_TIMEOUT: segundos de espera por el lock de escritura (por defecto 5).
+    - SQLITE_SYNCHRONOUS: NORMAL (por defecto), FULL u OFF.
+    - SQLITE_CACHE_SIZE_KB: caché de páginas por conexión (por defecto 20000).
+    - SQLITE_MMAP_SIZE: bytes mapeados en memoria (por defecto 268435456).
+    - SQLITE_POOL_SIZE: conexiones abiertas como máximo (por defecto 8).
+    - DB_POOL_WARMUP: conexiones que `warm_up_pool` abre por adelantado (por defecto 2).
+    - DB_REPLICA_URLS: réplicas de lectura opcionales (ver ReplicaRouter).
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv('SQLITE_PATH', os.path.join('data', 'madybot.db'))
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self.busy_timeout = float(os.getenv('SQLITE_BUSY_TIMEOUT', '5'))
+        self.synchronous = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+        if self.synchronous not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+            raise ValueError(f"SQLITE_SYNCHRONOUS inválido: {self.synchronous}")
+        self.cache_size_kb = int(os.getenv('SQLITE_CACHE_SIZE_KB', '20000'))
+        self.mmap_size = int(os.getenv('SQLITE_MMAP_SIZE', '268435456'))
+        self.pool_size = int(os.getenv('SQLITE_POOL_SIZE', '8'))
+        self.pool_warmup = int(os.getenv('DB_POOL_WARMUP', '2'))
+        self.engine = self._create_engine(f"sqlite:///{self.path}")
+        self.pool_metrics = attach_pool_metrics(self.engine, 'primary')
+        self.Session = sessionmaker(bind=self.engine)
+        self.replica_router = create_replica_router(self.engine, self._create_engine)
+        logger.info("SQLiteDatabaseConnector usando %s (WAL, synchronous=%s).", self.path, self.synchronous)
+
+    def _create_engine(self, url):
+        """Crea un motor con el pool y los pragmas del conector (primario o réplica)."""
+        engine = create_engine(
+            url,
+            poolclass=InstrumentedQueuePool,
+            connect_args={'check_same_thread': False, 'timeout': self.busy_timeout},
+            pool_size=self.pool_size,
+            max_overflow=0,
+            pool_timeout=30,
+        )
+        event.listen(engine, 'connect', self._configure_connection)
+        return engine
+
+    def _configure_connection(self, dbapi_connection, _connection_record):
+        """Aplica los pragmas a cada conexión nueva."""
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA synchronous={self.synchronous}")
+            cursor.execute(f"PRAGMA cache_size=-{self.cache_size_kb}")
+            cursor.execute(f"PRAGMA mmap_size={self.mmap_size}")
+            cursor.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA foreign_keys=ON")
+        finally:
+            cursor.close()
+
+    def bulk_insert(self, session: Session, model, rows):
+        """
+        Inserta varias filas con executemany: SQLite prepara la sentencia una sola vez y
+        no hay límite de parámetros por sentencia como en un INSERT de varias filas.
+        """
+        if rows:
+            session.execute(insert(model), rows)
+
+    def get_session(self) -> Session:
+        """Obtiene una nueva sesión de la base de datos."""
+        return self.Session()
+
+    def get_read_session(self) -> Session:
+        """Obtiene una sesión que lee de una réplica al día, o del primario si no hay."""
+        if self.replica_router is None:
+            return self.Session()
+        return RoutingSession(self.engine, self.replica_router)
+
+    def warm_up_pool(self, count=None):
+        """Abre `count` (o DB_POOL_WARMUP) conexiones en el primario y en cada réplica."""
+        engines = [self.engine] + (self.replica_router.engines() if self.replica_router else [])
+        return sum(warm_up_pool(engine, self.pool_warmup if count is None else count) for engine in engines)
+
+    def get_stats(self):
+        """Devuelve las métricas del pool del primario y de las réplicas."""
+        stats = {'primary': self.pool_metrics.get_stats(self.engine.pool)}
+        if self.replica_router is not None:
+            stats.update(self.replica_router.get_stats())
+        return stats
+
+    def optimize(self):
+        """
+        Actualiza las estadísticas del planificador con un ANALYZE acotado. SQLite no las
+        mantiene solo como MySQL; sin ellas puede elegir planes que recorren toda la tabla.
+        """
+        with self.engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA analysis_limit=1000")
+            connection.exec_driver_sql("ANALYZE")
+            connection.commit()
+
+    def close_engine(self):
+        """Actualiza las estadísticas y cierra el motor de la base de datos."""
+        try:
+            self.optimize()
+        except Exception as e:  # pylint: disable=W0718
+            logger.warning("No se pudieron actualizar las estadísticas de SQLite: %s", e)
+        if self.replica_router is not None:
+            self.replica_router.stop()
+        self.engine.dispose()
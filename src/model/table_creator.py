@@ -1,44 +1,127 @@
-"""
-Path: src/model/table_creator.py
-
-"""
-
-from sqlalchemy import text
-import sqlalchemy
-from sqlalchemy.orm import Session
-from src.logs.config_logger import LoggerConfigurator
-from src.model.table_creation_strategy import TableCreationStrategy
-
-# Configuración del logger al inicio del script
-logger = LoggerConfigurator().configure()
-
-class TableCreator(TableCreationStrategy):
-    """Clase para manejar la creación de tablas en la base de datos."""
-    def create_tables(self, session: Session):
-        """Crea las tablas necesarias en la base de datos."""
-        try:
-            # Crear tabla 'usuarios'
-            session.execute(text("""
-                CREATE TABLE IF NOT EXISTS usuarios (
-                    user_id INT AUTO_INCREMENT PRIMARY KEY,
-                    username VARCHAR(255),
-                    email VARCHAR(255),
-                    phone_number VARCHAR(20),
-                    first_connection_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """))
-            # Crear tabla 'mensajes'
-            session.execute(text("""
-                CREATE TABLE IF NOT EXISTS mensajes (
-                    message_id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id INT,
-                    message TEXT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES usuarios(user_id)
-                )
-            """))
-            session.commit()
-            logger.info("Tablas verificadas/creadas exitosamente.")
-        except (sqlalchemy.exc.SQLAlchemyError, sqlalchemy.exc.OperationalError) as e:
-            session.rollback()
-            logger.error("Error al crear las tablas: %s", e)
+"""
+Path: src/model/table_creator.py
+
+"""
+
+from sqlalchemy import inspect, text
+import sqlalchemy
+from sqlalchemy.orm import Session
+from src.logs.config_logger import LoggerConfigurator
+from src.model.models import Base
+from src.model.table_creation_strategy import TableCreationStrategy
+
+# Configuración del logger al inicio del script
+logger = LoggerConfigurator().configure()
+
+def backfill_external_ids(session: Session):
+    """
+    Completa usuarios.external_id en tablas creadas antes de la columna. Hasta entonces el
+    id del navegador se guardaba en username; si un id quedó repetido se asigna al usuario
+    más antiguo.
+    """
+    result = session.execute(text("""
+        UPDATE usuarios SET external_id = username
+        WHERE external_id IS NULL AND user_id IN (
+            SELECT user_id FROM (SELECT MIN(user_id) AS user_id FROM usuarios GROUP BY username) AS firsts
+        )
+    """))
+    logger.info("Columna external_id agregada a usuarios (%d usuarios completados).", result.rowcount)
+
+class TableCreator(TableCreationStrategy):
+    """Clase para manejar la creación de tablas en la base de datos."""
+    def create_tables(self, session: Session):
+        """Crea las tablas necesarias en la base de datos."""
+        try:
+            # Crear tabla 'usuarios'
+            session.execute(text("""
+                CREATE TABLE IF NOT EXISTS usuarios (
+                    user_id INT AUTO_INCREMENT PRIMARY KEY,
+                    external_id VARCHAR(255) NULL,
+                    username VARCHAR(255),
+                    email VARCHAR(255),
+                    phone_number VARCHAR(20),
+                    first_connection_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE INDEX uq_usuarios_external_id (external_id)
+                )
+            """))
+            # Crear tabla 'mensajes'
+            session.execute(text("""
+                CREATE TABLE IF NOT EXISTS mensajes (
+                    message_id INT AUTO_INCREMENT PRIMARY KEY,
+                    user_id INT,
+                    role VARCHAR(10) NOT NULL DEFAULT 'user',
+                    message TEXT,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    INDEX idx_mensajes_user_timestamp (user_id, timestamp, message_id),
+                    FOREIGN KEY (user_id) REFERENCES usuarios(user_id)
+                )
+            """))
+            # Las tablas creadas antes de agregar el índice no lo reciben con CREATE TABLE IF NOT EXISTS
+            self._ensure_index(session, 'mensajes', 'idx_mensajes_user_timestamp',
+                               '(user_id, timestamp, message_id)')
+            if not self._column_exists(session, 'usuarios', 'external_id'):
+                session.execute(text("ALTER TABLE usuarios ADD COLUMN external_id VARCHAR(255) NULL AFTER user_id"))
+                backfill_external_ids(session)
+            if not self._column_exists(session, 'mensajes', 'role'):
+                session.execute(text(
+                    "ALTER TABLE mensajes ADD COLUMN role VARCHAR(10) NOT NULL DEFAULT 'user' AFTER user_id"))
+                logger.info("Columna role agregada a mensajes.")
+            self._ensure_index(session, 'usuarios', 'uq_usuarios_external_id', '(external_id)', unique=True)
+            session.commit()
+            logger.info("Tablas verificadas/creadas exitosamente.")
+        except (sqlalchemy.exc.SQLAlchemyError, sqlalchemy.exc.OperationalError) as e:
+            session.rollback()
+            logger.error("Error al crear las tablas: %s", e)
+            raise
+
+    @staticmethod
+    def _column_exists(session: Session, table, column):
+        """Indica si la columna ya existe en la tabla."""
+        return bool(session.execute(text("""
+            SELECT COUNT(*) FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = :table AND column_name = :column
+        """), {'table': table, 'column': column}).scalar())
+
+    @staticmethod
+    def _ensure_index(session: Session, table, index_name, columns, unique=False):
+        """Crea el índice en la tabla si todavía no existe."""
+        exists = session.execute(text("""
+            SELECT COUNT(*) FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = :table AND index_name = :index_name
+        """), {'table': table, 'index_name': index_name}).scalar()
+        if not exists:
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            session.execute(text(f"ALTER TABLE {table} ADD {kind} {index_name} {columns}"))
+            logger.info("Índice %s creado en la tabla %s.", index_name, table)
+
+
+class MetadataTableCreator(TableCreationStrategy):
+    """
+    Crea las tablas a partir de `models.Base.metadata` con el DDL del dialecto de la
+    sesión. Se usa con motores distintos de MySQL, como SQLite.
+    """
+    def create_tables(self, session: Session):
+        """Crea las tablas y los índices que falten."""
+        try:
+            connection = session.connection()
+            inspector = inspect(connection)
+            # create_all no agrega columnas a tablas existentes
+            if inspector.has_table('usuarios') and 'external_id' not in {
+                    column['name'] for column in inspector.get_columns('usuarios')}:
+                session.execute(text("ALTER TABLE usuarios ADD COLUMN external_id VARCHAR(255)"))
+                backfill_external_ids(session)
+            if inspector.has_table('mensajes') and 'role' not in {
+                    column['name'] for column in inspector.get_columns('mensajes')}:
+                session.execute(text("ALTER TABLE mensajes ADD COLUMN role VARCHAR(10) NOT NULL DEFAULT 'user'"))
+                logger.info("Columna role agregada a mensajes.")
+            Base.metadata.create_all(connection)
+            # Ni los índices de tablas que ya existían
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(connection, checkfirst=True)
+            session.commit()
+            logger.info("Tablas verificadas/creadas exitosamente.")
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            session.rollback()
+            logger.error("Error al crear las tablas: %s", e)
+            raise
@@ -0,0 +1,38 @@
+"""
+Path: src/services/admin_auth.py
+Este módulo verifica el token de administración que protege los endpoints internos,
+como /history/<user_id> y su exportación.
+"""
+
+import hmac
+import os
+
+class AdminTokenAuth:
+    """
+    AdminTokenAuth compara el encabezado `Authorization: Bearer <token>` con
+    HISTORY_ADMIN_TOKEN. Sin token configurado los endpoints protegidos quedan
+    deshabilitados y responden 404, como si no existieran.
+    """
+
+    def __init__(self, token=None):
+        self.token = token if token is not None else os.getenv('HISTORY_ADMIN_TOKEN', '')
+
+    @property
+    def enabled(self):
+        """Indica si hay un token configurado."""
+        return bool(self.token)
+
+    def check(self, authorization):
+        """
+        Verifica el encabezado Authorization de la solicitud.
+
+        :param authorization: Valor del encabezado, o None si no se envió.
+        :return: None si la solicitud está autorizada; si no, una tupla (código HTTP, mensaje).
+        """
+        if not self.enabled:
+            return 404, "Recurso no encontrado."
+        scheme, _, credentials = (authorization or '').partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(
+                credentials.strip().encode('utf-8'), self.token.encode('utf-8')):
+            return 401, "Se requiere un token de administración válido."
+        return None
@@ -0,0 +1,265 @@
+"""
+Path: src/services/admission_controller.py
+Este módulo controla la admisión de solicitudes al modelo de lenguaje: limita cuántas
+llamadas hay en curso, acota la cola de espera y aplica un límite de frecuencia por usuario.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from src.logs.config_logger import LoggerConfigurator
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+class AdmissionRejectedError(Exception):
+    """
+    La solicitud no fue admitida. `status` es 429 (límite del usuario) o 503 (servidor
+    saturado) y `retry_after` los segundos sugeridos para reintentar.
+    """
+
+    def __init__(self, message, status, retry_after):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Cubeta de tokens de un usuario; se recarga de forma perezosa al consultarla."""
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('tokens', 'updated')
+
+    def __init__(self, tokens, now):
+        self.tokens = tokens
+        self.updated = now
+
+
+class AdmissionController:
+    """
+    AdmissionController se ubica delante de ResponseGenerator.
+
+    - ADMISSION_MAX_CONCURRENCY: llamadas al modelo en curso a la vez (por defecto 32).
+    - ADMISSION_MAX_QUEUE: solicitudes que pueden esperar un lugar (por defecto 100); con la
+      cola llena se responde 503 de inmediato.
+    - ADMISSION_QUEUE_TIMEOUT: segundos máximos de espera en la cola antes de responder 503.
+    - ADMISSION_USER_RATE / ADMISSION_USER_BURST: tokens por segundo y capacidad de la cubeta
+      de cada usuario (`user_data.id`); sin tokens se responde 429.
+    - ADMISSION_USER_BUCKETS: cantidad máxima de cubetas en memoria (expulsión LRU).
+    - ADMISSION_BATCH_RATE / ADMISSION_BATCH_BURST: items por segundo y capacidad de la cubeta
+      de lotes de cada usuario (por defecto ADMISSION_USER_RATE y 50). Un lote se admite
+      completo con `admit_batch`, que cobra cada item a la cubeta de lotes de su propio
+      usuario; luego sus items solo ocupan lugares de concurrencia.
+
+    El modo Flask espera con un `threading.Condition` y el modo ASGI con futures del event
+    loop; al liberarse un lugar se entrega primero a los que esperan en el event loop.
+    """
+
+    def __init__(self, max_concurrency=None, max_queue=None, queue_timeout=None,
+                 user_rate=None, user_burst=None, max_buckets=None, retry_after=None,
+                 clock=time.monotonic):
+        self.max_concurrency = max_concurrency or int(os.getenv('ADMISSION_MAX_CONCURRENCY', '32'))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv('ADMISSION_MAX_QUEUE', '100'))
+        self.queue_timeout = queue_timeout or float(os.getenv('ADMISSION_QUEUE_TIMEOUT', '5'))
+        self.user_rate = user_rate or float(os.getenv('ADMISSION_USER_RATE', '1'))
+        self.user_burst = user_burst or float(os.getenv('ADMISSION_USER_BURST', '5'))
+        self.max_buckets = max_buckets or int(os.getenv('ADMISSION_USER_BUCKETS', '10000'))
+        self.batch_rate = float(os.getenv('ADMISSION_BATCH_RATE', str(self.user_rate)))
+        self.batch_burst = float(os.getenv('ADMISSION_BATCH_BURST', '50'))
+        self.retry_after = retry_after or float(os.getenv('ADMISSION_RETRY_AFTER', '1'))
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._async_waiters = deque()
+        self._buckets = OrderedDict()
+        self._bucket_lock = threading.Lock()
+        self._wait_times = deque(maxlen=1024)
+        self._stats = {'admitted': 0, 'rate_limited': 0, 'queue_full': 0, 'queue_timeout': 0}
+
+    def _refill(self, key, rate, burst, now):
+        """Devuelve la cubeta `key` recargada hasta `now`; requiere `_bucket_lock`."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(burst, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated) * rate)
+            bucket.updated = now
+        return bucket
+
+    def _take_tokens(self, user_id, cost):
+        """Descuenta `cost` tokens de la cubeta del usuario o rechaza con 429."""
+        now = self._clock()
+        with self._bucket_lock:
+            bucket = self._refill(user_id, self.user_rate, self.user_burst, now)
+            if bucket.tokens >= cost:
+                bucket.tokens -= cost
+                return
+            missing = cost - bucket.tokens
+        self._count('rate_limited')
+        raise AdmissionRejectedError("Demasiadas solicitudes, intentá de nuevo en unos segundos.", 429,
+                                     max(1, math.ceil(missing / self.user_rate)))
+
+    def admit_batch(self, user_ids):
+        """
+        Admite un lote completo cobrando cada item a la cubeta de lotes de su usuario.
+        El lote se admite solo si todos sus usuarios tienen tokens; si no, no se descuenta
+        nada. Los items se ejecutan luego con `admit(None)`: ya pagaron su cuota y solo
+        ocupan lugares de concurrencia.
+
+        :param user_ids: `user_data.id` de cada item válido del lote.
+        :raises AdmissionRejectedError: 429 si la cubeta de algún usuario no alcanza.
+        """
+        costs = {}
+        for user_id in user_ids:
+            costs[user_id] = costs.get(user_id, 0) + 1
+        now = self._clock()
+        with self._bucket_lock:
+            buckets = {user_id: self._refill(('batch', user_id), self.batch_rate, self.batch_burst, now)
+                       for user_id in costs}
+            missing = max(min(cost, self.batch_burst) - buckets[user_id].tokens
+                          for user_id, cost in costs.items())
+            if missing <= 0:
+                for user_id, cost in costs.items():
+                    buckets[user_id].tokens -= min(cost, self.batch_burst)
+                return
+        self._count('rate_limited')
+        raise AdmissionRejectedError("Demasiados lotes, intentá de nuevo en unos segundos.", 429,
+                                     max(1, math.ceil(missing / self.batch_rate)))
+
+    def _count(self, key):
+        with self._condition:
+            self._stats[key] += 1
+
+    def _reject(self, key):
+        """Registra el rechazo por saturación y devuelve el error 503 correspondiente."""
+        self._stats[key] += 1
+        logger.info("Solicitud rechazada por saturación (%s): %d en curso, %d en cola.",
+                    key, self._active, self._waiting)
+        return AdmissionRejectedError("El servicio está saturado, intentá de nuevo en unos segundos.", 503,
+                                      max(1, math.ceil(self.retry_after)))
+
+    def _admitted(self, started):
+        self._stats['admitted'] += 1
+        self._wait_times.append(self._clock() - started)
+
+    def acquire(self, user_id, cost=1):
+        """
+        Reserva un lugar para llamar al modelo, esperando en la cola si hace falta.
+        Debe liberarse con `release`.
+
+        :param user_id: Usuario cuya cubeta se consume; None para items de un lote ya admitido
+            con `admit_batch`.
+        :raises AdmissionRejectedError: Si el usuario no tiene tokens o la cola no admite la espera.
+        """
+        if user_id is not None:
+            self._take_tokens(user_id, cost)
+        started = self._clock()
+        with self._condition:
+            if self._active >= self.max_concurrency:
+                if self._waiting >= self.max_queue:
+                    raise self._reject('queue_full')
+                deadline = started + self.queue_timeout
+                self._waiting += 1
+                try:
+                    while self._active >= self.max_concurrency:
+                        remaining = deadline - self._clock()
+                        if remaining <= 0:
+                            raise self._reject('queue_timeout')
+                        self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._active += 1
+            self._admitted(started)
+
+    async def acquire_async(self, user_id, cost=1):
+        """
+        Versión asíncrona de `acquire` para el modo ASGI. Debe liberarse con `release`
+        desde el mismo event loop.
+        """
+        if user_id is not None:
+            self._take_tokens(user_id, cost)
+        started = self._clock()
+        with self._condition:
+            if self._active < self.max_concurrency:
+                self._active += 1
+                self._admitted(started)
+                return
+            if self._waiting >= self.max_queue:
+                raise self._reject('queue_full')
+            self._waiting += 1
+            future = asyncio.get_running_loop().create_future()
+            self._async_waiters.append(future)
+        try:
+            # `release` transfiere el lugar al completar el future, sin pasar por _active.
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            with self._condition:
+                self._waiting -= 1
+                raise self._reject('queue_timeout') from None
+        except asyncio.CancelledError:
+            with self._condition:
+                self._waiting -= 1
+            if future.done() and not future.cancelled():
+                # El lugar ya había sido transferido cuando se canceló la espera.
+                self.release()
+            raise
+        with self._condition:
+            self._waiting -= 1
+            self._admitted(started)
+
+    def release(self):
+        """Libera un lugar y lo entrega a la siguiente solicitud en espera."""
+        with self._condition:
+            while self._async_waiters:
+                future = self._async_waiters.popleft()
+                if not future.done():
+                    future.set_result(True)
+                    return
+            self._active -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def admit(self, user_id, cost=1):
+        """Context manager que reserva un lugar durante el bloque."""
+        self.acquire(user_id, cost)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def admit_async(self, user_id, cost=1):
+        """Context manager asíncrono equivalente a `admit`."""
+        await self.acquire_async(user_id, cost)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_stats(self):
+        """Devuelve los lugares en uso, la profundidad de la cola y los tiempos de espera en ms."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats['active'] = self._active
+            stats['queue_depth'] = self._waiting
+            waits = sorted(self._wait_times)
+        stats['max_concurrency'] = self.max_concurrency
+        stats['max_queue'] = self.max_queue
+        with self._bucket_lock:
+            stats['user_buckets'] = len(self._buckets)
+        if waits:
+            stats['wait_ms'] = {
+                'mean': sum(waits) / len(waits) * 1000,
+                'p50': waits[len(waits) // 2] * 1000,
+                'p99': waits[min(len(waits) - 1, int(len(waits) * 0.99))] * 1000,
+                'max': waits[-1] * 1000,
+            }
+        return stats
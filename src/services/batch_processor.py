@@ -0,0 +1,146 @@
+"""
+Path: src/services/batch_processor.py
+Este módulo procesa lotes de prompts repartiéndolos entre un pool acotado de workers.
+"""
+
+import asyncio
+import contextlib
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from src.logs.config_logger import LoggerConfigurator
+from src.services.admission_controller import AdmissionRejectedError
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+def describe_error(error):
+    """
+    Traduce una excepción del generador al mensaje y código HTTP que usa el controlador.
+    """
+    if isinstance(error, AdmissionRejectedError):
+        return str(error), error.status
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return "Error de conexión al generar la respuesta.", 503
+    if isinstance(error, RuntimeError):
+        return "Error de ejecución en el generador de respuesta.", 500
+    return "Error desconocido en la generación de la respuesta.", 500
+
+def _item_result(index, code, message=None, errors=None):
+    """Arma el resultado de un item del lote."""
+    return {
+        "index": index,
+        "code": code,
+        "response_MadyBot": message,
+        "errors": errors,
+    }
+
+class BatchProcessor:
+    """
+    BatchProcessor envía los prompts de un lote a ResponseGenerator con un pool de
+    hilos compartido (env BATCH_MAX_WORKERS) y entrega los resultados en orden de
+    finalización. Cada lote mantiene a lo sumo `max_workers` items en curso, así un
+    lote grande no acapara la cola del pool. Si se indica un AdmissionController, el lote
+    se admite una vez con `admit`, que cobra cada item a la cubeta de lotes de su usuario,
+    y luego cada item ocupa un lugar de concurrencia.
+    """
+
+    def __init__(self, response_generator, max_workers=None, admission_controller=None):
+        self.response_generator = response_generator
+        self.admission_controller = admission_controller
+        self.max_workers = max_workers or int(os.getenv('BATCH_MAX_WORKERS', '8'))
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix='batch-worker'
+            )
+        return self._executor
+
+    def admit(self, items):
+        """
+        Admite el lote completo antes de procesarlo.
+
+        :raises AdmissionRejectedError: Si la cubeta de lotes de algún usuario no alcanza.
+        """
+        if self.admission_controller is not None:
+            user_ids = [data['user_data']['id'] for data, errors in items if errors is None]
+            if user_ids:
+                self.admission_controller.admit_batch(user_ids)
+
+    def _generate(self, index, data):
+        """Genera la respuesta de un item y captura su error."""
+        admission = (self.admission_controller.admit(None)
+                     if self.admission_controller is not None else contextlib.nullcontext())
+        try:
+            with admission:
+                message = self.response_generator.generate_response(
+                    data['prompt_user'], data['user_data']['id'], use_cache=not data['no_cache'])
+            return _item_result(index, 200, message)
+        except Exception as e:  # pylint: disable=W0718
+            logger.error("Error en el item %d del lote: %s", index, e)
+            message, code = describe_error(e)
+            return _item_result(index, code, message)
+
+    def process(self, items):
+        """
+        Procesa un lote ya validado.
+
+        :param items: Lista de tuplas (datos, errores) devuelta por `validate_batch`.
+        :return: Generador de resultados por item, en orden de finalización.
+        """
+        executor = self._get_executor()
+        pending = set()
+        queue = iter(enumerate(items))
+        try:
+            for index, (data, errors) in queue:
+                if errors is not None:
+                    yield _item_result(index, 400, "Datos inválidos en la solicitud.", errors)
+                    continue
+                pending.add(executor.submit(self._generate, index, data))
+                if len(pending) >= self.max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            # Si el cliente abandona el stream se descartan los items que aún no empezaron.
+            for future in pending:
+                future.cancel()
+
+    async def process_async(self, items):
+        """
+        Versión asíncrona de `process` para el modo ASGI: a lo sumo `max_workers`
+        items del lote esperan al modelo a la vez.
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def generate(index, data):
+            async with semaphore:
+                admission = (self.admission_controller.admit_async(None)
+                             if self.admission_controller is not None else contextlib.nullcontext())
+                try:
+                    async with admission:
+                        message = await self.response_generator.generate_response_async(
+                            data['prompt_user'], data['user_data']['id'], use_cache=not data['no_cache'])
+                    return _item_result(index, 200, message)
+                except Exception as e:  # pylint: disable=W0718
+                    logger.error("Error en el item %d del lote: %s", index, e)
+                    message, code = describe_error(e)
+                    return _item_result(index, code, message)
+
+        tasks = []
+        for index, (data, errors) in enumerate(items):
+            if errors is not None:
+                yield _item_result(index, 400, "Datos inválidos en la solicitud.", errors)
+            else:
+                tasks.append(asyncio.create_task(generate(index, data)))
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,123 @@
+"""
+Path: src/services/circuit_breaker.py
+Este módulo contiene un circuit breaker que corta las llamadas al modelo de lenguaje
+mientras el servicio remoto está fallando.
+"""
+
+import os
+import threading
+import time
+from src.logs.config_logger import LoggerConfigurator
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(ConnectionError):
+    """
+    El circuito está abierto y la llamada se rechazó sin intentarla. Hereda de
+    ConnectionError para que los controladores respondan 503.
+    """
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    CircuitBreaker con los estados closed, open y half_open.
+
+    - CIRCUIT_FAILURE_THRESHOLD: fallas consecutivas que abren el circuito (por defecto 5).
+    - CIRCUIT_RESET_TIMEOUT: segundos que el circuito permanece abierto antes de probar
+      de nuevo (por defecto 30).
+    - CIRCUIT_HALF_OPEN_MAX_CALLS: llamadas de prueba permitidas en half_open (por defecto 1).
+
+    Cada cambio de estado se registra en el log y se cuenta en `get_stats`.
+    """
+
+    def __init__(self, failure_threshold=None, reset_timeout=None, half_open_max_calls=None,
+                 clock=time.monotonic):
+        self.failure_threshold = failure_threshold or int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))
+        self.reset_timeout = reset_timeout or float(os.getenv('CIRCUIT_RESET_TIMEOUT', '30'))
+        self.half_open_max_calls = half_open_max_calls or int(os.getenv('CIRCUIT_HALF_OPEN_MAX_CALLS', '1'))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._stats = {'rejected': 0, 'successes': 0, 'failures': 0,
+                       'transitions': {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}}
+
+    def _transition(self, state):
+        """Cambia de estado; debe llamarse con el lock tomado."""
+        if state == self._state:
+            return
+        # La apertura se registra como error y la recuperación como información: el filtro
+        # del logger descarta WARNING.
+        log = logger.error if state == OPEN else logger.info
+        log("Circuit breaker: %s -> %s (fallas consecutivas: %d).", self._state, state, self._failures)
+        self._state = state
+        self._stats['transitions'][state] += 1
+        if state == OPEN:
+            self._opened_at = self._clock()
+        elif state == HALF_OPEN:
+            self._half_open_calls = 0
+        else:
+            self._failures = 0
+
+    @property
+    def state(self):
+        """Estado actual, pasando a half_open si ya venció el tiempo de apertura."""
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self._transition(HALF_OPEN)
+            return self._state
+
+    def before_call(self):
+        """
+        Autoriza una llamada o la rechaza si el circuito está abierto.
+
+        :raises CircuitOpenError: Si el circuito no admite llamadas en este momento.
+        """
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self._transition(HALF_OPEN)
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return
+            self._stats['rejected'] += 1
+            retry_after = max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+        raise CircuitOpenError("El modelo de lenguaje no está disponible temporalmente.", retry_after)
+
+    def record_success(self):
+        """Registra una llamada exitosa; en half_open cierra el circuito."""
+        with self._lock:
+            self._stats['successes'] += 1
+            self._failures = 0
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        """Registra una falla del servicio remoto; abre el circuito al superar el umbral."""
+        with self._lock:
+            self._stats['failures'] += 1
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._transition(OPEN)
+
+    def get_stats(self):
+        """Devuelve el estado, las fallas consecutivas y los contadores del circuito."""
+        state = self.state
+        with self._lock:
+            stats = dict(self._stats)
+            stats['transitions'] = dict(self._stats['transitions'])
+            stats['consecutive_failures'] = self._failures
+        stats['state'] = state
+        return stats
@@ -0,0 +1,134 @@
+"""
+Path: src/services/context_manager.py
+Este módulo acota el contexto que se envía al modelo en cada turno: conserva los
+últimos intercambios textuales y resume los anteriores en una ventana deslizante.
+"""
+
+import os
+import threading
+from src.logs.config_logger import LoggerConfigurator
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+SUMMARY_PREFIX = "Resumen de la conversación anterior:\n"
+SUMMARY_ACK = "Entendido, tengo en cuenta ese contexto."
+
+def _shorten(text, limit):
+    """Recorta el texto a `limit` caracteres, en una sola línea."""
+    text = ' '.join(text.split())
+    return text if len(text) <= limit else text[:limit - 1] + '…'
+
+def extractive_summary(turns, line_chars=160):
+    """
+    Resume turnos sin llamar al modelo: una línea por intercambio con el comienzo del
+    mensaje del usuario y de la respuesta.
+    """
+    lines = []
+    for index in range(0, len(turns) - 1, 2):
+        user_text = _shorten(turns[index]['text'], line_chars // 2)
+        model_text = _shorten(turns[index + 1]['text'], line_chars)
+        lines.append(f"- Usuario: {user_text} / MadyBot: {model_text}")
+    return '\n'.join(lines)
+
+class ConversationContextManager:
+    """
+    ConversationContextManager mantiene el historial de cada sesión dentro de un
+    presupuesto de caracteres (env CONTEXT_MAX_CHARS).
+
+    Las instrucciones del sistema las envía siempre el backend. Del historial se conservan
+    textuales los últimos CONTEXT_KEEP_TURNS intercambios; los anteriores se pliegan en un
+    resumen que se guarda en la sesión, de modo que cada turno solo resume los intercambios
+    nuevos que salen de la ventana. El resumen se limita a CONTEXT_SUMMARY_MAX_CHARS
+    descartando sus líneas más antiguas.
+    """
+
+    def __init__(self, max_chars=None, keep_turns=None, summary_max_chars=None, summarizer=None):
+        self.max_chars = max_chars or int(os.getenv('CONTEXT_MAX_CHARS', '12000'))
+        self.keep_turns = keep_turns or int(os.getenv('CONTEXT_KEEP_TURNS', '6'))
+        self.summary_max_chars = summary_max_chars or int(os.getenv('CONTEXT_SUMMARY_MAX_CHARS', '2000'))
+        self.summarizer = summarizer or extractive_summary
+        self._lock = threading.Lock()
+        self._stats = {'prompts': 0, 'prompt_chars_total': 0, 'prompt_chars_max': 0,
+                       'compactions': 0, 'turns_folded': 0, 'truncations': 0}
+
+    @staticmethod
+    def _chars(turns):
+        return sum(len(turn['text']) for turn in turns)
+
+    def _fold(self, history, count):
+        """Pliega en el resumen los primeros `count` turnos del historial."""
+        folded = history.turns[:count]
+        del history.turns[:count]
+        summary = '\n'.join(part for part in (history.summary, self.summarizer(folded)) if part)
+        while len(summary) > self.summary_max_chars and '\n' in summary:
+            summary = summary.split('\n', 1)[1]
+        history.summary = summary[-self.summary_max_chars:]
+        logger.debug("Se resumieron %d turnos del historial (resumen de %d caracteres).",
+                     len(folded), len(history.summary))
+        with self._lock:
+            self._stats['compactions'] += 1
+            self._stats['turns_folded'] += len(folded)
+
+    def _budget(self, history, message):
+        """Caracteres disponibles para los turnos textuales, descontando el mensaje y el resumen."""
+        summary_chars = len(SUMMARY_PREFIX) + len(history.summary) + len(SUMMARY_ACK) if history.summary else 0
+        return self.max_chars - len(message) - summary_chars
+
+    def _truncate(self, turns, budget):
+        """
+        Recorta los turnos que quedan para que entren en `budget` caracteres: se reparte el
+        presupuesto en partes iguales y cada turno conserva su comienzo.
+        """
+        remaining = max(budget, 0)
+        for index, turn in enumerate(turns):
+            limit = remaining // (len(turns) - index)
+            if len(turn['text']) > limit:
+                turn['text'] = turn['text'][:limit - 1] + '…' if limit > 0 else ''
+            remaining -= len(turn['text'])
+        logger.debug("Se recortó el último intercambio a %d caracteres.", self._chars(turns))
+        with self._lock:
+            self._stats['truncations'] += 1
+
+    def compact(self, history, message=''):
+        """
+        Reduce el historial a la ventana configurada y al presupuesto de caracteres,
+        conservando siempre al menos el último intercambio; si ese intercambio solo ya
+        excede el presupuesto, se recorta.
+        """
+        excess = len(history.turns) - self.keep_turns * 2
+        if excess > 0:
+            self._fold(history, excess + excess % 2)
+        budget = self._budget(history, message)
+        while len(history.turns) > 2 and self._chars(history.turns) > budget:
+            self._fold(history, 2)
+            budget = self._budget(history, message)
+        if self._chars(history.turns) > budget:
+            self._truncate(history.turns, budget)
+
+    def build(self, history, message):
+        """
+        Compacta el historial si hace falta y devuelve los turnos a enviar al modelo,
+        con el resumen (si existe) como primer intercambio.
+        """
+        self.compact(history, message)
+        turns = list(history.turns)
+        if history.summary:
+            turns[:0] = [{'role': 'user', 'text': SUMMARY_PREFIX + history.summary},
+                         {'role': 'model', 'text': SUMMARY_ACK}]
+        size = self._chars(turns) + len(message)
+        with self._lock:
+            self._stats['prompts'] += 1
+            self._stats['prompt_chars_total'] += size
+            self._stats['prompt_chars_max'] = max(self._stats['prompt_chars_max'], size)
+        return turns
+
+    def get_stats(self):
+        """Devuelve las métricas de tamaño de prompt y de compactación."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['prompt_chars_mean'] = (stats['prompt_chars_total'] / stats['prompts']
+                                      if stats['prompts'] else 0.0)
+        stats['max_chars'] = self.max_chars
+        stats['keep_turns'] = self.keep_turns
+        return stats
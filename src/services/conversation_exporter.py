@@ -0,0 +1,237 @@
+"""
+Path: src/services/conversation_exporter.py
+Este módulo exporta las tablas mensajes y usuarios a archivos para análisis fuera de
+línea: JSONL comprimido (gzip o zstd) o Parquet, leyendo en bloques acotados con un
+cursor del lado del servidor y con exportaciones incrementales desde una marca de agua.
+"""
+
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from src.logs.config_logger import LoggerConfigurator
+from src.model.models import Mensaje, Usuario
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+FORMATS = ('jsonl', 'parquet')
+COMPRESSIONS = ('gzip', 'zstd', 'none')
+
+# Columnas exportadas y clave creciente de cada tabla, que sirve de marca de agua
+EXPORT_TABLES = {
+    'mensajes': {
+        'columns': (Mensaje.message_id, Mensaje.user_id, Usuario.external_id, Mensaje.role,
+                    Mensaje.message, Mensaje.timestamp),
+        'key': Mensaje.message_id,
+        'timestamp': Mensaje.timestamp,
+        'join': (Usuario, Usuario.user_id == Mensaje.user_id),
+    },
+    'usuarios': {
+        'columns': (Usuario.user_id, Usuario.external_id, Usuario.username, Usuario.email,
+                    Usuario.phone_number, Usuario.first_connection_timestamp),
+        'key': Usuario.user_id,
+        'timestamp': Usuario.first_connection_timestamp,
+        'join': None,
+    },
+}
+
+def open_compressed(path, compression, mode='wt'):
+    """
+    Abre un archivo de texto comprimido con gzip, zstd (requiere el paquete `zstandard`)
+    o sin comprimir ('none').
+    """
+    if compression == 'gzip':
+        return gzip.open(path, mode, encoding='utf-8', compresslevel=6)
+    if compression == 'zstd':
+        try:
+            import zstandard  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise RuntimeError("La compresión zstd requiere el paquete zstandard (pip install zstandard).") from e
+        return zstandard.open(path, mode, encoding='utf-8')
+    if compression == 'none':
+        return open(path, mode, encoding='utf-8')
+    raise ValueError(f"Compresión desconocida: {compression}")
+
+def file_extension(export_format, compression):
+    """Extensión del archivo según el formato y la compresión (Parquet comprime por dentro)."""
+    if export_format == 'parquet':
+        return '.parquet'
+    return '.jsonl' + {'gzip': '.gz', 'zstd': '.zst', 'none': ''}[compression]
+
+def _serialize(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class _JsonlWriter:
+    """Escribe cada fila como una línea JSON."""
+
+    def __init__(self, path, compression, _columns):
+        self._file = open_compressed(path, compression)
+
+    def write(self, rows):
+        self._file.writelines(json.dumps(row, ensure_ascii=False, default=_serialize) + '\n' for row in rows)
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Escribe cada bloque como un row group de Parquet (requiere el paquete `pyarrow`)."""
+
+    def __init__(self, path, compression, columns):
+        try:
+            import pyarrow  # pylint: disable=import-outside-toplevel
+            import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise RuntimeError("El formato parquet requiere el paquete pyarrow (pip install pyarrow).") from e
+        self._pyarrow = pyarrow
+        self._columns = [column.name for column in columns]
+        types = {int: pyarrow.int64(), str: pyarrow.string(), datetime: pyarrow.timestamp('us')}
+        self._schema = pyarrow.schema([(column.name, types.get(column.type.python_type, pyarrow.string()))
+                                       for column in columns])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema,
+                                                     compression=None if compression == 'none' else compression)
+
+    def write(self, rows):
+        table = self._pyarrow.Table.from_pydict(
+            {name: [row[name] for row in rows] for name in self._columns}, schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+
+class ConversationExporter:
+    """
+    ConversationExporter recorre una tabla en orden de su clave (message_id o user_id) con
+    un cursor del lado del servidor y entrega bloques de EXPORT_BATCH_SIZE filas (por
+    defecto 5000), así que la memoria usada no depende del tamaño de la tabla. Lee con
+    `get_read_session`, de una réplica si hay alguna configurada.
+
+    La exportación se escribe en un archivo temporal que se renombra al terminar; la marca
+    de agua se guarda después, de modo que una exportación interrumpida se repite completa
+    en la corrida siguiente.
+
+    Con varios escritores las claves no se confirman en orden: una fila con clave menor puede
+    aparecer después de otra mayor ya exportada. Por eso la exportación incremental corta por
+    timestamp y no por clave: cada corrida exporta el rango [corte anterior, ahora -
+    EXPORT_WATERMARK_LAG) (por defecto 60 s) y guarda el nuevo corte en `cutoff`. El margen
+    debe superar la demora entre el timestamp de una fila y su commit.
+    """
+
+    def __init__(self, connector, batch_size=None, watermark_lag=None):
+        self.connector = connector
+        self.batch_size = batch_size or int(os.getenv('EXPORT_BATCH_SIZE', '5000'))
+        self.watermark_lag = (watermark_lag if watermark_lag is not None
+                              else float(os.getenv('EXPORT_WATERMARK_LAG', '60')))
+
+    def iter_batches(self, table='mensajes', after_key=None, since=None, until=None):
+        """
+        Recorre las filas de `table` en bloques de diccionarios.
+
+        :param after_key: Exporta solo filas con clave mayor (marca de agua de la corrida anterior).
+        :param since: Exporta solo filas con timestamp mayor o igual.
+        :param until: Exporta solo filas con timestamp menor.
+        """
+        spec = EXPORT_TABLES[table]
+        statement = select(*spec['columns'])
+        if spec['join'] is not None:
+            statement = statement.join(*spec['join'])
+        if after_key is not None:
+            statement = statement.where(spec['key'] > after_key)
+        if since is not None:
+            statement = statement.where(spec['timestamp'] >= since)
+        if until is not None:
+            statement = statement.where(spec['timestamp'] < until)
+        statement = statement.order_by(spec['key']).execution_options(yield_per=self.batch_size)
+        session = self.connector.get_read_session()
+        try:
+            result = session.execute(statement)
+            for partition in result.partitions():
+                yield [row._asdict() for row in partition]
+        finally:
+            session.close()
+
+    def export(self, path, table='mensajes', export_format='jsonl', compression='gzip',
+               watermark_path=None, since=None, until=None):
+        """
+        Exporta `table` a `path`.
+
+        :param watermark_path: Archivo JSON con la marca de agua. Si existe, se exportan solo
+            las filas con timestamp desde el corte de la corrida anterior y hasta
+            EXPORT_WATERMARK_LAG segundos atrás; al terminar se actualiza.
+        :return: Diccionario con filas, bytes, segundos, filas por segundo y la marca de agua.
+        """
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Tabla desconocida: {table}")
+        if export_format not in FORMATS:
+            raise ValueError(f"Formato desconocido: {export_format}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Compresión desconocida: {compression}")
+        previous = read_watermark(watermark_path, table) if watermark_path else None
+        after_key = None
+        if watermark_path:
+            cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=self.watermark_lag)
+            until = cutoff if until is None else min(until, cutoff)
+            if previous and previous.get('cutoff'):
+                previous_cutoff = datetime.fromisoformat(previous['cutoff'])
+                since = previous_cutoff if since is None else max(since, previous_cutoff)
+            elif previous:
+                # Marca de agua anterior al corte por timestamp: se retoma desde su clave.
+                after_key = previous['last_key']
+        spec = EXPORT_TABLES[table]
+        key_name, timestamp_name = spec['key'].name, spec['timestamp'].name
+
+        started = time.perf_counter()
+        temporary_path = f"{path}.part"
+        writer_class = _ParquetWriter if export_format == 'parquet' else _JsonlWriter
+        writer = writer_class(temporary_path, compression, spec['columns'])
+        rows = 0
+        last = previous
+        try:
+            for batch in self.iter_batches(table, after_key=after_key, since=since, until=until):
+                writer.write(batch)
+                rows += len(batch)
+                last = {'last_key': batch[-1][key_name], 'last_timestamp': _serialize(batch[-1][timestamp_name])}
+        except BaseException:
+            writer.close()
+            os.remove(temporary_path)
+            raise
+        writer.close()
+        os.replace(temporary_path, path)
+
+        elapsed = time.perf_counter() - started
+        watermark = dict(last or {'last_key': None, 'last_timestamp': None}, table=table,
+                         exported_at=datetime.now(timezone.utc).isoformat())
+        if watermark_path:
+            watermark['cutoff'] = _serialize(until if since is None else max(since, until))
+        if watermark_path:
+            write_watermark(watermark_path, watermark)
+        summary = {'table': table, 'path': path, 'rows': rows, 'bytes': os.path.getsize(path),
+                   'seconds': round(elapsed, 3), 'rows_per_s': round(rows / elapsed, 1) if elapsed else 0.0,
+                   'watermark': watermark}
+        logger.info("Exportación de %s: %d filas en %.1f s a %s.", table, rows, elapsed, path)
+        return summary
+
+
+def read_watermark(path, table):
+    """Lee la marca de agua guardada para `table`, o None si no hay."""
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as file:
+        watermark = json.load(file)
+    if watermark.get('table') != table:
+        raise ValueError(f"La marca de agua {path} es de la tabla {watermark.get('table')}, no de {table}.")
+    return watermark
+
+def write_watermark(path, watermark):
+    """Guarda la marca de agua reemplazando el archivo en un solo paso."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        json.dump(watermark, file, indent=2)
+    os.replace(temporary_path, path)
@@ -0,0 +1,226 @@
+"""
+Path: src/services/conversation_writer.py
+Este módulo persiste las conversaciones en la tabla mensajes de forma diferida
+(write-behind): el controlador encola cada intercambio y un hilo en segundo plano
+los escribe por lotes, con una inserción masiva por lote (`bulk_insert` del conector).
+"""
+
+import asyncio
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+import sqlalchemy
+from src.logs.config_logger import LoggerConfigurator
+from src.model.models import Mensaje
+from src.services.user_identity_service import UserIdentityService
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+_STOP = object()
+
+# Segundos mínimos entre dos registros de intercambios descartados por cola llena
+_DROP_LOG_INTERVAL = 10.0
+
+class ConversationRecord:
+    """Intercambio pendiente de persistir: prompt del usuario y respuesta del modelo."""
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('external_user_id', 'prompt', 'response', 'timestamp')
+
+    def __init__(self, external_user_id, prompt, response, timestamp=None):
+        self.external_user_id = external_user_id
+        self.prompt = prompt
+        self.response = response
+        self.timestamp = timestamp or datetime.utcnow()
+
+
+class ConversationWriter:
+    """
+    ConversationWriter acumula los intercambios en una cola acotada y un hilo en segundo
+    plano los vuelca a la base de datos a través del conector.
+
+    - WRITE_BEHIND_BATCH_SIZE: cantidad máxima de intercambios por lote (por defecto 200).
+    - WRITE_BEHIND_FLUSH_INTERVAL: segundos máximos que un intercambio espera en la cola (por defecto 1).
+    - WRITE_BEHIND_QUEUE_SIZE: capacidad de la cola (por defecto 10000).
+    - WRITE_BEHIND_OVERFLOW: 'drop' descarta el intercambio nuevo si la cola está llena y
+      'block' espera hasta WRITE_BEHIND_BLOCK_TIMEOUT segundos antes de descartarlo. Desde el
+      event loop se usa `enqueue_async`, que hace esa espera en un hilo.
+
+    Los usuarios de cada lote se resuelven con `identity_service` (UserIdentityService):
+    los recientes salen de su caché y los nuevos se dan de alta juntos.
+
+    Si se recibe `schema_ready` (el evento `ready` de DatabaseInitializer), el hilo no
+    escribe hasta que el esquema esté listo y los intercambios esperan en la cola.
+    """
+
+    def __init__(self, connector, batch_size=None, flush_interval=None, max_queue=None,
+                 overflow_policy=None, block_timeout=None, schema_ready=None, identity_service=None):
+        self.connector = connector
+        self.identity_service = identity_service or UserIdentityService()
+        self.schema_ready = schema_ready
+        self.batch_size = batch_size or int(os.getenv('WRITE_BEHIND_BATCH_SIZE', '200'))
+        self.flush_interval = flush_interval or float(os.getenv('WRITE_BEHIND_FLUSH_INTERVAL', '1'))
+        self.overflow_policy = (overflow_policy or os.getenv('WRITE_BEHIND_OVERFLOW', 'drop')).lower()
+        self.block_timeout = block_timeout or float(os.getenv('WRITE_BEHIND_BLOCK_TIMEOUT', '0.05'))
+        self._queue = queue.Queue(maxsize=max_queue or int(os.getenv('WRITE_BEHIND_QUEUE_SIZE', '10000')))
+        self._thread = None
+        self._stop_requested = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {'enqueued': 0, 'dropped': 0, 'written': 0, 'batches': 0, 'failed': 0,
+                       'failed_batches': 0}
+        self._drops_unlogged = 0
+        self._last_drop_log = None
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def start(self):
+        """Inicia el hilo escritor y registra el vaciado de la cola al salir del proceso."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='conversation-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        logger.info("Escritor diferido de conversaciones iniciado (lote %d, intervalo %.1f s).",
+                    self.batch_size, self.flush_interval)
+
+    def stop(self, timeout=10.0):
+        """Escribe los intercambios pendientes y detiene el hilo escritor."""
+        if self._thread is None:
+            return
+        thread, self._thread = self._thread, None
+        self._stop_requested.set()
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.error("No se pudo detener el escritor de conversaciones: la cola está llena.")
+            return
+        thread.join(timeout)
+        logger.info("Escritor diferido de conversaciones detenido.")
+
+    def enqueue(self, external_user_id, prompt, response):
+        """
+        Encola un intercambio sin esperar a la base de datos.
+
+        :return: True si se encoló, False si se descartó por la política de desborde.
+        """
+        record = ConversationRecord(external_user_id, prompt, response)
+        try:
+            if self.overflow_policy == 'block':
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self._dropped()
+            return False
+        self._count('enqueued')
+        return True
+
+    async def enqueue_async(self, external_user_id, prompt, response):
+        """
+        Versión de `enqueue` para el event loop: con la política 'block' la espera por lugar
+        en la cola corre en un hilo para no detener el loop.
+        """
+        if self.overflow_policy == 'block':
+            return await asyncio.to_thread(self.enqueue, external_user_id, prompt, response)
+        return self.enqueue(external_user_id, prompt, response)
+
+    def _dropped(self):
+        """Cuenta un intercambio descartado y lo registra a lo sumo una vez por intervalo."""
+        now = time.monotonic()
+        with self._stats_lock:
+            self._stats['dropped'] += 1
+            self._drops_unlogged += 1
+            if self._last_drop_log is not None and now - self._last_drop_log < _DROP_LOG_INTERVAL:
+                return
+            dropped, self._drops_unlogged = self._drops_unlogged, 0
+            self._last_drop_log = now
+        logger.error("Cola de conversaciones llena, se descartaron %d intercambios.", dropped)
+
+    def _wait_for_schema(self):
+        """
+        Espera a que el esquema de la base esté listo.
+
+        :return: False si el escritor se detuvo antes.
+        """
+        if self.schema_ready is None or self.schema_ready.is_set():
+            return True
+        logger.info("Escritor de conversaciones esperando a que la base de datos esté lista.")
+        while not self.schema_ready.wait(timeout=0.5):
+            if self._stop_requested.is_set():
+                logger.error("Escritor detenido sin base de datos; %d intercambios quedaron sin guardar.",
+                             max(0, self._queue.qsize() - 1))
+                return False
+        return True
+
+    def _run(self):
+        """Bucle del hilo escritor: arma lotes por tamaño o por intervalo y los escribe."""
+        if not self._wait_for_schema():
+            return
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = None
+            while len(batch) < self.batch_size:
+                timeout = self.flush_interval if deadline is None else deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch):
+        """
+        Escribe un lote completo en una transacción con una inserción masiva. Cualquier error
+        descarta el lote y se cuenta en `failed` / `failed_batches`, sin detener el hilo.
+        """
+        session = None
+        try:
+            session = self.connector.get_session()
+            users = self.identity_service.resolve(session, sorted({record.external_user_id for record in batch}))
+            rows = []
+            for record in batch:
+                user_id = users[record.external_user_id]
+                rows.append({'user_id': user_id, 'role': 'user', 'message': record.prompt,
+                             'timestamp': record.timestamp})
+                rows.append({'user_id': user_id, 'role': 'model', 'message': record.response,
+                             'timestamp': record.timestamp})
+            self.connector.bulk_insert(session, Mensaje, rows)
+            session.commit()
+            self._count('written', len(batch))
+            self._count('batches')
+        except Exception as e:  # pylint: disable=W0718
+            self._count('failed', len(batch))
+            self._count('failed_batches')
+            logger.error("Error al guardar un lote de %d conversaciones, se descartó: %s", len(batch), e,
+                         exc_info=not isinstance(e, sqlalchemy.exc.SQLAlchemyError))
+            if session is not None:
+                try:
+                    session.rollback()
+                except sqlalchemy.exc.SQLAlchemyError as rollback_error:
+                    logger.error("Error al revertir el lote de conversaciones: %s", rollback_error)
+        finally:
+            if session is not None:
+                session.close()
+
+    def get_stats(self):
+        """Devuelve los contadores del escritor y la profundidad actual de la cola."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['queue_capacity'] = self._queue.maxsize
+        stats['waiting_for_database'] = self.schema_ready is not None and not self.schema_ready.is_set()
+        return stats
@@ -0,0 +1,88 @@
+"""
+Path: src/services/gemini_backend.py
+Este módulo contiene el backend de modelo de lenguaje que utiliza Gemini AI.
+"""
+
+import os
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from src.logs.config_logger import LoggerConfigurator
+from src.services.llm_backend_interface import LLMBackendInterface
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+MODEL_NAME = "gemini-1.5-flash"
+GENERATION_CONFIG = {
+    "temperature": 1,
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 8192,
+    "response_mime_type": "text/plain",
+}
+# Errores de la API que indican un problema transitorio del servicio o de cuota.
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+)
+
+def _to_contents(history, message):
+    """Convierte el historial de la sesión y el mensaje nuevo al formato de Gemini."""
+    contents = [{'role': turn['role'], 'parts': [turn['text']]} for turn in history]
+    contents.append({'role': 'user', 'parts': [message]})
+    return contents
+
+class GeminiBackend(LLMBackendInterface):
+    """Backend que genera respuestas con el modelo Gemini a través de google.generativeai."""
+
+    def __init__(self, api_key=None, model_name=MODEL_NAME, generation_config=None):
+        self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+        self.model_name = model_name
+        self.generation_config = generation_config or GENERATION_CONFIG
+        self.model = None
+
+    def configure(self, system_instruction):
+        """Configura el modelo generativo con la API Key y las instrucciones del sistema."""
+        genai.configure(api_key=self.api_key)
+        self.model = genai.GenerativeModel(
+            model_name=self.model_name,
+            generation_config=self.generation_config,
+            system_instruction=system_instruction,
+        )
+        logger.info("Modelo generativo configurado: %s", self.model)
+
+    def describe(self):
+        """Devuelve el nombre del backend, el modelo y la configuración de generación."""
+        return {'backend': 'gemini', 'model': self.model_name, 'config': self.generation_config}
+
+    def is_retryable(self, error):
+        """Además de los errores de red, reintenta los errores transitorios de la API de Gemini."""
+        return super().is_retryable(error) or isinstance(error, RETRYABLE_ERRORS)
+
+    def generate(self, history, message):
+        """Genera la respuesta completa para el mensaje."""
+        response = self.model.generate_content(_to_contents(history, message))
+        return response.text
+
+    def generate_stream(self, history, message):
+        """Genera la respuesta pidiendo al modelo la salida en streaming."""
+        response = self.model.generate_content(_to_contents(history, message), stream=True)
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+    async def generate_async(self, history, message):
+        """Genera la respuesta completa sin bloquear el event loop."""
+        response = await self.model.generate_content_async(_to_contents(history, message))
+        return response.text
+
+    async def generate_stream_async(self, history, message):
+        """Genera la respuesta en streaming sin bloquear el event loop."""
+        response = await self.model.generate_content_async(
+            _to_contents(history, message), stream=True
+        )
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
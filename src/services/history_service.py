@@ -0,0 +1,153 @@
+"""
+Path: src/services/history_service.py
+Este módulo consulta el historial de conversaciones de un usuario con paginación
+por cursor (keyset) y exporta historiales grandes en streaming.
+"""
+
+import base64
+import os
+from datetime import datetime
+from sqlalchemy import and_, or_, select
+from src.logs.config_logger import LoggerConfigurator
+from src.model.models import Mensaje
+from src.services.user_identity_service import UserIdentityService
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+class InvalidCursorError(ValueError):
+    """El cursor de paginación recibido no es válido."""
+
+
+def encode_cursor(timestamp, message_id):
+    """Codifica la posición (timestamp, message_id) como un cursor opaco."""
+    raw = f"{timestamp.isoformat()}|{message_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    """Decodifica un cursor generado por `encode_cursor`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        timestamp, message_id = raw.split('|')
+        return datetime.fromisoformat(timestamp), int(message_id)
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursorError("El cursor de paginación no es válido.") from e
+
+def serialize_message(message):
+    """Convierte una fila de mensajes en un diccionario serializable a JSON."""
+    return {
+        'message_id': message.message_id,
+        'role': message.role,
+        'message': message.message,
+        'timestamp': message.timestamp.isoformat() if message.timestamp else None,
+    }
+
+class ConversationHistoryService:
+    """
+    ConversationHistoryService lee el historial de un usuario usando el índice
+    (user_id, timestamp, message_id) de mensajes.
+
+    La paginación continúa desde la última fila entregada (keyset) en lugar de usar
+    OFFSET, así que el costo de cada página no crece con la posición en el historial.
+    La exportación completa usa un cursor del lado del servidor y lee por bloques.
+    El id externo se resuelve con `identity_service` (UserIdentityService), en general
+    desde su caché, y las consultas filtran directamente por user_id.
+    Con `schema_ready` (el evento `ready` de DatabaseInitializer) el servicio se informa
+    no disponible hasta que el esquema esté listo.
+    """
+
+    def __init__(self, connector, default_page_size=None, max_page_size=None, export_batch_size=None,
+                 schema_ready=None, identity_service=None):
+        self.connector = connector
+        self.identity_service = identity_service or UserIdentityService()
+        self.schema_ready = schema_ready
+        self.default_page_size = default_page_size or int(os.getenv('HISTORY_PAGE_SIZE', '50'))
+        self.max_page_size = max_page_size or int(os.getenv('HISTORY_MAX_PAGE_SIZE', '500'))
+        self.export_batch_size = export_batch_size or int(os.getenv('HISTORY_EXPORT_BATCH_SIZE', '1000'))
+
+    def is_available(self):
+        """Indica si la base de datos ya está lista para consultar el historial."""
+        return self.schema_ready is None or self.schema_ready.is_set()
+
+    @staticmethod
+    def _user_messages(user_id):
+        """
+        Consulta base de los mensajes de un usuario.
+        Se seleccionan columnas y no entidades para no poblar el mapa de identidad de la sesión.
+        """
+        return (
+            select(Mensaje.message_id, Mensaje.role, Mensaje.message, Mensaje.timestamp)
+            .where(Mensaje.user_id == user_id)
+        )
+
+    def get_page(self, external_user_id, cursor=None, limit=None, descending=False):
+        """
+        Devuelve una página del historial y el cursor para pedir la siguiente.
+
+        :param external_user_id: Id del usuario enviado por el navegador (user_data.id).
+        :param cursor: Cursor devuelto por la página anterior, o None para la primera.
+        :param limit: Tamaño de página, acotado por HISTORY_MAX_PAGE_SIZE.
+        :param descending: Si es True, recorre desde el mensaje más reciente.
+        :return: Diccionario con `items` y `next_cursor` (None si no hay más).
+        """
+        limit = max(1, min(limit or self.default_page_size, self.max_page_size))
+        position = decode_cursor(cursor) if cursor else None
+        session = self.connector.get_read_session()
+        try:
+            user_id = self.identity_service.resolve_one(session, external_user_id)
+            if user_id is None:
+                return {'items': [], 'next_cursor': None}
+            statement = self._user_messages(user_id)
+            if position:
+                timestamp, message_id = position
+                if descending:
+                    statement = statement.where(or_(
+                        Mensaje.timestamp < timestamp,
+                        and_(Mensaje.timestamp == timestamp, Mensaje.message_id < message_id),
+                    ))
+                else:
+                    statement = statement.where(or_(
+                        Mensaje.timestamp > timestamp,
+                        and_(Mensaje.timestamp == timestamp, Mensaje.message_id > message_id),
+                    ))
+            if descending:
+                statement = statement.order_by(Mensaje.timestamp.desc(), Mensaje.message_id.desc())
+            else:
+                statement = statement.order_by(Mensaje.timestamp.asc(), Mensaje.message_id.asc())
+            # Se pide una fila de más para saber si existe una página siguiente.
+            messages = session.execute(statement.limit(limit + 1)).all()
+        finally:
+            session.close()
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        next_cursor = None
+        if has_more:
+            last = messages[-1]
+            next_cursor = encode_cursor(last.timestamp, last.message_id)
+        return {'items': [serialize_message(m) for m in messages], 'next_cursor': next_cursor}
+
+    def iter_history_batches(self, external_user_id):
+        """
+        Recorre el historial completo en orden cronológico, en bloques de
+        HISTORY_EXPORT_BATCH_SIZE filas, con un cursor del lado del servidor.
+        La sesión permanece abierta hasta agotar o cerrar el generador.
+        """
+        session = self.connector.get_read_session()
+        try:
+            user_id = self.identity_service.resolve_one(session, external_user_id)
+            if user_id is None:
+                return
+            result = session.execute(
+                self._user_messages(user_id)
+                .order_by(Mensaje.timestamp.asc(), Mensaje.message_id.asc())
+                .execution_options(yield_per=self.export_batch_size)
+            )
+            for partition in result.partitions():
+                yield [serialize_message(m) for m in partition]
+        finally:
+            session.close()
+
+    def iter_history(self, external_user_id):
+        """Recorre el historial completo mensaje por mensaje."""
+        for batch in self.iter_history_batches(external_user_id):
+            yield from batch
@@ -0,0 +1,34 @@
+"""
+Path: src/services/llm_backend_factory.py
+Este módulo selecciona el backend de modelo de lenguaje según la configuración.
+"""
+
+import os
+from src.logs.config_logger import LoggerConfigurator
+from src.services.resilient_backend import ResilientBackend
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+def create_llm_backend(name=None):
+    """
+    Crea el backend indicado por `name` o por la variable de entorno LLM_BACKEND.
+
+    :param name: 'gemini' (por defecto) o 'stub'.
+    :return: Instancia de LLMBackendInterface, envuelta en ResilientBackend salvo que
+        RESILIENCE_ENABLED sea 'false'.
+    """
+    name = (name or os.getenv('LLM_BACKEND', 'gemini')).lower()
+    logger.info("Usando el backend de modelo de lenguaje: %s", name)
+    # Los backends se importan acá para que el stub no requiera google.generativeai.
+    if name == 'stub':
+        from src.services.stub_backend import StubBackend  # pylint: disable=import-outside-toplevel
+        backend = StubBackend()
+    elif name == 'gemini':
+        from src.services.gemini_backend import GeminiBackend  # pylint: disable=import-outside-toplevel
+        backend = GeminiBackend()
+    else:
+        raise ValueError(f"Backend de modelo de lenguaje desconocido: {name}")
+    if os.getenv('RESILIENCE_ENABLED', 'true').lower() == 'true':
+        backend = ResilientBackend(backend)
+    return backend
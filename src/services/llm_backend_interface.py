@@ -0,0 +1,53 @@
+"""
+Path: src/services/llm_backend_interface.py
+Este archivo define la interfaz LLMBackendInterface,
+que es una interfaz para los backends de modelos de lenguaje.
+"""
+
+from abc import ABC, abstractmethod
+
+class LLMBackendInterface(ABC):
+    """
+    Interfaz para los backends de modelos de lenguaje.
+
+    Los backends no guardan estado de conversación: reciben el historial de la sesión
+    como una lista de turnos `{'role': 'user' | 'model', 'text': str}` junto con el
+    mensaje nuevo y devuelven la respuesta completa o sus fragmentos.
+    """
+
+    @abstractmethod
+    def configure(self, system_instruction):
+        """Configura el backend con las instrucciones del sistema."""
+        pass
+
+    @abstractmethod
+    def describe(self):
+        """Devuelve un diccionario con el nombre, el modelo y la configuración de generación."""
+        pass
+
+    @abstractmethod
+    def generate(self, history, message):
+        """Genera la respuesta completa para el mensaje."""
+        pass
+
+    @abstractmethod
+    def generate_stream(self, history, message):
+        """Genera la respuesta como un iterable de fragmentos de texto."""
+        pass
+
+    @abstractmethod
+    async def generate_async(self, history, message):
+        """Versión asíncrona de `generate`."""
+        pass
+
+    @abstractmethod
+    def generate_stream_async(self, history, message):
+        """Versión asíncrona de `generate_stream`: devuelve un generador asíncrono."""
+        pass
+
+    def is_retryable(self, error):
+        """
+        Indica si un error de la llamada es transitorio y puede reintentarse.
+        Por defecto lo son los errores de conexión y de tiempo de espera.
+        """
+        return isinstance(error, (ConnectionError, TimeoutError))
@@ -0,0 +1,407 @@
+"""
+Path: src/services/resilient_backend.py
+Este módulo envuelve un backend de modelo de lenguaje con tiempo límite por solicitud,
+reintentos con backoff, solicitudes de cobertura (hedging) y un circuit breaker.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from src.logs.config_logger import LoggerConfigurator
+from src.services.circuit_breaker import CLOSED, CircuitBreaker
+from src.services.llm_backend_interface import LLMBackendInterface
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+_END = object()
+
+def _close_quietly(stream):
+    """Cierra un generador de fragmentos aunque otro hilo lo esté leyendo todavía."""
+    try:
+        stream.close()
+    except ValueError:
+        # El generador sigue ejecutándose en un hilo que superó el tiempo límite.
+        pass
+
+class BackendSaturatedError(ConnectionError):
+    """
+    No se lanza el intento porque el pool tiene demasiadas llamadas abandonadas en curso.
+    Es una saturación local: se rechaza antes del circuit breaker y no cuenta como falla.
+    """
+
+class ResilientBackend(LLMBackendInterface):
+    """
+    ResilientBackend agrega a otro backend:
+
+    - Tiempo límite por solicitud (env RESILIENCE_DEADLINE, por defecto 30 s), que incluye
+      todos los reintentos. En streaming se aplica hasta el primer fragmento y luego cada
+      fragmento tiene RESILIENCE_CHUNK_TIMEOUT segundos para llegar.
+    - Hasta RESILIENCE_MAX_ATTEMPTS intentos, solo para errores reintentables según
+      `is_retryable` del backend, con backoff exponencial con jitter completo
+      (RESILIENCE_BACKOFF_BASE y RESILIENCE_BACKOFF_MAX). El streaming solo se reintenta
+      antes del primer fragmento.
+    - Hedging opcional (RESILIENCE_HEDGE_ENABLED) en las llamadas sin streaming: si el primer
+      intento supera el p95 de latencia reciente se lanza un segundo intento y se usa el
+      primero que responda.
+    - Un CircuitBreaker que rechaza las llamadas de inmediato mientras el servicio falla.
+
+    En el modo Flask cada intento corre en un pool de hilos (RESILIENCE_MAX_WORKERS) para
+    poder abandonarlo al vencer el tiempo límite sin dejar bloqueado el hilo de la solicitud;
+    la lectura de streams usa un pool aparte (RESILIENCE_STREAM_WORKERS), así un stream
+    trabado no demora las llamadas sin streaming. Un intento abandonado sigue ocupando su
+    hilo hasta que el backend responde: no se cuenta como capacidad libre y, con
+    RESILIENCE_MAX_ABANDONED abandonados en curso en un pool (por defecto la mitad de sus
+    hilos), los intentos nuevos se rechazan de inmediato con 503 en lugar de encolarse.
+    """
+
+    def __init__(self, backend, deadline=None, chunk_timeout=None, max_attempts=None,
+                 backoff_base=None, backoff_max=None, hedge_enabled=None, hedge_min_samples=None,
+                 max_workers=None, stream_workers=None, max_abandoned=None, circuit_breaker=None):
+        self.backend = backend
+        self.deadline = deadline or float(os.getenv('RESILIENCE_DEADLINE', '30'))
+        self.chunk_timeout = chunk_timeout or float(os.getenv('RESILIENCE_CHUNK_TIMEOUT', '15'))
+        self.max_attempts = max_attempts or int(os.getenv('RESILIENCE_MAX_ATTEMPTS', '3'))
+        self.backoff_base = backoff_base or float(os.getenv('RESILIENCE_BACKOFF_BASE', '0.2'))
+        self.backoff_max = backoff_max or float(os.getenv('RESILIENCE_BACKOFF_MAX', '2'))
+        self.hedge_enabled = (hedge_enabled if hedge_enabled is not None
+                              else os.getenv('RESILIENCE_HEDGE_ENABLED', 'false').lower() == 'true')
+        self.hedge_min_samples = hedge_min_samples or int(os.getenv('RESILIENCE_HEDGE_MIN_SAMPLES', '20'))
+        self.max_workers = max_workers or int(os.getenv('RESILIENCE_MAX_WORKERS', '64'))
+        self.stream_workers = stream_workers or int(os.getenv('RESILIENCE_STREAM_WORKERS', str(self.max_workers)))
+        self.max_abandoned = max_abandoned or int(os.getenv('RESILIENCE_MAX_ABANDONED', '0'))
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self._executor = None
+        self._stream_executor = None
+        # Intentos abandonados que todavía ocupan un hilo, por pool
+        self._abandoned = {'llm-call': 0, 'llm-stream': 0}
+        self._random = random.Random()
+        self._latencies = deque(maxlen=200)
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'attempts': 0, 'retries': 0, 'hedges': 0, 'hedge_wins': 0,
+                       'deadline_exceeded': 0, 'failed': 0, 'abandoned': 0, 'saturated': 0}
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='llm-call')
+        return self._executor
+
+    def _get_stream_executor(self):
+        if self._stream_executor is None:
+            self._stream_executor = ThreadPoolExecutor(max_workers=self.stream_workers,
+                                                       thread_name_prefix='llm-stream')
+        return self._stream_executor
+
+    def _has_capacity(self, pool):
+        """Indica si el pool tiene hilos libres de intentos abandonados."""
+        workers = self.max_workers if pool == 'llm-call' else self.stream_workers
+        limit = self.max_abandoned or max(1, workers // 2)
+        with self._lock:
+            return self._abandoned[pool] < limit
+
+    def _check_capacity(self, pool):
+        """Rechaza el intento antes de tocar el circuit breaker si el pool está saturado."""
+        if not self._has_capacity(pool):
+            self._count('saturated')
+            raise BackendSaturatedError(
+                "El modelo de lenguaje no está disponible: demasiadas llamadas sin responder.")
+
+    def _abandon(self, future, pool):
+        """Registra un intento que sigue corriendo aunque ya nadie espera su resultado."""
+        if future.cancel() or future.done():
+            return
+        with self._lock:
+            self._abandoned[pool] += 1
+            self._stats['abandoned'] += 1
+        future.add_done_callback(lambda _: self._release_abandoned(pool))
+
+    def _release_abandoned(self, pool):
+        with self._lock:
+            self._abandoned[pool] -= 1
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def configure(self, system_instruction):
+        """Configura el backend envuelto."""
+        self.backend.configure(system_instruction)
+
+    def describe(self):
+        """Devuelve la descripción del backend envuelto, que forma parte de la huella de caché."""
+        return self.backend.describe()
+
+    def is_retryable(self, error):
+        """Delegado al backend envuelto."""
+        return self.backend.is_retryable(error)
+
+    def _deadline_error(self):
+        self._count('deadline_exceeded')
+        return TimeoutError("Se agotó el tiempo límite de la llamada al modelo de lenguaje.")
+
+    def _hedge_delay(self):
+        """Devuelve el p95 de latencia reciente, o None si no corresponde hacer hedging."""
+        if not self.hedge_enabled or self.circuit_breaker.state != CLOSED:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def _retry_delay(self, error, attempt, deadline):
+        """
+        Registra la falla en el circuit breaker y devuelve la espera antes del siguiente
+        intento, o None si el error no se reintenta.
+        """
+        if not self.is_retryable(error):
+            # El servicio respondió: el error es de la solicitud, no de su disponibilidad.
+            self.circuit_breaker.record_success()
+            return None
+        self.circuit_breaker.record_failure()
+        remaining = deadline - time.monotonic()
+        if attempt + 1 >= self.max_attempts or remaining <= 0:
+            return None
+        with self._lock:
+            delay = self._random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if delay >= remaining:
+            return None
+        logger.info("Intento %d fallido (%s), reintentando en %.2f s.", attempt + 1, error, delay)
+        self._count('retries')
+        return delay
+
+    def _final_error(self, error):
+        """Devuelve el error a propagar: los reintentables se presentan como ConnectionError (503)."""
+        self._count('failed')
+        if self.is_retryable(error) and not isinstance(error, (ConnectionError, TimeoutError)):
+            final = ConnectionError(f"El modelo de lenguaje no está disponible: {error}")
+            final.__cause__ = error
+            return final
+        return error
+
+    def _attempt(self, call, deadline, hedge_delay):
+        """Ejecuta un intento en el pool de hilos, con hedging opcional y tiempo límite."""
+        executor = self._get_executor()
+        started = time.monotonic()
+        first = executor.submit(call)
+        pending = {first}
+        self._count('attempts')
+        try:
+            while pending:
+                now = time.monotonic()
+                if now >= deadline:
+                    raise self._deadline_error()
+                timeout = deadline - now
+                can_hedge = hedge_delay is not None and len(pending) == 1 and first in pending
+                if can_hedge:
+                    timeout = min(timeout, max(0.0, started + hedge_delay - now))
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    if (can_hedge and time.monotonic() - started >= hedge_delay
+                            and self._has_capacity('llm-call')):
+                        logger.info("Intento lento (%.0f ms), se lanza un intento de cobertura.",
+                                    hedge_delay * 1000)
+                        pending.add(executor.submit(call))
+                        self._count('hedges')
+                        self._count('attempts')
+                    continue
+                succeeded = [future for future in done if future.exception() is None]
+                if not succeeded:
+                    if pending:
+                        continue
+                    done.pop().result()
+                future = succeeded[0]
+                result = future.result()
+                if future is not first:
+                    self._count('hedge_wins')
+                with self._lock:
+                    self._latencies.append(time.monotonic() - started)
+                return result
+        finally:
+            for future in pending:
+                self._abandon(future, 'llm-call')
+        raise RuntimeError("El intento terminó sin resultado.")
+
+    def _next_chunk(self, stream, timeout):
+        """Obtiene el siguiente fragmento en el pool de streams, con tiempo límite."""
+        # Sin tiempo restante no se llega a pedir el fragmento: no queda una llamada huérfana.
+        if timeout <= 0:
+            raise self._deadline_error()
+        future = self._get_stream_executor().submit(next, stream, _END)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError as e:
+            if future.done():
+                raise
+            self._abandon(future, 'llm-stream')
+            raise self._deadline_error() from e
+
+    def generate(self, history, message):
+        """Genera la respuesta completa con tiempo límite, reintentos y hedging."""
+        self._count('calls')
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            self._check_capacity('llm-call')
+            self.circuit_breaker.before_call()
+            try:
+                result = self._attempt(lambda: self.backend.generate(history, message),
+                                       deadline, self._hedge_delay())
+            except Exception as e:  # pylint: disable=W0718
+                delay = self._retry_delay(e, attempt, deadline)
+                if delay is None:
+                    raise self._final_error(e)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.circuit_breaker.record_success()
+            return result
+
+    def generate_stream(self, history, message):
+        """Genera la respuesta en streaming; reintenta solo antes del primer fragmento."""
+        self._count('calls')
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            self._check_capacity('llm-stream')
+            self.circuit_breaker.before_call()
+            self._count('attempts')
+            stream = iter(self.backend.generate_stream(history, message))
+            try:
+                chunk = self._next_chunk(stream, deadline - time.monotonic())
+            except Exception as e:  # pylint: disable=W0718
+                _close_quietly(stream)
+                delay = self._retry_delay(e, attempt, deadline)
+                if delay is None:
+                    raise self._final_error(e)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            break
+        self.circuit_breaker.record_success()
+        try:
+            while chunk is not _END:
+                yield chunk
+                chunk = self._next_chunk(stream, self.chunk_timeout)
+        except Exception as e:
+            if self.is_retryable(e):
+                self.circuit_breaker.record_failure()
+            raise self._final_error(e)
+        finally:
+            _close_quietly(stream)
+
+    async def _attempt_async(self, call, deadline, hedge_delay):
+        """Versión asíncrona de `_attempt` con tareas del event loop."""
+        started = time.monotonic()
+        first = asyncio.create_task(call())
+        pending = {first}
+        self._count('attempts')
+        try:
+            while pending:
+                now = time.monotonic()
+                if now >= deadline:
+                    raise self._deadline_error()
+                timeout = deadline - now
+                can_hedge = hedge_delay is not None and len(pending) == 1 and first in pending
+                if can_hedge:
+                    timeout = min(timeout, max(0.0, started + hedge_delay - now))
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if can_hedge and time.monotonic() - started >= hedge_delay:
+                        logger.info("Intento lento (%.0f ms), se lanza un intento de cobertura.",
+                                    hedge_delay * 1000)
+                        pending.add(asyncio.create_task(call()))
+                        self._count('hedges')
+                        self._count('attempts')
+                    continue
+                succeeded = [task for task in done if task.exception() is None]
+                if not succeeded:
+                    if pending:
+                        continue
+                    done.pop().result()
+                task = succeeded[0]
+                result = task.result()
+                if task is not first:
+                    self._count('hedge_wins')
+                with self._lock:
+                    self._latencies.append(time.monotonic() - started)
+                return result
+        finally:
+            for task in pending:
+                task.cancel()
+        raise RuntimeError("El intento terminó sin resultado.")
+
+    async def generate_async(self, history, message):
+        """Versión asíncrona de `generate`."""
+        self._count('calls')
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_call()
+            try:
+                result = await self._attempt_async(lambda: self.backend.generate_async(history, message),
+                                                   deadline, self._hedge_delay())
+            except Exception as e:  # pylint: disable=W0718
+                delay = self._retry_delay(e, attempt, deadline)
+                if delay is None:
+                    raise self._final_error(e)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.circuit_breaker.record_success()
+            return result
+
+    async def _next_chunk_async(self, stream, timeout):
+        """Obtiene el siguiente fragmento de un generador asíncrono, con tiempo límite."""
+        if timeout <= 0:
+            raise self._deadline_error()
+        try:
+            return await asyncio.wait_for(anext(stream, _END), timeout)
+        except asyncio.TimeoutError as e:
+            raise self._deadline_error() from e
+
+    async def generate_stream_async(self, history, message):
+        """Versión asíncrona de `generate_stream`."""
+        self._count('calls')
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_call()
+            self._count('attempts')
+            stream = self.backend.generate_stream_async(history, message)
+            try:
+                chunk = await self._next_chunk_async(stream, deadline - time.monotonic())
+            except Exception as e:  # pylint: disable=W0718
+                await stream.aclose()
+                delay = self._retry_delay(e, attempt, deadline)
+                if delay is None:
+                    raise self._final_error(e)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            break
+        self.circuit_breaker.record_success()
+        try:
+            while chunk is not _END:
+                yield chunk
+                chunk = await self._next_chunk_async(stream, self.chunk_timeout)
+        except Exception as e:
+            if self.is_retryable(e):
+                self.circuit_breaker.record_failure()
+            raise self._final_error(e)
+        finally:
+            await stream.aclose()
+
+    def get_stats(self):
+        """Devuelve los contadores de intentos, reintentos, hedging y el estado del circuito."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['abandoned_running'] = dict(self._abandoned)
+        stats['circuit_breaker'] = self.circuit_breaker.get_stats()
+        return stats
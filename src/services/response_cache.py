@@ -0,0 +1,105 @@
+"""
+Path: src/services/response_cache.py
+Este módulo contiene una caché acotada de respuestas exactas, con expulsión LRU,
+expiración por TTL y límite de tamaño en bytes.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from src.logs.config_logger import LoggerConfigurator
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+def normalize_prompt(prompt):
+    """Normaliza el prompt para que variaciones de mayúsculas y espacios compartan entrada."""
+    return ' '.join(prompt.split()).casefold()
+
+class ResponseCache:
+    """
+    ResponseCache guarda respuestas generadas indexadas por el prompt normalizado y una
+    huella de la configuración del modelo (instrucciones del sistema y parámetros).
+
+    Como la huella forma parte de la clave, un cambio en system_instruction.txt hace
+    que las entradas anteriores dejen de coincidir; `clear` libera su memoria.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, ttl_seconds=None, clock=time.monotonic):
+        """
+        :param max_entries: Cantidad máxima de entradas (env RESPONSE_CACHE_MAX_ENTRIES, por defecto 1024).
+        :param max_bytes: Tamaño máximo total de las respuestas (env RESPONSE_CACHE_MAX_BYTES, por defecto 8 MiB).
+        :param ttl_seconds: Vigencia de cada entrada (env RESPONSE_CACHE_TTL, por defecto 3600).
+        :param clock: Reloj monotónico usado para la expiración.
+        """
+        self.max_entries = max_entries or int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+        self.max_bytes = max_bytes or int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(8 * 1024 * 1024)))
+        self.ttl_seconds = ttl_seconds or float(os.getenv('RESPONSE_CACHE_TTL', '3600'))
+        self._clock = clock
+        self._entries = OrderedDict()  # clave -> (respuesta, tamaño, vencimiento)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    @staticmethod
+    def make_key(prompt, fingerprint):
+        """Construye la clave de la caché a partir del prompt y la huella de configuración."""
+        raw = f"{fingerprint}\x00{normalize_prompt(prompt)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        """Devuelve la respuesta guardada para la clave o None si no existe o expiró."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            if entry[2] <= self._clock():
+                self._remove(key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[0]
+
+    def put(self, key, response):
+        """Guarda una respuesta, expulsando las menos usadas hasta respetar los límites."""
+        size = len(response.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (response, size, self._clock() + self.ttl_seconds)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        """Vacía la caché (por ejemplo, al cambiar las instrucciones del sistema)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats['invalidations'] += 1
+        logger.info("Caché de respuestas invalidada.")
+
+    def get_stats(self):
+        """Devuelve los contadores de la caché y la tasa de aciertos."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        stats['max_bytes'] = self.max_bytes
+        return stats
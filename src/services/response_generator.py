@@ -1,104 +1,379 @@
-# Path: src/services/response_generator.py
-"""
-Este módulo contiene una clase que genera respuestas utilizando un modelo de lenguaje generativo.
-"""
-
-import os
-import time
-import google.generativeai as genai
-from src.views.data_view import render_json_response
-from src.logs.config_logger import LoggerConfigurator
-
-# Configuración del logger
-logger = LoggerConfigurator().configure()
-
-class ResponseGenerator:
-    """
-    ResponseGenerator es una clase que genera respuestas utilizando el modelo Gemini AI.
-    """
-
-    def __init__(self):
-        self.api_key = os.getenv('GEMINI_API_KEY')
-        logger.info("API Key obtenida: %s", self.api_key)
-        self._configure_model()
-
-    def _configure_model(self):
-        """
-        Configura el modelo generativo con la API Key y las instrucciones del sistema.
-        """
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(
-            model_name="gemini-1.5-flash",
-            generation_config={
-                "temperature": 1,
-                "top_p": 0.95,
-                "top_k": 40,
-                "max_output_tokens": 8192,
-                "response_mime_type": "text/plain",
-            },
-            system_instruction=self._load_system_instruction(),
-        )
-        logger.info("Modelo generativo configurado: %s", self.model)
-
-    @staticmethod
-    def _load_system_instruction():
-        """
-        Carga las instrucciones del sistema desde el archivo system_instruction.txt.
-        """
-        instruction_file_path = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'system_instruction.txt')
-        instruction_file_path = os.path.abspath(instruction_file_path)
-        logger.info("Buscando system_instruction.txt en: %s", instruction_file_path)
-
-        try:
-            with open(instruction_file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-        except FileNotFoundError:
-            logger.error("Error: El archivo system_instruction.txt no se encontró.")
-            return "Error: El archivo system_instruction.txt no se encontró."
-
-    def generate_response(self, message_input):
-        """
-        Genera una respuesta en base al mensaje de entrada.
-        """
-        logger.info("Generando respuesta para el mensaje: %s", message_input)
-        self._start_chat_session()
-        try:
-            response = self.chat_session.send_message(message_input)
-            logger.info("Respuesta generada: %s", response.text)
-            return response.text
-        except Exception as e:
-            logger.error("Error durante la generación de la respuesta: %s", e)
-            raise
-
-    def generate_response_streaming(self, message_input, chunk_size=30):
-        """
-        Genera una respuesta en base al mensaje de entrada, en bloques de texto.
-        """
-        logger.info("Generando respuesta en modo streaming para el mensaje: %s", message_input)
-        self._start_chat_session()
-        response = self.chat_session.send_message(message_input)
-        offset = 0
-        full_response = ""
-        while offset < len(response.text):
-            chunk = response.text[offset:offset + chunk_size]
-            full_response += chunk
-            self.clear_console()
-            render_json_response(code=200, message=full_response, stream=True)
-            offset += chunk_size
-            time.sleep(0.001)
-        yield full_response
-
-    def _start_chat_session(self):
-        """
-        Inicia una nueva sesión de chat si no existe una.
-        """
-        if not hasattr(self, 'chat_session'):
-            self.chat_session = self.model.start_chat()
-            logger.info("Sesión de chat iniciada.")
-
-    @staticmethod
-    def clear_console():
-        """
-        Limpia la consola según el sistema operativo.
-        """
-        os.system('cls' if os.name == 'nt' else 'clear')
\ No newline at end of file
+# Path: src/services/response_generator.py
+"""
+Este módulo contiene una clase que genera respuestas utilizando un modelo de lenguaje generativo.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from src.logs.config_logger import LoggerConfigurator
+from src.services.context_manager import ConversationContextManager
+from src.services.llm_backend_factory import create_llm_backend
+from src.services.resilient_backend import ResilientBackend
+from src.services.response_cache import ResponseCache
+from src.services.session_store import ChatHistory, ChatSessionStore
+from src.services.single_flight import SingleFlight
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+INSTRUCTION_FILE_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'system_instruction.txt')
+)
+
+class ResponseGenerator:
+    """
+    ResponseGenerator es una clase que genera respuestas utilizando un backend de modelo
+    de lenguaje (por defecto Gemini AI, ver LLM_BACKEND).
+
+    El backend se crea y configura recién en `warm_up`, que se llama en la primera
+    solicitud o antes desde el arranque del servidor, para no importar la librería del
+    modelo al importar el controlador.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self._model_ready = False
+        self._model_lock = threading.Lock()
+        self._instruction_check_interval = float(os.getenv('SYSTEM_INSTRUCTION_CHECK_INTERVAL', '5'))
+        self._instruction_checked_at = time.monotonic()
+        self._instruction_mtime = None
+        self.session_store = ChatSessionStore(ChatHistory)
+        self.context_manager = ConversationContextManager()
+        cache_enabled = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+        self.response_cache = ResponseCache() if cache_enabled else None
+        single_flight_enabled = os.getenv('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'
+        self.single_flight = SingleFlight() if single_flight_enabled else None
+
+    def warm_up(self):
+        """
+        Crea el backend y lo configura con las instrucciones del sistema si todavía no se
+        hizo. Puede llamarse desde varios hilos; solo el primero inicializa.
+        """
+        if self._model_ready:
+            return
+        with self._model_lock:
+            if self._model_ready:
+                return
+            started = time.perf_counter()
+            if self.backend is None:
+                self.backend = create_llm_backend()
+            self._instruction_mtime = self._get_instruction_mtime()
+            self._instruction_checked_at = time.monotonic()
+            self._configure_model()
+            self._model_ready = True
+        logger.info("Modelo de lenguaje inicializado en %.0f ms.", (time.perf_counter() - started) * 1000)
+
+    def start_warm_up(self, mode=None):
+        """
+        Inicializa el modelo según `mode` o la variable de entorno LLM_WARMUP:
+        'background' (por defecto) en un hilo aparte, 'eager' antes de volver y 'lazy'
+        recién en la primera solicitud.
+        """
+        mode = (mode or os.getenv('LLM_WARMUP', 'background')).lower()
+        if mode == 'eager':
+            self.warm_up()
+        elif mode == 'background':
+            threading.Thread(target=self._warm_up_quietly, name='llm-warmup', daemon=True).start()
+
+    def _warm_up_quietly(self):
+        """Ejecuta `warm_up` en segundo plano; si falla, la primera solicitud lo reintenta."""
+        try:
+            self.warm_up()
+        except Exception as e:  # pylint: disable=W0718
+            logger.error("Error al inicializar el modelo de lenguaje en segundo plano: %s", e)
+
+    def _configure_model(self):
+        """
+        Configura el backend con las instrucciones del sistema y calcula la huella de
+        configuración usada por la caché.
+        """
+        self.system_instruction = self._load_system_instruction()
+        self.backend.configure(self.system_instruction)
+        self.config_fingerprint = hashlib.sha256(
+            json.dumps([self.backend.describe(), self.system_instruction],
+                       sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+    @staticmethod
+    def _get_instruction_mtime():
+        """
+        Devuelve la fecha de modificación de system_instruction.txt, o None si no existe.
+        """
+        try:
+            return os.stat(INSTRUCTION_FILE_PATH).st_mtime
+        except OSError:
+            return None
+
+    def _refresh_system_instruction(self):
+        """
+        Reconfigura el modelo e invalida la caché si system_instruction.txt cambió.
+        El archivo se revisa como máximo una vez cada SYSTEM_INSTRUCTION_CHECK_INTERVAL segundos.
+        """
+        if not self._model_ready:
+            self.warm_up()
+            return
+        now = time.monotonic()
+        if now - self._instruction_checked_at < self._instruction_check_interval:
+            return
+        self._instruction_checked_at = now
+        mtime = self._get_instruction_mtime()
+        if mtime == self._instruction_mtime:
+            return
+        self._instruction_mtime = mtime
+        logger.info("system_instruction.txt cambió, reconfigurando el modelo.")
+        self._configure_model()
+        if self.response_cache is not None:
+            self.response_cache.clear()
+
+    def _get_shared_key(self, message_input, user_id, use_cache):
+        """
+        Devuelve la clave con la que el mensaje puede compartirse entre usuarios (caché y
+        agrupación de solicitudes en curso), o None si la respuesta depende del historial.
+        Solo se comparten mensajes de un único turno, es decir, sin una sesión previa del usuario.
+        """
+        if not use_cache or self.session_store.has_session(user_id):
+            return None
+        return ResponseCache.make_key(message_input, self.config_fingerprint)
+
+    @staticmethod
+    def _load_system_instruction():
+        """
+        Carga las instrucciones del sistema desde el archivo system_instruction.txt.
+        """
+        instruction_file_path = INSTRUCTION_FILE_PATH
+        logger.info("Buscando system_instruction.txt en: %s", instruction_file_path)
+
+        try:
+            with open(instruction_file_path, 'r', encoding='utf-8') as file:
+                return file.read()
+        except FileNotFoundError:
+            logger.error("Error: El archivo system_instruction.txt no se encontró.")
+            return "Error: El archivo system_instruction.txt no se encontró."
+
+    def generate_response(self, message_input, user_id=None, use_cache=True):
+        """
+        Genera una respuesta en base al mensaje de entrada, dentro de la sesión del usuario.
+        """
+        logger.debug("Generando respuesta (%d caracteres).", len(message_input))
+        self._refresh_system_instruction()
+        shared_key = self._get_shared_key(message_input, user_id, use_cache)
+        if shared_key is None:
+            return self._send_message(message_input, user_id)
+        if self.response_cache is not None:
+            cached = self.response_cache.get(shared_key)
+            if cached is not None:
+                logger.info("Respuesta obtenida de la caché.")
+                self._record_exchange(message_input, cached, user_id)
+                return cached
+        if self.single_flight is None:
+            return self._send_message(message_input, user_id, shared_key)
+        led = False
+
+        def call_model():
+            nonlocal led
+            led = True
+            return self._send_message(message_input, user_id, shared_key)
+
+        response_text = self.single_flight.do(shared_key, call_model)
+        if not led:
+            # La respuesta salió de la llamada de otra solicitud idéntica.
+            self._record_exchange(message_input, response_text, user_id)
+        return response_text
+
+    def generate_response_streaming(self, message_input, user_id=None, use_cache=True):
+        """
+        Genera una respuesta en base al mensaje de entrada, devolviendo cada fragmento
+        de texto apenas lo entrega el modelo.
+        """
+        logger.debug("Generando respuesta en modo streaming (%d caracteres).", len(message_input))
+        self._refresh_system_instruction()
+        shared_key = self._get_shared_key(message_input, user_id, use_cache)
+        if shared_key is None:
+            yield from self._send_message_streaming(message_input, user_id)
+            return
+        if self.response_cache is not None:
+            cached = self.response_cache.get(shared_key)
+            if cached is not None:
+                logger.info("Respuesta obtenida de la caché.")
+                yield cached
+                self._record_exchange(message_input, cached, user_id)
+                return
+        if self.single_flight is None:
+            yield from self._send_message_streaming(message_input, user_id, shared_key)
+            return
+        led = False
+
+        def call_model():
+            nonlocal led
+            led = True
+            return self._send_message_streaming(message_input, user_id, shared_key)
+
+        parts = []
+        for chunk in self.single_flight.stream(shared_key, call_model):
+            parts.append(chunk)
+            yield chunk
+        if not led:
+            self._record_exchange(message_input, ''.join(parts), user_id)
+
+    def _record_exchange(self, message_input, response_text, user_id):
+        """
+        Agrega a la sesión del usuario un intercambio cuya respuesta no salió de su propia
+        llamada al modelo (caché o solicitud idéntica en curso), para que el turno siguiente
+        tenga el mismo historial que si la hubiera generado.
+        """
+        with self.session_store.acquire(user_id) as history:
+            history.append_exchange(message_input, response_text)
+
+    async def _record_exchange_async(self, message_input, response_text, user_id):
+        """Versión asíncrona de `_record_exchange`."""
+        async with self.session_store.acquire_async(user_id) as history:
+            history.append_exchange(message_input, response_text)
+
+    def _send_message(self, message_input, user_id, cache_key=None):
+        """
+        Envía el mensaje al modelo dentro de la sesión del usuario y guarda la respuesta en caché.
+        """
+        with self.session_store.acquire(user_id) as history:
+            context = self.context_manager.build(history, message_input)
+            try:
+                response_text = self.backend.generate(context, message_input)
+                logger.debug("Respuesta generada (%d caracteres).", len(response_text))
+            except Exception as e:
+                logger.error("Error durante la generación de la respuesta: %s", e)
+                raise
+            history.append_exchange(message_input, response_text)
+        if cache_key is not None and self.response_cache is not None:
+            self.response_cache.put(cache_key, response_text)
+        return response_text
+
+    def _send_message_streaming(self, message_input, user_id, cache_key=None):
+        """
+        Envía el mensaje al modelo en modo streaming y guarda la respuesta completa en caché.
+        """
+        parts = []
+        with self.session_store.acquire(user_id) as history:
+            context = self.context_manager.build(history, message_input)
+            for chunk in self.backend.generate_stream(context, message_input):
+                parts.append(chunk)
+                yield chunk
+            history.append_exchange(message_input, ''.join(parts))
+        if cache_key is not None and self.response_cache is not None:
+            self.response_cache.put(cache_key, ''.join(parts))
+
+    async def generate_response_async(self, message_input, user_id=None, use_cache=True):
+        """
+        Versión asíncrona de `generate_response` para el modo ASGI.
+        """
+        logger.debug("Generando respuesta asíncrona (%d caracteres).", len(message_input))
+        if not self._model_ready:
+            # La primera inicialización importa la librería del modelo; se hace fuera del event loop.
+            await asyncio.to_thread(self.warm_up)
+        self._refresh_system_instruction()
+        shared_key = self._get_shared_key(message_input, user_id, use_cache)
+        if shared_key is None:
+            return await self._send_message_async(message_input, user_id)
+        if self.response_cache is not None:
+            cached = self.response_cache.get(shared_key)
+            if cached is not None:
+                logger.info("Respuesta obtenida de la caché.")
+                await self._record_exchange_async(message_input, cached, user_id)
+                return cached
+        if self.single_flight is None:
+            return await self._send_message_async(message_input, user_id, shared_key)
+        led = False
+
+        def call_model():
+            nonlocal led
+            led = True
+            return self._send_message_async(message_input, user_id, shared_key)
+
+        response_text = await self.single_flight.do_async(shared_key, call_model)
+        if not led:
+            await self._record_exchange_async(message_input, response_text, user_id)
+        return response_text
+
+    async def generate_response_streaming_async(self, message_input, user_id=None, use_cache=True):
+        """
+        Versión asíncrona de `generate_response_streaming` para el modo ASGI.
+        """
+        logger.debug("Generando respuesta asíncrona en modo streaming (%d caracteres).",
+                     len(message_input))
+        if not self._model_ready:
+            # La primera inicialización importa la librería del modelo; se hace fuera del event loop.
+            await asyncio.to_thread(self.warm_up)
+        self._refresh_system_instruction()
+        shared_key = self._get_shared_key(message_input, user_id, use_cache)
+        if shared_key is not None and self.response_cache is not None:
+            cached = self.response_cache.get(shared_key)
+            if cached is not None:
+                logger.info("Respuesta obtenida de la caché.")
+                yield cached
+                await self._record_exchange_async(message_input, cached, user_id)
+                return
+        if shared_key is None or self.single_flight is None:
+            async for chunk in self._send_message_streaming_async(message_input, user_id, shared_key):
+                yield chunk
+            return
+        led = False
+
+        def call_model():
+            nonlocal led
+            led = True
+            return self._send_message_streaming_async(message_input, user_id, shared_key)
+
+        parts = []
+        async for chunk in self.single_flight.stream_async(shared_key, call_model):
+            parts.append(chunk)
+            yield chunk
+        if not led:
+            await self._record_exchange_async(message_input, ''.join(parts), user_id)
+
+    async def _send_message_async(self, message_input, user_id, cache_key=None):
+        """
+        Envía el mensaje al modelo sin bloquear el event loop y guarda la respuesta en caché.
+        """
+        async with self.session_store.acquire_async(user_id) as history:
+            context = self.context_manager.build(history, message_input)
+            try:
+                response_text = await self.backend.generate_async(context, message_input)
+                logger.debug("Respuesta generada (%d caracteres).", len(response_text))
+            except Exception as e:
+                logger.error("Error durante la generación de la respuesta: %s", e)
+                raise
+            history.append_exchange(message_input, response_text)
+        if cache_key is not None and self.response_cache is not None:
+            self.response_cache.put(cache_key, response_text)
+        return response_text
+
+    async def _send_message_streaming_async(self, message_input, user_id, cache_key=None):
+        """
+        Envía el mensaje al modelo en modo streaming sin bloquear el event loop.
+        """
+        parts = []
+        async with self.session_store.acquire_async(user_id) as history:
+            context = self.context_manager.build(history, message_input)
+            async for chunk in self.backend.generate_stream_async(context, message_input):
+                parts.append(chunk)
+                yield chunk
+            history.append_exchange(message_input, ''.join(parts))
+        if cache_key is not None and self.response_cache is not None:
+            self.response_cache.put(cache_key, ''.join(parts))
+
+    def get_stats(self):
+        """
+        Devuelve las métricas del generador de respuestas.
+        """
+        stats = {'backend': self.backend.describe()['backend'] if self._model_ready else None,
+                 'sessions': self.session_store.get_stats(),
+                 'context': self.context_manager.get_stats()}
+        if isinstance(self.backend, ResilientBackend):
+            stats['resilience'] = self.backend.get_stats()
+        if self.response_cache is not None:
+            stats['response_cache'] = self.response_cache.get_stats()
+        if self.single_flight is not None:
+            stats['single_flight'] = self.single_flight.get_stats()
+        return stats
@@ -0,0 +1,204 @@
+"""
+Path: src/services/retention_service.py
+Este módulo aplica la retención de la tabla mensajes: archiva en archivos comprimidos
+los mensajes más antiguos que RETENTION_DAYS y los borra en lotes chicos por rango de
+clave primaria, con pausas entre lotes para no frenar al escritor de conversaciones.
+"""
+
+import io
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, select
+from src.logs.config_logger import LoggerConfigurator
+from src.model.models import Mensaje
+from src.services.conversation_exporter import file_extension, open_compressed
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+ARCHIVE_COLUMNS = (Mensaje.message_id, Mensaje.user_id, Mensaje.role, Mensaje.message, Mensaje.timestamp)
+
+def _serialize(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _sync(archive):
+    """Baja a disco lo escrito en el archivo antes de borrar las filas de la base."""
+    archive.flush()
+    try:
+        os.fsync(archive.fileno())
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        pass
+
+
+class RetentionJob:
+    """
+    RetentionJob recorre mensajes por message_id en lotes de RETENTION_BATCH_SIZE filas
+    (por defecto 500). De cada lote escribe en el archivo los mensajes anteriores al corte
+    (ahora menos RETENTION_DAYS días), lo baja a disco y recién entonces los borra por id
+    en una transacción corta; entre lotes espera RETENTION_BATCH_PAUSE segundos. Como
+    message_id crece con el tiempo, el recorrido termina en el primer lote que empieza
+    con un mensaje vigente.
+
+    El avance queda en la propia tabla: una corrida interrumpida se retoma desde el menor
+    message_id que sigue en la base. Si se corta entre el archivo y el borrado, esas filas
+    se archivan de nuevo en la corrida siguiente (se distinguen por message_id), pero
+    nunca se borra una fila que no se haya archivado.
+
+    - RETENTION_DAYS: antigüedad máxima de los mensajes (por defecto 365).
+    - RETENTION_ARCHIVE_DIR: directorio de los archivos (por defecto data/archive).
+    - RETENTION_ARCHIVE_COMPRESSION: gzip (por defecto), zstd o none.
+    - RETENTION_INTERVAL: segundos entre corridas de `start` (por defecto 86400).
+    """
+
+    def __init__(self, connector, retention_days=None, batch_size=None, batch_pause=None,
+                 archive_dir=None, compression=None, interval=None, schema_ready=None):
+        self.connector = connector
+        self.schema_ready = schema_ready
+        self.retention_days = (retention_days if retention_days is not None
+                               else float(os.getenv('RETENTION_DAYS', '365')))
+        if self.retention_days <= 0:
+            raise ValueError("RETENTION_DAYS debe ser mayor que 0.")
+        self.batch_size = batch_size or int(os.getenv('RETENTION_BATCH_SIZE', '500'))
+        self.batch_pause = (batch_pause if batch_pause is not None
+                            else float(os.getenv('RETENTION_BATCH_PAUSE', '0.2')))
+        self.archive_dir = archive_dir or os.getenv('RETENTION_ARCHIVE_DIR', os.path.join('data', 'archive'))
+        self.compression = (compression or os.getenv('RETENTION_ARCHIVE_COMPRESSION', 'gzip')).lower()
+        self.interval = interval or float(os.getenv('RETENTION_INTERVAL', '86400'))
+        self._stop = threading.Event()
+        self._thread = None
+        self._run_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'runs': 0, 'archived': 0, 'deleted': 0, 'running': False, 'last_run': None,
+                       'last_error': None}
+
+    def _archive_path(self, cutoff):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        name = (f"mensajes-before-{cutoff.strftime('%Y%m%d')}-{datetime.now().strftime('%Y%m%dT%H%M%S')}"
+                f"{file_extension('jsonl', self.compression)}")
+        return os.path.join(self.archive_dir, name)
+
+    def _next_batch(self, after_id):
+        """Lee el siguiente rango de mensajes por clave primaria."""
+        session = self.connector.get_session()
+        try:
+            return session.execute(
+                select(*ARCHIVE_COLUMNS).where(Mensaje.message_id > after_id)
+                .order_by(Mensaje.message_id).limit(self.batch_size)
+            ).all()
+        finally:
+            session.close()
+
+    def _delete(self, message_ids):
+        session = self.connector.get_session()
+        try:
+            deleted = session.execute(delete(Mensaje).where(Mensaje.message_id.in_(message_ids))).rowcount
+            session.commit()
+            return deleted
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def run(self, max_batches=None, dry_run=False):
+        """
+        Archiva y borra los mensajes vencidos.
+
+        :param max_batches: Corta después de esta cantidad de lotes (None = hasta terminar).
+        :param dry_run: Solo cuenta los mensajes vencidos, sin archivar ni borrar.
+        :return: Resumen con filas archivadas y borradas, lotes, segundos y filas por segundo.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            raise RuntimeError("Ya hay una corrida de retención en curso.")
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=self.retention_days)
+        summary = {'cutoff': cutoff.isoformat(), 'archive': None, 'archived': 0, 'deleted': 0,
+                   'batches': 0, 'dry_run': dry_run}
+        archive = None
+        started = time.perf_counter()
+        self._set_stats(running=True)
+        try:
+            after_id = 0
+            reached_window = False
+            while (not reached_window and not self._stop.is_set()
+                   and (max_batches is None or summary['batches'] < max_batches)):
+                rows = self._next_batch(after_id)
+                if not rows:
+                    break
+                # Los ids crecen con el tiempo: se corta en la primera fila dentro de la ventana
+                # de retención. Las filas sin timestamp no se archivan ni detienen la corrida.
+                expired = []
+                for row in rows:
+                    if row.timestamp is not None and row.timestamp >= cutoff:
+                        reached_window = True
+                        break
+                    after_id = row.message_id
+                    if row.timestamp is not None:
+                        expired.append(row)
+                if not expired:
+                    continue
+                summary['batches'] += 1
+                if dry_run:
+                    summary['archived'] += len(expired)
+                    continue
+                if archive is None:
+                    summary['archive'] = self._archive_path(cutoff)
+                    archive = open_compressed(summary['archive'], self.compression)
+                archive.writelines(json.dumps(row._asdict(), ensure_ascii=False, default=_serialize) + '\n'
+                                   for row in expired)
+                _sync(archive)
+                summary['archived'] += len(expired)
+                summary['deleted'] += self._delete([row.message_id for row in expired])
+                if self.batch_pause:
+                    self._stop.wait(self.batch_pause)
+        finally:
+            if archive is not None:
+                archive.close()
+            elapsed = time.perf_counter() - started
+            summary['seconds'] = round(elapsed, 3)
+            summary['rows_per_s'] = round(summary['deleted'] / elapsed, 1) if elapsed else 0.0
+            with self._stats_lock:
+                self._stats['runs'] += 1
+                self._stats['archived'] += summary['archived'] if not dry_run else 0
+                self._stats['deleted'] += summary['deleted']
+                self._stats['running'] = False
+                self._stats['last_run'] = summary
+            self._run_lock.release()
+        logger.info("Retención: %d mensajes anteriores a %s archivados y %d borrados en %.1f s (%.0f filas/s).",
+                    summary['archived'], summary['cutoff'], summary['deleted'], elapsed, summary['rows_per_s'])
+        return summary
+
+    def _set_stats(self, **values):
+        with self._stats_lock:
+            self._stats.update(values)
+
+    def start(self):
+        """Ejecuta `run` en un hilo cada RETENTION_INTERVAL segundos, con el esquema listo."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name='retention', daemon=True)
+        self._thread.start()
+        logger.info("Retención de mensajes programada cada %.0f s (%.0f días).", self.interval, self.retention_days)
+
+    def stop(self):
+        """Detiene el hilo y corta la corrida en curso después del lote actual."""
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            if self.schema_ready is None or self.schema_ready.is_set():
+                try:
+                    self.run()
+                except Exception as e:  # pylint: disable=W0718
+                    self._set_stats(last_error=f"{type(e).__name__}: {e}")
+                    logger.error("Error en la corrida de retención: %s", e)
+                self._stop.wait(self.interval)
+            else:
+                self.schema_ready.wait(1.0)
+
+    def get_stats(self):
+        """Devuelve los totales archivados y borrados y el resumen de la última corrida."""
+        with self._stats_lock:
+            return dict(self._stats)
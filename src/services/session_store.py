@@ -0,0 +1,146 @@
+"""
+Path: src/services/session_store.py
+Este módulo contiene un almacén de sesiones de chat por usuario con capacidad
+limitada, expiración por inactividad (TTL) y expulsión LRU.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from src.logs.config_logger import LoggerConfigurator
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+DEFAULT_SESSION_KEY = '__default__'
+
+class ChatHistory:
+    """
+    Historial de una conversación como lista de turnos `{'role': ..., 'text': ...}`.
+    Los backends de modelo de lenguaje lo reciben en cada llamada. `summary` guarda el
+    resumen de los turnos que ConversationContextManager ya sacó de la ventana.
+    """
+
+    def __init__(self):
+        self.turns = []
+        self.summary = ''
+
+    def append_exchange(self, message, response):
+        """Agrega al historial el mensaje del usuario y la respuesta del modelo."""
+        self.turns.append({'role': 'user', 'text': message})
+        self.turns.append({'role': 'model', 'text': response})
+
+    def __len__(self):
+        return len(self.turns)
+
+
+class ChatSessionEntry:
+    """Sesión de chat de un usuario junto con sus locks y la marca de último acceso."""
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('session', 'lock', 'async_lock', 'last_access')
+
+    def __init__(self, session, now):
+        self.session = session
+        self.lock = threading.Lock()
+        self.async_lock = asyncio.Lock()
+        self.last_access = now
+
+
+class ChatSessionStore:
+    """
+    ChatSessionStore guarda una sesión de chat por usuario.
+
+    Las sesiones se mantienen en orden de último acceso, por lo que tanto la expulsión
+    LRU como la purga por TTL solo miran el extremo más antiguo del diccionario.
+    Cada sesión tiene su propio lock para que dos hilos de Flask no escriban a la vez
+    en el mismo historial.
+    """
+
+    def __init__(self, session_factory, capacity=None, ttl_seconds=None, clock=time.monotonic):
+        """
+        :param session_factory: Función sin argumentos que crea una sesión de chat nueva.
+        :param capacity: Cantidad máxima de sesiones (env CHAT_SESSION_CAPACITY, por defecto 1000).
+        :param ttl_seconds: Segundos de inactividad antes de expirar (env CHAT_SESSION_TTL, por defecto 1800).
+        :param clock: Reloj monotónico usado para medir la inactividad.
+        """
+        self._session_factory = session_factory
+        self.capacity = capacity or int(os.getenv('CHAT_SESSION_CAPACITY', '1000'))
+        self.ttl_seconds = ttl_seconds or float(os.getenv('CHAT_SESSION_TTL', '1800'))
+        self._clock = clock
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions_lru': 0, 'evictions_ttl': 0}
+
+    def _purge_expired(self, now):
+        """Elimina las sesiones inactivas desde la más antigua hasta la primera vigente."""
+        while self._sessions:
+            user_id, entry = next(iter(self._sessions.items()))
+            if now - entry.last_access < self.ttl_seconds:
+                break
+            del self._sessions[user_id]
+            self._stats['evictions_ttl'] += 1
+
+    def _get_entry(self, user_id):
+        """Obtiene la entrada del usuario, creándola y expulsando la menos usada si hace falta."""
+        now = self._clock()
+        with self._lock:
+            self._purge_expired(now)
+            entry = self._sessions.get(user_id)
+            if entry is not None:
+                self._sessions.move_to_end(user_id)
+                entry.last_access = now
+                self._stats['hits'] += 1
+                return entry
+            self._stats['misses'] += 1
+            while len(self._sessions) >= self.capacity:
+                self._sessions.popitem(last=False)
+                self._stats['evictions_lru'] += 1
+        # La sesión se crea fuera del lock global para no serializar a todos los usuarios.
+        new_entry = ChatSessionEntry(self._session_factory(), now)
+        with self._lock:
+            entry = self._sessions.setdefault(user_id, new_entry)
+            if entry is new_entry:
+                logger.info("Sesión de chat iniciada para el usuario %s.", user_id)
+        return entry
+
+    @contextmanager
+    def acquire(self, user_id=None):
+        """
+        Entrega la sesión del usuario con su lock tomado durante todo el bloque `with`.
+        """
+        entry = self._get_entry(user_id or DEFAULT_SESSION_KEY)
+        with entry.lock:
+            yield entry.session
+
+    @asynccontextmanager
+    async def acquire_async(self, user_id=None):
+        """
+        Equivalente de `acquire` para el modo ASGI: espera el lock de la sesión sin
+        bloquear el event loop.
+        """
+        entry = self._get_entry(user_id or DEFAULT_SESSION_KEY)
+        async with entry.async_lock:
+            yield entry.session
+
+    def has_session(self, user_id):
+        """Indica si el usuario tiene una sesión vigente, sin modificar el orden LRU."""
+        with self._lock:
+            entry = self._sessions.get(user_id or DEFAULT_SESSION_KEY)
+            return entry is not None and self._clock() - entry.last_access < self.ttl_seconds
+
+    def discard(self, user_id):
+        """Descarta la sesión del usuario, si existe."""
+        with self._lock:
+            self._sessions.pop(user_id or DEFAULT_SESSION_KEY, None)
+
+    def get_stats(self):
+        """Devuelve los contadores de aciertos, fallos y expulsiones del almacén."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._sessions)
+        stats['capacity'] = self.capacity
+        stats['ttl_seconds'] = self.ttl_seconds
+        return stats
@@ -0,0 +1,297 @@
+"""
+Path: src/services/single_flight.py
+Este módulo agrupa solicitudes idénticas en curso: la primera ejecuta la llamada al
+modelo y las duplicadas concurrentes esperan su resultado (o su stream) en lugar de
+hacer una llamada propia.
+"""
+
+import asyncio
+import os
+import threading
+from src.logs.config_logger import LoggerConfigurator
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+_DONE = object()
+
+class InFlightCall:
+    """
+    Llamada en curso compartida entre el líder y sus seguidores.
+
+    El líder publica cada fragmento; los seguidores en hilos esperan sobre una
+    `threading.Condition` y los seguidores asíncronos reciben los fragmentos en una
+    `asyncio.Queue` propia a través de `call_soon_threadsafe`. Un seguidor que pasa
+    `wait_timeout` segundos sin recibir un fragmento nuevo termina con TimeoutError.
+    """
+
+    def __init__(self, wait_timeout):
+        self.wait_timeout = wait_timeout
+        self._cond = threading.Condition()
+        self._chunks = []
+        self._done = False
+        self._error = None
+        self._async_listeners = []
+        # Consumidores que todavía leen el resultado (líder incluido)
+        self.subscribers = 1
+
+    def publish(self, chunk):
+        """Agrega un fragmento y despierta a todos los seguidores."""
+        with self._cond:
+            self._chunks.append(chunk)
+            self._cond.notify_all()
+            listeners = list(self._async_listeners)
+        for loop, queue in listeners:
+            loop.call_soon_threadsafe(queue.put_nowait, chunk)
+
+    def finish(self, error=None):
+        """Marca la llamada como terminada, opcionalmente con el error del líder."""
+        with self._cond:
+            self._done = True
+            self._error = error
+            self._cond.notify_all()
+            listeners = list(self._async_listeners)
+        for loop, queue in listeners:
+            loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+    def subscribe(self):
+        """Registra un seguidor más."""
+        with self._cond:
+            self.subscribers += 1
+
+    def unsubscribe(self):
+        """Registra que un consumidor dejó de leer; devuelve cuántos quedan."""
+        with self._cond:
+            self.subscribers -= 1
+            return self.subscribers
+
+    def _timeout_error(self):
+        return TimeoutError(f"La solicitud idéntica en curso no entregó datos en {self.wait_timeout:.0f} s.")
+
+    def iter_chunks(self):
+        """Recorre los fragmentos desde el principio, bloqueando el hilo hasta que lleguen."""
+        index = 0
+        try:
+            while True:
+                with self._cond:
+                    if not self._cond.wait_for(lambda: index < len(self._chunks) or self._done,
+                                               self.wait_timeout):
+                        raise self._timeout_error()
+                    pending = self._chunks[index:]
+                    done, error = self._done, self._error
+                index += len(pending)
+                yield from pending
+                if done and index >= len(self._chunks):
+                    if error is not None:
+                        raise error
+                    return
+        finally:
+            self.unsubscribe()
+
+    async def aiter_chunks(self):
+        """Versión asíncrona de `iter_chunks`, para puntos de entrada con event loop."""
+        queue = asyncio.Queue()
+        listener = (asyncio.get_running_loop(), queue)
+        with self._cond:
+            for chunk in self._chunks:
+                queue.put_nowait(chunk)
+            if self._done:
+                queue.put_nowait(_DONE)
+            else:
+                self._async_listeners.append(listener)
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(queue.get(), self.wait_timeout)
+                except asyncio.TimeoutError:
+                    raise self._timeout_error() from None
+                if chunk is _DONE:
+                    break
+                yield chunk
+        finally:
+            with self._cond:
+                if listener in self._async_listeners:
+                    self._async_listeners.remove(listener)
+            self.unsubscribe()
+        if self._error is not None:
+            raise self._error
+
+
+class SingleFlight:
+    """
+    SingleFlight coordina las llamadas en curso por clave y cuenta cuántas llamadas
+    al modelo se ahorraron.
+
+    Si el cliente del líder se desconecta, la llamada sigue para los seguidores que
+    esperan: en modo hilos otro hilo continúa leyendo el stream del líder, y en modo
+    asíncrono la llamada corre desde el principio en una tarea propia, a salvo de la
+    cancelación del líder. Solo se corta cuando ya no queda ningún consumidor.
+    SINGLE_FLIGHT_WAIT_TIMEOUT (por defecto 60) acota los segundos que un seguidor
+    espera cada fragmento.
+    """
+
+    def __init__(self, wait_timeout=None):
+        self.wait_timeout = wait_timeout or float(os.getenv('SINGLE_FLIGHT_WAIT_TIMEOUT', '60'))
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._tasks = set()
+        self._stats = {'leaders': 0, 'coalesced': 0}
+
+    def _join(self, key):
+        """Devuelve la llamada en curso para la clave y si el invocante es el líder."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.subscribe()
+                self._stats['coalesced'] += 1
+                return call, False
+            call = InFlightCall(self.wait_timeout)
+            self._calls[key] = call
+            self._stats['leaders'] += 1
+            return call, True
+
+    def _release(self, key, call):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def do(self, key, fn):
+        """
+        Ejecuta `fn()` una sola vez por clave entre las invocaciones concurrentes
+        y devuelve su resultado a todas.
+        """
+        call, leader = self._join(key)
+        if not leader:
+            logger.info("Solicitud idéntica en curso, esperando su resultado.")
+            return ''.join(call.iter_chunks())
+        try:
+            result = fn()
+        except Exception as e:
+            call.finish(e)
+            raise
+        finally:
+            self._release(key, call)
+        call.publish(result)
+        call.finish()
+        return result
+
+    def stream(self, key, producer):
+        """
+        Devuelve un generador de fragmentos; solo el líder invoca `producer()` y los
+        seguidores reciben los mismos fragmentos a medida que se publican.
+        """
+        call, leader = self._join(key)
+        if not leader:
+            logger.info("Solicitud idéntica en curso, compartiendo su stream.")
+            return call.iter_chunks()
+        return self._lead(key, call, producer)
+
+    def _lead(self, key, call, producer):
+        chunks = producer()
+        handed_off = False
+        try:
+            for chunk in chunks:
+                call.publish(chunk)
+                yield chunk
+        except GeneratorExit:
+            if call.unsubscribe() > 0:
+                # Quedan seguidores: otro hilo sigue leyendo el stream, que está detenido en un yield.
+                handed_off = True
+                logger.info("El cliente líder se desconectó; el stream continúa para los seguidores.")
+                threading.Thread(target=self._drain, args=(key, call, chunks),
+                                 name='single-flight-drain', daemon=True).start()
+                return
+            chunks.close()
+            call.finish(ConnectionError("El cliente que generaba la respuesta se desconectó."))
+            raise
+        except Exception as e:
+            call.finish(e)
+            raise
+        else:
+            call.finish()
+        finally:
+            if not handed_off:
+                self._release(key, call)
+
+    def _drain(self, key, call, chunks):
+        """Termina de leer el stream de un líder desconectado mientras queden seguidores."""
+        try:
+            for chunk in chunks:
+                call.publish(chunk)
+                if call.subscribers <= 0:
+                    chunks.close()
+                    call.finish(ConnectionError("Todos los clientes de la solicitud se desconectaron."))
+                    return
+        except Exception as e:  # pylint: disable=W0718
+            logger.error("Error al continuar el stream compartido: %s", e)
+            call.finish(e)
+        else:
+            call.finish()
+        finally:
+            self._release(key, call)
+
+    def _spawn(self, coro):
+        """Crea una tarea que sobrevive a la cancelación de quien la inició."""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def do_async(self, key, coro_fn):
+        """
+        Equivalente asíncrono de `do`: `coro_fn()` debe devolver una corrutina.
+        """
+        call, leader = self._join(key)
+        if leader:
+            self._spawn(self._run_async(key, call, coro_fn))
+        return ''.join([chunk async for chunk in call.aiter_chunks()])
+
+    async def _run_async(self, key, call, coro_fn):
+        try:
+            result = await coro_fn()
+        except Exception as e:  # pylint: disable=W0718
+            call.finish(e)
+        else:
+            call.publish(result)
+            call.finish()
+        finally:
+            self._release(key, call)
+
+    async def stream_async(self, key, producer):
+        """
+        Equivalente asíncrono de `stream`: `producer()` debe devolver un generador asíncrono.
+        """
+        call, leader = self._join(key)
+        if leader:
+            self._spawn(self._pump_async(key, call, producer))
+        else:
+            logger.info("Solicitud idéntica en curso, compartiendo su stream.")
+        async for chunk in call.aiter_chunks():
+            yield chunk
+
+    async def _pump_async(self, key, call, producer):
+        """Lee el stream del modelo y lo publica hasta terminar o quedarse sin consumidores."""
+        chunks = producer()
+        try:
+            async for chunk in chunks:
+                call.publish(chunk)
+                if call.subscribers <= 0:
+                    call.finish(ConnectionError("Todos los clientes de la solicitud se desconectaron."))
+                    return
+        except asyncio.CancelledError:
+            call.finish(ConnectionError("La llamada compartida se canceló."))
+            raise
+        except Exception as e:  # pylint: disable=W0718
+            call.finish(e)
+        else:
+            call.finish()
+        finally:
+            self._release(key, call)
+            await chunks.aclose()
+
+    def get_stats(self):
+        """Devuelve la cantidad de llamadas líderes, las ahorradas y las que siguen en curso."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+        return stats
@@ -0,0 +1,72 @@
+"""
+Path: src/services/startup_metrics.py
+Este módulo registra la duración de las fases de arranque del servidor y el tiempo
+hasta la primera solicitud y la primera respuesta.
+"""
+
+import threading
+import time
+from src.logs.config_logger import LoggerConfigurator
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+class StartupMetrics:
+    """
+    StartupMetrics mide el arranque desde que se importa este módulo (el primer import
+    de run.py y run_asgi.py). Los tiempos no incluyen el arranque del intérprete; para
+    medirlo desde afuera ver `src/tools/startup_profiler.py --ttfr-command`.
+
+    - `mark(phase)`: registra el fin de una fase (por ejemplo 'imports', 'database', 'ready').
+    - `record_first_request` / `record_first_response`: registran solo la primera vez.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self._phases = {}
+        self._first_request_ms = None
+        self._first_response_ms = None
+
+    def _elapsed_ms(self):
+        return round((self._clock() - self._started) * 1000, 2)
+
+    def mark(self, phase):
+        """Registra el tiempo transcurrido desde el arranque al terminar la fase indicada."""
+        elapsed = self._elapsed_ms()
+        with self._lock:
+            self._phases[phase] = elapsed
+        logger.info("Arranque: fase '%s' completada a los %.0f ms.", phase, elapsed)
+
+    def record_first_request(self):
+        """Registra el tiempo hasta la primera solicitud recibida."""
+        if self._first_request_ms is not None:
+            return
+        with self._lock:
+            if self._first_request_ms is not None:
+                return
+            self._first_request_ms = self._elapsed_ms()
+        logger.info("Primera solicitud recibida a los %.0f ms del arranque.", self._first_request_ms)
+
+    def record_first_response(self):
+        """Registra el tiempo hasta la primera respuesta enviada."""
+        if self._first_response_ms is not None:
+            return
+        with self._lock:
+            if self._first_response_ms is not None:
+                return
+            self._first_response_ms = self._elapsed_ms()
+        logger.info("Primera respuesta enviada a los %.0f ms del arranque.", self._first_response_ms)
+
+    def get_stats(self):
+        """Devuelve las fases de arranque y los tiempos hasta la primera solicitud y respuesta."""
+        with self._lock:
+            return {'phases_ms': dict(self._phases),
+                    'first_request_ms': self._first_request_ms,
+                    'first_response_ms': self._first_response_ms,
+                    'uptime_s': round(self._clock() - self._started, 1)}
+
+
+# Instancia compartida por los scripts de arranque y los controladores
+startup_metrics = StartupMetrics()
@@ -0,0 +1,135 @@
+"""
+Path: src/services/stub_backend.py
+Este módulo contiene un backend local y determinista que simula la latencia y los
+errores de un modelo de lenguaje, para pruebas de carga y benchmarks sin red ni cuota.
+"""
+
+import asyncio
+import hashlib
+import os
+import random
+import threading
+import time
+from src.logs.config_logger import LoggerConfigurator
+from src.services.llm_backend_interface import LLMBackendInterface
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+_WORDS = (
+    "MadyBot", "responde", "de", "forma", "simulada", "a", "tu", "consulta", "sobre",
+    "la", "cooperativa", "y", "sus", "procesos", "de", "producción", "con", "datos", "locales",
+)
+
+_ERRORS = {
+    'connection': lambda: ConnectionError("Error de conexión simulado por el backend stub."),
+    'timeout': lambda: TimeoutError("Tiempo de espera simulado por el backend stub."),
+    'runtime': lambda: RuntimeError("Error de ejecución simulado por el backend stub."),
+}
+
+class StubBackend(LLMBackendInterface):
+    """
+    StubBackend genera respuestas deterministas a partir del mensaje y simula la latencia
+    de un modelo real:
+
+    - TTFT (tiempo hasta el primer token) con distribución log-normal
+      (env STUB_TTFT_MS como mediana y STUB_TTFT_SIGMA como dispersión).
+    - Velocidad de generación en tokens por segundo (env STUB_TOKENS_PER_SEC) y
+      cantidad de tokens por respuesta (env STUB_RESPONSE_TOKENS).
+    - Picos de latencia en la cola con probabilidad STUB_TAIL_PROBABILITY que suman STUB_TAIL_MS.
+    - Errores con probabilidad STUB_ERROR_RATE, de los tipos listados en STUB_ERROR_KINDS
+      (connection, timeout, runtime).
+
+    Los sorteos usan un generador con semilla fija (env STUB_SEED), así que la misma
+    secuencia de solicitudes produce las mismas latencias y errores.
+    """
+
+    def __init__(self, ttft_ms=None, ttft_sigma=None, tokens_per_sec=None, response_tokens=None,
+                 tail_probability=None, tail_ms=None, error_rate=None, error_kinds=None, seed=None):
+        self.ttft_ms = ttft_ms if ttft_ms is not None else float(os.getenv('STUB_TTFT_MS', '300'))
+        self.ttft_sigma = ttft_sigma if ttft_sigma is not None else float(os.getenv('STUB_TTFT_SIGMA', '0.25'))
+        self.tokens_per_sec = tokens_per_sec or float(os.getenv('STUB_TOKENS_PER_SEC', '50'))
+        self.response_tokens = response_tokens or int(os.getenv('STUB_RESPONSE_TOKENS', '60'))
+        self.tail_probability = (tail_probability if tail_probability is not None
+                                 else float(os.getenv('STUB_TAIL_PROBABILITY', '0.01')))
+        self.tail_ms = tail_ms if tail_ms is not None else float(os.getenv('STUB_TAIL_MS', '3000'))
+        self.error_rate = error_rate if error_rate is not None else float(os.getenv('STUB_ERROR_RATE', '0'))
+        kinds = error_kinds or os.getenv('STUB_ERROR_KINDS', 'connection').split(',')
+        self.error_kinds = [kind.strip() for kind in kinds if kind.strip() in _ERRORS]
+        self._random = random.Random(seed if seed is not None else int(os.getenv('STUB_SEED', '42')))
+        self._lock = threading.Lock()
+        self.system_instruction = ''
+
+    def configure(self, system_instruction):
+        """Guarda las instrucciones del sistema; el stub no las usa para generar."""
+        self.system_instruction = system_instruction
+        logger.info("Backend stub configurado (TTFT %.0f ms, %.0f tokens/s, errores %.1f%%).",
+                    self.ttft_ms, self.tokens_per_sec, self.error_rate * 100)
+
+    def describe(self):
+        """Devuelve el nombre del backend y sus parámetros de simulación."""
+        return {
+            'backend': 'stub',
+            'model': 'stub',
+            'config': {
+                'ttft_ms': self.ttft_ms, 'ttft_sigma': self.ttft_sigma,
+                'tokens_per_sec': self.tokens_per_sec, 'response_tokens': self.response_tokens,
+                'tail_probability': self.tail_probability, 'tail_ms': self.tail_ms,
+            },
+        }
+
+    def _plan(self, message):
+        """
+        Sortea la latencia y el posible error de una llamada y arma los tokens de la respuesta.
+
+        :return: Tupla (segundos hasta el primer token, segundos por token, tokens, error o None).
+        """
+        with self._lock:
+            ttft = self.ttft_ms * self._random.lognormvariate(0, self.ttft_sigma) if self.ttft_ms else 0.0
+            if self._random.random() < self.tail_probability:
+                ttft += self.tail_ms
+            error = None
+            if self.error_kinds and self._random.random() < self.error_rate:
+                error = _ERRORS[self._random.choice(self.error_kinds)]()
+        digest = hashlib.sha256(message.encode('utf-8')).digest()
+        tokens = [f"{_WORDS[digest[i % len(digest)] % len(_WORDS)]} " for i in range(self.response_tokens)]
+        tokens[0] = f"[stub] {tokens[0]}"
+        return ttft / 1000.0, 1.0 / self.tokens_per_sec, tokens, error
+
+    def generate(self, history, message):
+        """Genera la respuesta completa esperando el TTFT y el tiempo de todos los tokens."""
+        ttft, per_token, tokens, error = self._plan(message)
+        time.sleep(ttft)
+        if error is not None:
+            raise error
+        time.sleep(per_token * len(tokens))
+        return ''.join(tokens)
+
+    def generate_stream(self, history, message):
+        """Genera la respuesta token por token al ritmo configurado."""
+        ttft, per_token, tokens, error = self._plan(message)
+        time.sleep(ttft)
+        if error is not None:
+            raise error
+        for token in tokens:
+            yield token
+            time.sleep(per_token)
+
+    async def generate_async(self, history, message):
+        """Versión asíncrona de `generate`."""
+        ttft, per_token, tokens, error = self._plan(message)
+        await asyncio.sleep(ttft)
+        if error is not None:
+            raise error
+        await asyncio.sleep(per_token * len(tokens))
+        return ''.join(tokens)
+
+    async def generate_stream_async(self, history, message):
+        """Versión asíncrona de `generate_stream`."""
+        ttft, per_token, tokens, error = self._plan(message)
+        await asyncio.sleep(ttft)
+        if error is not None:
+            raise error
+        for token in tokens:
+            yield token
+            await asyncio.sleep(per_token)
@@ -0,0 +1,167 @@
+"""
+Path: src/services/user_identity_service.py
+Este módulo resuelve el id de usuario que envía el navegador (user_data.id) al
+usuarios.user_id interno, con una caché LRU en memoria y alta masiva de usuarios nuevos.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from sqlalchemy import event, select
+from sqlalchemy.dialects import mysql, sqlite
+from src.logs.config_logger import LoggerConfigurator
+from src.model.models import Usuario
+
+# Configuración del logger
+logger = LoggerConfigurator().configure()
+
+# Filas por sentencia al dar de alta usuarios nuevos
+INSERT_CHUNK_SIZE = 500
+# Clave de session.info con los ids resueltos que esperan el commit
+PENDING_KEY = 'user_identity_pending'
+# Clave de session.info que indica que la sesión ya tiene los listeners de commit y rollback
+LISTENERS_KEY = 'user_identity_listeners'
+
+class UserIdentityService:
+    """
+    UserIdentityService mantiene el mapa id externo -> user_id de los usuarios recientes
+    (USER_IDENTITY_CACHE_SIZE entradas, por defecto 10000, con expulsión LRU).
+
+    Un usuario en caché se resuelve sin ir a la base. Los que faltan se buscan juntos con
+    una consulta sobre el índice único de usuarios.external_id; los que no existen se dan
+    de alta con un solo INSERT que ignora los ids ya insertados por otro proceso (ON
+    DUPLICATE KEY en MySQL, ON CONFLICT en SQLite). Si el motor admite RETURNING el
+    INSERT devuelve los ids nuevos; si no, se leen con una consulta más.
+
+    En las estadísticas `attempted` cuenta los ids enviados al INSERT y `created` los
+    usuarios realmente insertados. `created` solo se mide con RETURNING: en MySQL el
+    rowcount cuenta también los duplicados (CLIENT_FOUND_ROWS) y queda en 0.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or int(os.getenv('USER_IDENTITY_CACHE_SIZE', '10000'))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'attempted': 0, 'created': 0, 'evictions': 0}
+
+    def _cached(self, external_ids):
+        """Devuelve los ids que están en la caché y los que faltan."""
+        resolved, missing = {}, []
+        with self._lock:
+            for external_id in external_ids:
+                user_id = self._entries.get(external_id)
+                if user_id is None:
+                    missing.append(external_id)
+                else:
+                    self._entries.move_to_end(external_id)
+                    resolved[external_id] = user_id
+            self._stats['hits'] += len(resolved)
+            self._stats['misses'] += len(missing)
+        return resolved, missing
+
+    def _remember(self, resolved):
+        with self._lock:
+            for external_id, user_id in resolved.items():
+                self._entries[external_id] = user_id
+                self._entries.move_to_end(external_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    @staticmethod
+    def _select(session, external_ids):
+        return dict(session.execute(
+            select(Usuario.external_id, Usuario.user_id).where(Usuario.external_id.in_(external_ids))
+        ).all())
+
+    @staticmethod
+    def _insert_statement(session, rows):
+        """INSERT de varias filas que no falla si el external_id ya existe."""
+        if session.get_bind().dialect.name == 'mysql':
+            statement = mysql.insert(Usuario).values(rows)
+            return statement.on_duplicate_key_update(external_id=statement.inserted.external_id)
+        return sqlite.insert(Usuario).values(rows).on_conflict_do_nothing(index_elements=['external_id'])
+
+    def _create(self, session, external_ids):
+        """
+        Da de alta los usuarios y devuelve su id externo -> user_id.
+
+        :param external_ids: Ids que la consulta previa no encontró.
+        """
+        returning = session.get_bind().dialect.insert_returning
+        created = {}
+        inserted = 0
+        for offset in range(0, len(external_ids), INSERT_CHUNK_SIZE):
+            chunk = external_ids[offset:offset + INSERT_CHUNK_SIZE]
+            statement = self._insert_statement(
+                session, [{'external_id': external_id, 'username': external_id, 'email': ''}
+                          for external_id in chunk])
+            if returning:
+                # RETURNING solo devuelve las filas insertadas, no las que ya existían
+                rows = session.execute(statement.returning(Usuario.external_id, Usuario.user_id)).all()
+                created.update(rows)
+                inserted += len(rows)
+            else:
+                session.execute(statement)
+        # Sin RETURNING, o filas que otro proceso insertó primero
+        pending = [external_id for external_id in external_ids if external_id not in created]
+        if pending:
+            created.update(self._select(session, pending))
+        with self._lock:
+            self._stats['attempted'] += len(external_ids)
+            self._stats['created'] += inserted
+        return created
+
+    def resolve(self, session, external_ids, create=True):
+        """
+        Resuelve ids externos a usuarios.user_id.
+
+        :param session: Sesión en la que se consulta y, con `create`, se insertan los usuarios
+            nuevos; el commit queda a cargo de quien llama y recién entonces se guardan en caché.
+        :param external_ids: Ids enviados por el navegador.
+        :param create: Si es True se crean los usuarios que no existen; si es False no aparecen
+            en el resultado.
+        :return: Diccionario id externo -> user_id.
+        """
+        resolved, missing = self._cached(dict.fromkeys(external_ids))
+        if not missing:
+            return resolved
+        found = self._select(session, missing)
+        if create:
+            new = [external_id for external_id in missing if external_id not in found]
+            if new:
+                found.update(self._create(session, new))
+        resolved.update(found)
+        if create:
+            self._remember_after_commit(session, found)
+        else:
+            self._remember(found)
+        return resolved
+
+    def _remember_after_commit(self, session, resolved):
+        """
+        Guarda los ids en caché cuando la sesión hace commit: si la transacción se revierte,
+        los usuarios recién insertados no existen y sus user_id no deben quedar en caché.
+        """
+        if not session.info.get(LISTENERS_KEY):
+            # Una sola vez por sesión: PENDING_KEY se vacía en cada commit, esta marca no.
+            session.info[LISTENERS_KEY] = True
+            event.listen(session, 'after_commit',
+                         lambda committed: self._remember(committed.info.pop(PENDING_KEY, {})))
+            event.listen(session, 'after_rollback',
+                         lambda rolled_back: rolled_back.info.pop(PENDING_KEY, None))
+        session.info.setdefault(PENDING_KEY, {}).update(resolved)
+
+    def resolve_one(self, session, external_id, create=False):
+        """Resuelve un único id externo; devuelve None si no existe y `create` es False."""
+        return self.resolve(session, [external_id], create=create).get(external_id)
+
+    def get_stats(self):
+        """Devuelve los contadores de la caché y la tasa de aciertos."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        return stats
@@ -0,0 +1,191 @@
+"""
+Path: src/tools/db_benchmark.py
+Benchmark de los conectores de base de datos.
+
+Para cada backend (`sqlite`, `mysql`) crea usuarios de prueba, inserta mensajes por lotes
+con `bulk_insert` (como ConversationWriter) y consulta páginas del historial desde varios
+hilos con ConversationHistoryService. Informa filas insertadas por segundo, consultas por
+segundo y percentiles de latencia, y al terminar borra las filas de prueba.
+
+SQLite usa un archivo temporal salvo que se indique --sqlite-path. MySQL usa las variables
+DB_* del entorno: conviene apuntarlas a una base de pruebas.
+
+Uso:
+    python -m src.tools.db_benchmark --backends sqlite,mysql --rows 20000 --batch-size 200
+    python -m src.tools.db_benchmark --backends sqlite --output reports/db.json
+    python -m src.tools.db_benchmark --backends sqlite --compare reports/db.json --threshold 0.10
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select
+from src.model.database_connector_factory import create_database_connector, create_table_creator
+from src.model.database_initializer import DatabaseInitializer
+from src.model.models import Mensaje, Usuario
+from src.model.sqlite_database_connector import SQLiteDatabaseConnector
+from src.services.history_service import ConversationHistoryService
+from src.tools.report_utils import environment_info, summarize, write_report, read_report, relative_change
+
+MESSAGE_TEXT = "Para cambiar la bobina, primero detené la máquina y liberá el freno del portabobinas. " * 4
+
+def _create_users(connector, prefix, count):
+    """Crea los usuarios de prueba y devuelve sus ids internos."""
+    session = connector.get_session()
+    try:
+        connector.bulk_insert(session, Usuario, [{'external_id': f"{prefix}{i}", 'username': f"{prefix}{i}",
+                                                  'email': ''} for i in range(count)])
+        session.commit()
+        return dict(session.execute(
+            select(Usuario.external_id, Usuario.user_id).where(Usuario.external_id.like(f"{prefix}%"))
+        ).all())
+    finally:
+        session.close()
+
+def bench_inserts(connector, user_ids, rows, batch_size):
+    """Inserta `rows` mensajes en lotes de `batch_size`, cada lote en su propia transacción."""
+    ids = list(user_ids)
+    base_time = datetime.utcnow()
+    latencies = []
+    started = time.perf_counter()
+    for offset in range(0, rows, batch_size):
+        batch = [{'user_id': ids[i % len(ids)], 'role': 'user' if i % 2 == 0 else 'model',
+                  'message': MESSAGE_TEXT, 'timestamp': base_time + timedelta(milliseconds=i)}
+                 for i in range(offset, min(offset + batch_size, rows))]
+        batch_started = time.perf_counter()
+        session = connector.get_session()
+        try:
+            connector.bulk_insert(session, Mensaje, batch)
+            session.commit()
+        finally:
+            session.close()
+        latencies.append(time.perf_counter() - batch_started)
+    elapsed = time.perf_counter() - started
+    return {'rows': rows, 'rows_per_s': rows / elapsed, 'batch_latency_ms': summarize(latencies)}
+
+def bench_queries(connector, usernames, queries, threads, page_size):
+    """Consulta páginas del historial de usuarios al azar desde `threads` hilos."""
+    history = ConversationHistoryService(connector)
+
+    def _query(_):
+        query_started = time.perf_counter()
+        history.get_page(random.choice(usernames), limit=page_size, descending=True)
+        return time.perf_counter() - query_started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(_query, range(queries)))
+    elapsed = time.perf_counter() - started
+    return {'queries': queries, 'threads': threads, 'queries_per_s': queries / elapsed,
+            'latency_ms': summarize(latencies)}
+
+def _cleanup(connector, user_ids):
+    """Borra los mensajes y usuarios de prueba."""
+    session = connector.get_session()
+    try:
+        ids = list(user_ids)
+        session.execute(delete(Mensaje).where(Mensaje.user_id.in_(ids)))
+        session.execute(delete(Usuario).where(Usuario.user_id.in_(ids)))
+        session.commit()
+    finally:
+        session.close()
+
+def bench_backend(name, args):
+    """Ejecuta el benchmark completo sobre un backend y devuelve sus resultados."""
+    temp_dir = None
+    if name == 'sqlite':
+        path = args.sqlite_path
+        if path is None:
+            temp_dir = tempfile.TemporaryDirectory()
+            path = os.path.join(temp_dir.name, 'bench.db')
+        connector = SQLiteDatabaseConnector(path)
+    else:
+        connector = create_database_connector(name)
+    try:
+        DatabaseInitializer(connector, create_table_creator(name)).initialize_database()
+        prefix = f"bench-{uuid.uuid4().hex[:8]}-"
+        users = _create_users(connector, prefix, args.users)
+        try:
+            inserts = bench_inserts(connector, users.values(), args.rows, args.batch_size)
+            if hasattr(connector, 'optimize'):
+                # Estadísticas del planificador, que MySQL mantiene solo.
+                connector.optimize()
+            queries = bench_queries(connector, list(users), args.queries, args.threads, args.page_size)
+        finally:
+            _cleanup(connector, users.values())
+        return {'insert': inserts, 'query': queries}
+    finally:
+        connector.close_engine()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+def compare_with_baseline(report, baseline, threshold):
+    """
+    Compara el throughput de inserción y de consulta de cada backend con la base y
+    devuelve las métricas que bajaron más que `threshold`.
+    """
+    regressions = []
+    for name, result in report['backends'].items():
+        base = baseline.get('backends', {}).get(name)
+        if 'error' in result or not base or 'error' in base:
+            continue
+        for section, metric in (('insert', 'rows_per_s'), ('query', 'queries_per_s')):
+            current, previous = result[section][metric], base[section][metric]
+            change = relative_change(current, previous)
+            status = "REGRESIÓN" if change < -threshold else "ok"
+            print(f"{name:<7} {metric:<14} {previous:12.0f} -> {current:12.0f} ({change:+.1%}) {status}")
+            if change < -threshold:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Benchmark de inserción y consulta de los conectores de base de datos.")
+    parser.add_argument('--backends', default='sqlite,mysql', help="Backends a medir, separados por coma.")
+    parser.add_argument('--rows', type=int, default=20000, help="Mensajes a insertar.")
+    parser.add_argument('--batch-size', type=int, default=200, help="Mensajes por transacción.")
+    parser.add_argument('--users', type=int, default=100, help="Usuarios de prueba.")
+    parser.add_argument('--queries', type=int, default=2000, help="Páginas del historial a consultar.")
+    parser.add_argument('--threads', type=int, default=4, help="Hilos que consultan en paralelo.")
+    parser.add_argument('--page-size', type=int, default=50, help="Mensajes por página.")
+    parser.add_argument('--sqlite-path', default=None, help="Archivo SQLite (por defecto uno temporal).")
+    parser.add_argument('--output', default=None, help="Guardar el reporte JSON en este archivo.")
+    parser.add_argument('--compare', default=None, help="Comparar contra un reporte guardado.")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Caída de throughput tolerada antes de fallar.")
+    args = parser.parse_args(argv)
+
+    report = {'environment': environment_info(), 'backends': {},
+              'parameters': {'rows': args.rows, 'batch_size': args.batch_size, 'users': args.users,
+                             'queries': args.queries, 'threads': args.threads, 'page_size': args.page_size}}
+    for name in [name.strip() for name in args.backends.split(',') if name.strip()]:
+        try:
+            result = bench_backend(name, args)
+        except Exception as e:  # pylint: disable=W0718
+            print(f"{name:<7} omitido: {e}")
+            report['backends'][name] = {'error': str(e)}
+            continue
+        report['backends'][name] = result
+        print(f"{name:<7} inserción {result['insert']['rows_per_s']:10.0f} filas/s "
+              f"(lote p50 {result['insert']['batch_latency_ms']['p50']:.2f} ms)   "
+              f"consulta {result['query']['queries_per_s']:8.0f} consultas/s "
+              f"(p50 {result['query']['latency_ms']['p50']:.2f} ms, p99 {result['query']['latency_ms']['p99']:.2f} ms)")
+
+    if args.output:
+        write_report(args.output, report)
+        print(f"Reporte guardado en {args.output}")
+    if args.compare:
+        regressions = compare_with_baseline(report, read_report(args.compare), args.threshold)
+        if regressions:
+            print(f"Métricas con regresión: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Path: src/tools/export_conversations.py
+Exporta las tablas mensajes o usuarios para análisis fuera de línea con
+ConversationExporter, usando el conector de DB_BACKEND y las variables del .env.
+
+Con --watermark cada corrida exporta solo las filas nuevas desde la anterior, salvo las
+de los últimos EXPORT_WATERMARK_LAG segundos que quedan para la siguiente, y deja un
+archivo por corrida (el nombre incluye la fecha si --output es un directorio).
+
+Uso:
+    python -m src.tools.export_conversations --table mensajes --output exports/ --watermark exports/mensajes.json
+    python -m src.tools.export_conversations --table usuarios --format parquet --compression zstd --output exports/usuarios.parquet
+    python -m src.tools.export_conversations --since 2024-01-01 --until 2024-02-01 --output exports/enero.jsonl.gz
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+from src.model.database_connector_factory import create_database_connector
+from src.services.conversation_exporter import (
+    COMPRESSIONS, EXPORT_TABLES, FORMATS, ConversationExporter, file_extension
+)
+
+def _output_path(output, table, export_format, compression):
+    """Si `output` es un directorio, arma un nombre con la tabla y la fecha de la corrida."""
+    if output.endswith(os.sep) or os.path.isdir(output):
+        os.makedirs(output, exist_ok=True)
+        name = f"{table}-{datetime.now().strftime('%Y%m%dT%H%M%S')}{file_extension(export_format, compression)}"
+        return os.path.join(output, name)
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    return output
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Exportación por bloques de mensajes y usuarios.")
+    parser.add_argument('--table', choices=sorted(EXPORT_TABLES), default='mensajes', help="Tabla a exportar.")
+    parser.add_argument('--format', dest='export_format', choices=FORMATS, default='jsonl', help="Formato del archivo.")
+    parser.add_argument('--compression', choices=COMPRESSIONS, default='gzip', help="Compresión del archivo.")
+    parser.add_argument('--output', required=True, help="Archivo de salida, o directorio terminado en '/'.")
+    parser.add_argument('--watermark', default=None, help="Archivo JSON con la marca de agua incremental.")
+    parser.add_argument('--since', type=datetime.fromisoformat, default=None,
+                        help="Solo filas con timestamp mayor o igual (ISO 8601).")
+    parser.add_argument('--until', type=datetime.fromisoformat, default=None,
+                        help="Solo filas con timestamp menor (ISO 8601).")
+    parser.add_argument('--batch-size', type=int, default=None, help="Filas por bloque (por defecto EXPORT_BATCH_SIZE).")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    path = _output_path(args.output, args.table, args.export_format, args.compression)
+    connector = create_database_connector()
+    try:
+        summary = ConversationExporter(connector, batch_size=args.batch_size).export(
+            path, table=args.table, export_format=args.export_format, compression=args.compression,
+            watermark_path=args.watermark, since=args.since, until=args.until)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        connector.close_engine()
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Path: src/tools/load_generator.py
+Generador de carga de punta a punta para la API HTTP de MadyBot.
+
+Envía a una instancia en ejecución payloads realistas de /receive-data (con
+user_data.browserData y stream activado o no) a un ritmo objetivo (RPS, lazo abierto)
+o con una concurrencia fija (lazo cerrado), y reporta latencias por percentiles, TTFB
+del modo streaming, errores por código de estado y throughput.
+
+Uso:
+    python -m src.tools.load_generator --url http://127.0.0.1:5000 --concurrency 20 --duration 60
+    python -m src.tools.load_generator --url https://127.0.0.1:5000 --insecure --rps 50 \\
+        --stream-ratio 0.5 --output reports/load.json --compare reports/baseline.json
+"""
+
+import argparse
+import http.client
+import json
+import random
+import ssl
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from src.tools.report_utils import (
+    summarize, environment_info, write_report, read_report, relative_change
+)
+
+PROMPTS = (
+    "Hola",
+    "Hola, ¿cómo estás?",
+    "¿Qué es Madygraf?",
+    "¿Cuál es el horario de atención?",
+    "¿Cómo cambio la bobina de papel en la máquina?",
+    "Explicame el proceso de impresión paso a paso.",
+    "¿Qué hago si la guillotina se traba?",
+    "Necesito ayuda con el mantenimiento preventivo de la rotativa.",
+    "¿Dónde encuentro el manual de seguridad?",
+    "Gracias",
+)
+BROWSERS = (
+    {"userAgent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0", "screenResolution": "1920x1080",
+     "language": "es-AR", "platform": "Win32"},
+    {"userAgent": "Mozilla/5.0 (Linux; Android 14) Mobile Safari/537.36", "screenResolution": "412x915",
+     "language": "es-AR", "platform": "Linux armv8l"},
+    {"userAgent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_2) Safari/605.1.15", "screenResolution": "1440x900",
+     "language": "es-ES", "platform": "MacIntel"},
+)
+
+class RequestResult:
+    """Resultado de una solicitud individual."""
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('stream', 'status', 'latency', 'ttfb', 'error')
+
+    def __init__(self, stream, status=None, latency=None, ttfb=None, error=None):
+        self.stream = stream
+        self.status = status
+        self.latency = latency
+        self.ttfb = ttfb
+        self.error = error
+
+
+class LoadGenerator:
+    """
+    LoadGenerator reproduce tráfico de /receive-data contra una instancia en ejecución.
+    """
+
+    def __init__(self, base_url, concurrency=10, rps=None, duration=30.0, total_requests=None,
+                 stream_ratio=0.0, users=100, timeout=120.0, insecure=False, seed=1234,
+                 path='/receive-data'):
+        parsed = urlparse(base_url)
+        self.scheme = parsed.scheme or 'http'
+        self.host = parsed.hostname or '127.0.0.1'
+        self.port = parsed.port or (443 if self.scheme == 'https' else 80)
+        self.path = path
+        self.concurrency = concurrency
+        self.rps = rps
+        self.duration = duration
+        self.total_requests = total_requests
+        self.stream_ratio = stream_ratio
+        self.users = users
+        self.timeout = timeout
+        self.seed = seed
+        self._ssl_context = ssl._create_unverified_context() if insecure else None  # pylint: disable=protected-access
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._results = []
+        self._results_lock = threading.Lock()
+        self._issued = 0
+
+    def _build_payload(self):
+        """Arma un payload con el formato de DataSchema, sorteando prompt, usuario y modo."""
+        with self._rng_lock:
+            user_index = self._rng.randrange(self.users)
+            prompt = self._rng.choice(PROMPTS)
+            stream = self._rng.random() < self.stream_ratio
+        return {
+            "prompt_user": prompt,
+            "user_data": {"id": f"load-{user_index}", "browserData": BROWSERS[user_index % len(BROWSERS)]},
+            "stream": stream,
+            "datetime": int(time.time()),
+        }
+
+    def _connection(self):
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout,
+                                               context=self._ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _send(self, payload):
+        """Envía una solicitud y mide la latencia total y, en streaming, el primer evento."""
+        stream = payload['stream']
+        body = json.dumps(payload).encode('utf-8')
+        connection = self._connection()
+        start = time.perf_counter()
+        try:
+            connection.request('POST', self.path, body=body,
+                               headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            ttfb = None
+            if stream and response.status == 200:
+                response.readline()
+                ttfb = time.perf_counter() - start
+            response.read()
+            return RequestResult(stream, response.status, time.perf_counter() - start, ttfb)
+        except (OSError, http.client.HTTPException) as e:
+            return RequestResult(stream, latency=time.perf_counter() - start, error=type(e).__name__)
+        finally:
+            connection.close()
+
+    def _record(self, result):
+        with self._results_lock:
+            self._results.append(result)
+
+    def _next_ticket(self, deadline):
+        """Reserva el turno de la próxima solicitud o devuelve False si la prueba terminó."""
+        with self._results_lock:
+            if self.total_requests is not None and self._issued >= self.total_requests:
+                return False
+            if self.total_requests is None and time.perf_counter() >= deadline:
+                return False
+            self._issued += 1
+            return True
+
+    def _closed_loop_worker(self, deadline):
+        while self._next_ticket(deadline):
+            self._record(self._send(self._build_payload()))
+
+    def _run_closed_loop(self, deadline):
+        threads = [threading.Thread(target=self._closed_loop_worker, args=(deadline,), daemon=True)
+                   for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _run_open_loop(self, deadline):
+        """Programa las solicitudes a intervalos fijos, sin esperar a que terminen las anteriores."""
+        interval = 1.0 / self.rps
+        next_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while self._next_ticket(deadline):
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(lambda: self._record(self._send(self._build_payload())))
+                next_at += interval
+
+    def run(self):
+        """Ejecuta la prueba y devuelve el reporte."""
+        start = time.perf_counter()
+        deadline = start + self.duration
+        if self.rps:
+            self._run_open_loop(deadline)
+        else:
+            self._run_closed_loop(deadline)
+        return self.build_report(time.perf_counter() - start)
+
+    def build_report(self, elapsed):
+        """Agrega los resultados en un reporte serializable a JSON."""
+        results = list(self._results)
+        report = {
+            'config': {
+                'target': f"{self.scheme}://{self.host}:{self.port}{self.path}",
+                'mode': 'open_loop' if self.rps else 'closed_loop',
+                'rps': self.rps, 'concurrency': self.concurrency, 'duration': self.duration,
+                'total_requests': self.total_requests, 'stream_ratio': self.stream_ratio,
+                'users': self.users, 'seed': self.seed,
+            },
+            'environment': environment_info(),
+            'elapsed_s': elapsed,
+            'requests': len(results),
+            'throughput_rps': len(results) / elapsed if elapsed else 0.0,
+            'status_codes': dict(Counter(str(r.status) for r in results if r.status is not None)),
+            'errors': dict(Counter(r.error for r in results if r.error is not None)),
+            'latency_ms': summarize([r.latency for r in results]),
+            'ttfb_ms': summarize([r.ttfb for r in results if r.ttfb is not None]),
+        }
+        ok = [r for r in results if r.status is not None and r.status < 400]
+        report['success_rate'] = len(ok) / len(results) if results else 0.0
+        report['by_mode'] = {
+            'stream': summarize([r.latency for r in results if r.stream]),
+            'normal': summarize([r.latency for r in results if not r.stream]),
+        }
+        return report
+
+
+def print_report(report, baseline=None):
+    """Imprime un resumen legible del reporte y, si hay base, las diferencias relativas."""
+    print(f"Objetivo: {report['config']['target']} ({report['config']['mode']})")
+    print(f"Solicitudes: {report['requests']} en {report['elapsed_s']:.1f} s "
+          f"-> {report['throughput_rps']:.2f} req/s, éxito {report['success_rate']:.1%}")
+    print(f"Códigos de estado: {report['status_codes']}  Errores: {report['errors']}")
+    for section in ('latency_ms', 'ttfb_ms'):
+        stats = report[section]
+        if not stats.get('count'):
+            continue
+        line = "  ".join(f"{key}={stats[key]:.1f}" for key in ('p50', 'p90', 'p99', 'max'))
+        print(f"{section}: {line}")
+        if baseline and baseline.get(section, {}).get('count'):
+            deltas = "  ".join(
+                f"{key}={relative_change(stats[key], baseline[section][key]):+.1%}"
+                for key in ('p50', 'p90', 'p99', 'max')
+            )
+            print(f"{section} vs base: {deltas}")
+    if baseline:
+        change = relative_change(report['throughput_rps'], baseline.get('throughput_rps'))
+        if change is not None:
+            print(f"throughput vs base: {change:+.1%}")
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Generador de carga para la API de MadyBot.")
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help="URL base de la instancia.")
+    parser.add_argument('--path', default='/receive-data', help="Ruta a ejercitar.")
+    parser.add_argument('--concurrency', type=int, default=10,
+                        help="Solicitudes simultáneas (lazo cerrado) o workers máximos (con --rps).")
+    parser.add_argument('--rps', type=float, default=None, help="Ritmo objetivo en solicitudes por segundo.")
+    parser.add_argument('--duration', type=float, default=30.0, help="Duración de la prueba en segundos.")
+    parser.add_argument('--requests', type=int, default=None, help="Cantidad total de solicitudes (ignora --duration).")
+    parser.add_argument('--stream-ratio', type=float, default=0.0, help="Proporción de solicitudes con stream=true.")
+    parser.add_argument('--users', type=int, default=100, help="Cantidad de user_data.id distintos.")
+    parser.add_argument('--timeout', type=float, default=120.0, help="Timeout por solicitud en segundos.")
+    parser.add_argument('--seed', type=int, default=1234, help="Semilla para los payloads.")
+    parser.add_argument('--insecure', action='store_true', help="No verificar el certificado HTTPS.")
+    parser.add_argument('--output', default=None, help="Archivo JSON donde guardar el reporte.")
+    parser.add_argument('--compare', default=None, help="Reporte JSON previo contra el cual comparar.")
+    args = parser.parse_args(argv)
+
+    generator = LoadGenerator(
+        args.url, concurrency=args.concurrency, rps=args.rps, duration=args.duration,
+        total_requests=args.requests, stream_ratio=args.stream_ratio, users=args.users,
+        timeout=args.timeout, insecure=args.insecure, seed=args.seed, path=args.path,
+    )
+    report = generator.run()
+    print_report(report, read_report(args.compare) if args.compare else None)
+    if args.output:
+        write_report(args.output, report)
+        print(f"Reporte guardado en {args.output}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+"""
+Path: src/tools/micro_benchmarks.py
+Micro-benchmarks del camino de cada solicitud, sin el modelo de lenguaje.
+
+Mide por separado cada etapa que recorre /receive-data (validación con marshmallow,
+render_json_response/jsonify, los logger.info con el payload completo frente al evento
+estructurado de RequestEventLogger y los filtros InfoErrorFilter/ExcludeHTTPLogsFilter) y el camino completo con el cliente de pruebas
+de Flask y el backend stub. Los tiempos se toman como en timeit (mejor y mediana de
+varias repeticiones) y las asignaciones de memoria con tracemalloc.
+
+Uso:
+    python -m src.tools.micro_benchmarks --repeat 7 --number 2000 --save-baseline reports/bench.json
+    python -m src.tools.micro_benchmarks --compare reports/bench.json --threshold 0.10
+"""
+
+import argparse
+import gc
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from src.tools.report_utils import environment_info, write_report, read_report, relative_change
+
+# El camino completo usa el backend stub sin latencia y sin caché, para medir solo el servidor.
+os.environ.setdefault('LLM_BACKEND', 'stub')
+os.environ.setdefault('STUB_TTFT_MS', '0')
+os.environ.setdefault('STUB_TAIL_PROBABILITY', '0')
+os.environ.setdefault('STUB_TOKENS_PER_SEC', '1000000000')
+os.environ.setdefault('RESPONSE_CACHE_ENABLED', 'false')
+
+SAMPLE_PAYLOAD = {
+    "prompt_user": "¿Cómo cambio la bobina de papel en la máquina?",
+    "user_data": {
+        "id": "bench-user",
+        "browserData": {
+            "userAgent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0",
+            "screenResolution": "1920x1080",
+            "language": "es-AR",
+            "platform": "Win32",
+        },
+    },
+    "stream": False,
+    "datetime": 1730000000,
+}
+SAMPLE_RESPONSE = "Para cambiar la bobina, primero detené la máquina y liberá el freno del portabobinas. " * 20
+
+def _bench_logger():
+    """
+    Logger aislado con el formato y los filtros del proyecto que escribe a os.devnull,
+    para medir el costo de formateo y filtrado sin depender de la consola ni del disco.
+    """
+    # pylint: disable=import-outside-toplevel
+    from src.logs.exclude_http_logs_filter import ExcludeHTTPLogsFilter
+    from src.logs.info_error_filter import InfoErrorFilter
+    bench_logger = logging.getLogger('madybot.bench')
+    bench_logger.propagate = False
+    bench_logger.setLevel(logging.DEBUG)
+    for handler in list(bench_logger.handlers):
+        bench_logger.removeHandler(handler)
+    handler = logging.StreamHandler(open(os.devnull, 'w', encoding='utf-8'))  # pylint: disable=consider-using-with
+    handler.setFormatter(logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"))
+    handler.addFilter(ExcludeHTTPLogsFilter())
+    handler.addFilter(InfoErrorFilter())
+    bench_logger.addHandler(handler)
+    return bench_logger
+
+def stage_validate():
+    """DataSchemaValidator.validate con los esquemas anidados."""
+    from src.services.data_validator import DataSchemaValidator  # pylint: disable=import-outside-toplevel
+    validator = DataSchemaValidator()
+    return lambda: validator.validate(SAMPLE_PAYLOAD)
+
+def stage_render():
+    """render_json_response (jsonify) dentro de un contexto de aplicación Flask."""
+    # pylint: disable=import-outside-toplevel
+    from flask import Flask
+    from src.views.data_view import render_json_response
+    app = Flask(__name__)
+    context = app.app_context()
+    context.push()
+    return lambda: render_json_response(200, SAMPLE_RESPONSE)
+
+def stage_log_payloads():
+    """
+    Referencia: los logger.info que hacía cada solicitud antes del evento estructurado
+    (payload, datos validados, respuesta generada y dict de respuesta).
+    """
+    bench_logger = _bench_logger()
+    response = {"response_MadyBot": SAMPLE_RESPONSE, "response_MadyBot_stream": None}
+    def run():
+        bench_logger.info("Request JSON: \n| %s \n", SAMPLE_PAYLOAD)
+        bench_logger.info("Datos validados: %s", SAMPLE_PAYLOAD)
+        bench_logger.info("Generated: \n| %s", SAMPLE_RESPONSE)
+        bench_logger.info("response: %s", response)
+    return run
+
+def stage_log_event():
+    """El evento estructurado que reemplaza a los logs con el payload completo."""
+    # pylint: disable=import-outside-toplevel
+    from src.logs.request_event_logger import RequestEventLogger
+    event_logger = RequestEventLogger(_bench_logger(), sample_rate=0.0)
+    def run():
+        started = event_logger.start()
+        event_logger.emit('POST /receive-data', 200, started, SAMPLE_PAYLOAD, response=SAMPLE_RESPONSE)
+    return run
+
+def stage_filters():
+    """InfoErrorFilter y ExcludeHTTPLogsFilter aplicados a un registro con el payload."""
+    # pylint: disable=import-outside-toplevel
+    from src.logs.exclude_http_logs_filter import ExcludeHTTPLogsFilter
+    from src.logs.info_error_filter import InfoErrorFilter
+    record = logging.LogRecord('bench', logging.INFO, __file__, 0,
+                               "Request JSON: \n| %s \n", (SAMPLE_PAYLOAD,), None)
+    info_error_filter = InfoErrorFilter()
+    http_filter = ExcludeHTTPLogsFilter()
+    def run():
+        info_error_filter.filter(record)
+        http_filter.filter(record)
+    return run
+
+def stage_end_to_end():
+    """POST /receive-data completo con el cliente de pruebas de Flask y el backend stub."""
+    # pylint: disable=import-outside-toplevel
+    from flask import Flask
+    from src.controllers.data_controller import data_controller
+    app = Flask(__name__)
+    app.register_blueprint(data_controller)
+    client = app.test_client()
+    def run():
+        response = client.post('/receive-data', json=SAMPLE_PAYLOAD)
+        if response.status_code != 200:
+            raise RuntimeError(f"Respuesta inesperada: {response.status_code}")
+    return run
+
+STAGES = {
+    'validate': stage_validate,
+    'render_json': stage_render,
+    'log_payloads': stage_log_payloads,
+    'log_event': stage_log_event,
+    'log_filters': stage_filters,
+    'end_to_end': stage_end_to_end,
+}
+
+def time_stage(func, repeat, number, warmup):
+    """
+    Mide `func` como timeit: `repeat` repeticiones de `number` llamadas, con el recolector
+    de basura desactivado durante cada medición.
+
+    :return: Diccionario con el mejor tiempo, la mediana y la dispersión por operación en µs.
+    """
+    for _ in range(warmup):
+        func()
+    per_op = []
+    for _ in range(repeat):
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            elapsed = time.perf_counter() - start
+        finally:
+            if gc_enabled:
+                gc.enable()
+        per_op.append(elapsed / number * 1e6)
+    return {
+        'best_us': min(per_op),
+        'median_us': statistics.median(per_op),
+        'stdev_us': statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        'repeat': repeat,
+        'number': number,
+    }
+
+def measure_allocations(func, number):
+    """
+    Mide con tracemalloc los bloques y bytes asignados por operación y el pico de memoria.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base_current, _ = tracemalloc.get_traced_memory()
+        for _ in range(number):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    diff = after.compare_to(before, 'filename')
+    allocated_blocks = sum(stat.count_diff for stat in diff if stat.count_diff > 0)
+    allocated_bytes = sum(stat.size_diff for stat in diff if stat.size_diff > 0)
+    return {
+        'net_blocks_per_op': allocated_blocks / number,
+        'net_bytes_per_op': allocated_bytes / number,
+        'peak_bytes': peak - base_current,
+    }
+
+def run_benchmarks(stage_names, repeat, number, warmup, allocations, app_logging=False):
+    """Ejecuta las etapas indicadas y devuelve el reporte."""
+    results = {}
+    for name in stage_names:
+        func = STAGES[name]()
+        if not app_logging:
+            # Se aplica después de preparar la etapa porque importar el controlador
+            # vuelve a cargar logging.yaml. Así la consola y sistema.log no dominan la
+            # medición; el costo del logging se mide aparte en log_payloads y log_filters.
+            logging.getLogger().setLevel(logging.WARNING)
+        result = time_stage(func, repeat, number, warmup)
+        if allocations:
+            result.update(measure_allocations(func, max(1, number // 10)))
+        results[name] = result
+        print(f"{name:<14} best {result['best_us']:10.2f} µs   median {result['median_us']:10.2f} µs"
+              + (f"   {result['net_blocks_per_op']:8.1f} bloques/op" if allocations else ""))
+    return {'environment': environment_info(), 'stages': results}
+
+def compare_with_baseline(report, baseline, threshold):
+    """
+    Compara la mediana de cada etapa con la base y devuelve las etapas que empeoraron
+    más que `threshold` (por ejemplo 0.10 = 10 %).
+    """
+    regressions = []
+    for name, result in report['stages'].items():
+        base = baseline.get('stages', {}).get(name)
+        if not base:
+            continue
+        change = relative_change(result['median_us'], base['median_us'])
+        status = "REGRESIÓN" if change > threshold else "ok"
+        print(f"{name:<14} {base['median_us']:10.2f} -> {result['median_us']:10.2f} µs ({change:+.1%}) {status}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Micro-benchmarks del camino de cada solicitud.")
+    parser.add_argument('--stages', default=','.join(STAGES), help="Etapas a medir, separadas por coma.")
+    parser.add_argument('--repeat', type=int, default=7, help="Cantidad de repeticiones.")
+    parser.add_argument('--number', type=int, default=1000, help="Llamadas por repetición.")
+    parser.add_argument('--warmup', type=int, default=100, help="Llamadas de calentamiento.")
+    parser.add_argument('--no-allocations', action='store_true', help="No medir asignaciones con tracemalloc.")
+    parser.add_argument('--with-app-logging', action='store_true',
+                        help="Mantener el logging de la aplicación en el camino completo.")
+    parser.add_argument('--save-baseline', default=None, help="Guardar el reporte como base en este archivo.")
+    parser.add_argument('--compare', default=None, help="Comparar contra una base guardada.")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Empeoramiento tolerado antes de fallar.")
+    args = parser.parse_args(argv)
+
+    stage_names = [name.strip() for name in args.stages.split(',') if name.strip()]
+    unknown = [name for name in stage_names if name not in STAGES]
+    if unknown:
+        parser.error(f"Etapas desconocidas: {', '.join(unknown)}")
+    report = run_benchmarks(stage_names, args.repeat, args.number, args.warmup,
+                            not args.no_allocations, args.with_app_logging)
+    if args.save_baseline:
+        write_report(args.save_baseline, report)
+        print(f"Base guardada en {args.save_baseline}")
+    if args.compare:
+        regressions = compare_with_baseline(report, read_report(args.compare), args.threshold)
+        if regressions:
+            print(f"Etapas con regresión: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
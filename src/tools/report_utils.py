@@ -0,0 +1,72 @@
+"""
+Path: src/tools/report_utils.py
+Este módulo contiene utilidades compartidas por las herramientas de medición:
+resúmenes de latencia por percentiles y lectura/escritura de reportes JSON.
+"""
+
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+
+def percentile(sorted_values, q):
+    """
+    Calcula el percentil `q` (0-100) de una lista ya ordenada, interpolando linealmente.
+    """
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+def summarize(values, scale=1000.0):
+    """
+    Resume una lista de duraciones en segundos como percentiles en milisegundos.
+
+    :param values: Duraciones en segundos.
+    :param scale: Factor de conversión (por defecto a milisegundos).
+    :return: Diccionario con count, mean, p50, p90, p99, min y max.
+    """
+    ordered = sorted(v * scale for v in values)
+    if not ordered:
+        return {'count': 0}
+    return {
+        'count': len(ordered),
+        'mean': sum(ordered) / len(ordered),
+        'p50': percentile(ordered, 50),
+        'p90': percentile(ordered, 90),
+        'p99': percentile(ordered, 99),
+        'min': ordered[0],
+        'max': ordered[-1],
+    }
+
+def environment_info():
+    """Describe el entorno de la medición para poder comparar reportes entre máquinas."""
+    return {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+    }
+
+def write_report(path, report):
+    """Escribe el reporte como JSON con formato legible."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2, sort_keys=True)
+
+def read_report(path):
+    """Lee un reporte JSON escrito con `write_report`."""
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def relative_change(current, baseline):
+    """Devuelve el cambio relativo de `current` respecto de `baseline`, o None si no aplica."""
+    if current is None or not baseline:
+        return None
+    return (current - baseline) / baseline
@@ -0,0 +1,53 @@
+"""
+Path: src/tools/retention.py
+Ejecuta una corrida de RetentionJob: archiva en archivos comprimidos y borra por lotes
+los mensajes más antiguos que --days, usando el conector de DB_BACKEND y las variables
+del .env. El servidor puede hacer lo mismo periódicamente con RETENTION_ENABLED=true.
+
+Uso:
+    python -m src.tools.retention --days 365 --dry-run
+    python -m src.tools.retention --days 365 --batch-size 500 --pause 0.2 --archive-dir data/archive
+"""
+
+import argparse
+import json
+import sys
+from dotenv import load_dotenv
+from src.model.database_connector_factory import create_database_connector
+from src.services.conversation_exporter import COMPRESSIONS
+from src.services.retention_service import RetentionJob
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Archivo y borrado por lotes de mensajes vencidos.")
+    parser.add_argument('--days', type=float, default=None, help="Antigüedad máxima (por defecto RETENTION_DAYS).")
+    parser.add_argument('--batch-size', type=int, default=None, help="Filas por lote (por defecto RETENTION_BATCH_SIZE).")
+    parser.add_argument('--pause', type=float, default=None,
+                        help="Segundos de pausa entre lotes (por defecto RETENTION_BATCH_PAUSE).")
+    parser.add_argument('--archive-dir', default=None, help="Directorio de los archivos (por defecto RETENTION_ARCHIVE_DIR).")
+    parser.add_argument('--compression', choices=COMPRESSIONS, default=None,
+                        help="Compresión del archivo (por defecto RETENTION_ARCHIVE_COMPRESSION).")
+    parser.add_argument('--max-batches', type=int, default=None, help="Cortar después de esta cantidad de lotes.")
+    parser.add_argument('--dry-run', action='store_true', help="Solo contar los mensajes vencidos.")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    connector = create_database_connector()
+    try:
+        job = RetentionJob(connector, retention_days=args.days, batch_size=args.batch_size,
+                           batch_pause=args.pause, archive_dir=args.archive_dir, compression=args.compression)
+        summary = job.run(max_batches=args.max_batches, dry_run=args.dry_run)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    except KeyboardInterrupt:
+        print("Interrumpido: la próxima corrida retoma desde los mensajes que siguen en la base.")
+        return 130
+    finally:
+        connector.close_engine()
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Path: src/tools/startup_profiler.py
+Perfil del arranque del servidor.
+
+Resume la salida de `python -X importtime` al importar un módulo (por defecto el
+controlador de Flask) en un proceso nuevo: tiempo total de imports, los módulos más
+caros por tiempo acumulado y propio, y el tiempo propio agrupado por paquete. Con
+--ttfr-command además lanza el servidor y mide el tiempo hasta la primera respuesta
+exitosa de --url (time-to-first-request), incluyendo el arranque del intérprete.
+
+Uso:
+    python -m src.tools.startup_profiler --module run --top 15
+    python -m src.tools.startup_profiler --ttfr-command "python run_asgi.py" --output reports/startup.json
+    python -m src.tools.startup_profiler --ttfr-command "python run.py" --compare reports/startup.json
+"""
+
+import argparse
+import os
+import re
+import shlex
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from src.tools.report_utils import environment_info, write_report, read_report, relative_change
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def parse_import_times(stderr_text):
+    """
+    Interpreta las líneas de `-X importtime`.
+
+    :return: Lista de diccionarios con module, self_us, cumulative_us y depth (nivel de
+        anidamiento del import, 0 para los imports directos).
+    """
+    entries = []
+    for line in stderr_text.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            entries.append({
+                'module': match.group(4),
+                'self_us': int(match.group(1)),
+                'cumulative_us': int(match.group(2)),
+                'depth': (len(match.group(3)) - 1) // 2,
+            })
+    return entries
+
+def profile_imports(module, python=sys.executable):
+    """
+    Importa `module` en un intérprete nuevo con `-X importtime`.
+
+    :return: Tupla (entradas de parse_import_times, duración total del proceso en segundos).
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=False
+    )
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError(f"No se pudo importar {module}: " + '\n'.join(errors[-5:]))
+    return parse_import_times(completed.stderr), elapsed
+
+def summarize_imports(entries, top):
+    """
+    Resume las entradas de `-X importtime`: total, los `top` módulos más caros por tiempo
+    acumulado y por tiempo propio, y el tiempo propio agrupado por paquete de primer nivel.
+    """
+    by_package = {}
+    for entry in entries:
+        package = entry['module'].split('.')[0]
+        by_package[package] = by_package.get(package, 0) + entry['self_us']
+    packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+
+    def _rows(key):
+        ordered = sorted(entries, key=lambda entry: entry[key], reverse=True)[:top]
+        return [{'module': entry['module'], 'ms': round(entry[key] / 1000, 2)} for entry in ordered]
+
+    return {
+        'modules': len(entries),
+        'total_import_ms': round(sum(entry['self_us'] for entry in entries) / 1000, 2),
+        'top_cumulative': _rows('cumulative_us'),
+        'top_self': _rows('self_us'),
+        'packages': [{'package': name, 'ms': round(us / 1000, 2)} for name, us in packages[:top]],
+    }
+
+def measure_time_to_first_request(command, url, timeout=60.0, poll_interval=0.05):
+    """
+    Lanza `command` y consulta `url` hasta recibir una respuesta exitosa.
+
+    :return: Segundos desde el lanzamiento hasta la primera respuesta.
+    :raises RuntimeError: Si el proceso termina o se agota `timeout` antes de responder.
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(shlex.split(command), cwd=PROJECT_ROOT,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"El servidor terminó con código {process.returncode} antes de responder.")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status < 400:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(poll_interval)
+        raise RuntimeError(f"El servidor no respondió en {url} dentro de {timeout:.0f} s.")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+def print_import_summary(summary):
+    """Muestra el resumen de imports como tablas de texto."""
+    print(f"Imports: {summary['modules']} módulos, {summary['total_import_ms']:.1f} ms en total")
+    for title, key, label in (("Acumulado", 'top_cumulative', 'module'),
+                              ("Propio", 'top_self', 'module'),
+                              ("Por paquete", 'packages', 'package')):
+        print(f"\n{title}:")
+        for row in summary[key]:
+            print(f"  {row['ms']:10.2f} ms  {row[label]}")
+
+def compare_with_baseline(report, baseline, threshold):
+    """
+    Compara el tiempo total de imports y el time-to-first-request con la base y devuelve
+    las métricas que empeoraron más que `threshold`.
+    """
+    regressions = []
+    metrics = (('total_import_ms', report['imports']['total_import_ms'],
+                baseline.get('imports', {}).get('total_import_ms')),
+               ('time_to_first_request_ms', report.get('time_to_first_request_ms'),
+                baseline.get('time_to_first_request_ms')))
+    for name, current, base in metrics:
+        change = relative_change(current, base)
+        if change is None:
+            continue
+        status = "REGRESIÓN" if change > threshold else "ok"
+        print(f"{name:<26} {base:10.1f} -> {current:10.1f} ms ({change:+.1%}) {status}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Perfil de imports y time-to-first-request del servidor.")
+    parser.add_argument('--module', default='src.controllers.data_controller',
+                        help="Módulo a importar con -X importtime.")
+    parser.add_argument('--top', type=int, default=15, help="Cantidad de filas por tabla.")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Repeticiones; se informa la más rápida para reducir el ruido.")
+    parser.add_argument('--ttfr-command', default=None,
+                        help="Comando que inicia el servidor para medir el time-to-first-request.")
+    parser.add_argument('--url', default='http://127.0.0.1:5000/health-check',
+                        help="URL consultada para detectar la primera respuesta.")
+    parser.add_argument('--timeout', type=float, default=60.0, help="Espera máxima del servidor en segundos.")
+    parser.add_argument('--output', default=None, help="Guardar el reporte JSON en este archivo.")
+    parser.add_argument('--compare', default=None, help="Comparar contra un reporte guardado.")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Empeoramiento tolerado antes de fallar.")
+    args = parser.parse_args(argv)
+
+    runs = [profile_imports(args.module) for _ in range(max(1, args.repeat))]
+    entries, process_seconds = min(runs, key=lambda run: sum(entry['self_us'] for entry in run[0]))
+    summary = summarize_imports(entries, args.top)
+    print_import_summary(summary)
+    report = {'environment': environment_info(), 'module': args.module,
+              'import_process_ms': round(process_seconds * 1000, 2), 'imports': summary}
+
+    if args.ttfr_command:
+        ttfr = min(measure_time_to_first_request(args.ttfr_command, args.url, args.timeout)
+                   for _ in range(max(1, args.repeat)))
+        report['time_to_first_request_ms'] = round(ttfr * 1000, 2)
+        print(f"\nTime-to-first-request: {ttfr * 1000:.0f} ms ({args.ttfr_command})")
+
+    if args.output:
+        write_report(args.output, report)
+        print(f"Reporte guardado en {args.output}")
+    if args.compare:
+        regressions = compare_with_baseline(report, read_report(args.compare), args.threshold)
+        if regressions:
+            print(f"Métricas con regresión: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Path: src/views/asgi_view.py
+Este módulo genera las respuestas HTTP del modo ASGI con el mismo formato
+que las vistas de Flask en data_view.
+"""
+
+import asyncio
+import json
+from src.logs.config_logger import LoggerConfigurator
+from src.views.stream_format import format_stream_event
+
+logger = LoggerConfigurator().configure()
+
+async def _send_body(send, status, body, content_type, extra_headers=None):
+    """Envía una respuesta completa con cuerpo en un solo mensaje ASGI."""
+    headers = [
+        (b'content-type', content_type.encode('latin-1')),
+        (b'content-length', str(len(body)).encode('latin-1')),
+        (b'access-control-allow-origin', b'*'),
+    ]
+    headers.extend(extra_headers or [])
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+async def send_json(send, code, payload, extra_headers=None):
+    """
+    Envía un objeto arbitrario serializado como JSON.
+
+    :param send: Callable `send` de ASGI.
+    :param code: Código de estado HTTP.
+    :param payload: Objeto serializable a JSON.
+    :param extra_headers: Encabezados adicionales como lista de tuplas de bytes.
+    """
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    await _send_body(send, code, body, 'application/json', extra_headers)
+
+async def send_json_response(send, code, message, extra_headers=None):
+    """
+    Envía la respuesta JSON estándar de MadyBot.
+
+    :param send: Callable `send` de ASGI.
+    :param code: Código de estado HTTP.
+    :param message: Mensaje a incluir en `response_MadyBot`.
+    :param extra_headers: Encabezados adicionales como lista de tuplas de bytes.
+    """
+    response = {
+        "response_MadyBot": message,
+        "response_MadyBot_stream": None
+    }
+    await send_json(send, code, response, extra_headers)
+
+async def send_rejection_response(send, code, message, retry_after):
+    """
+    Envía la respuesta de una solicitud no admitida (429 o 503) con Retry-After.
+
+    :param send: Callable `send` de ASGI.
+    :param code: Código de estado HTTP.
+    :param message: Mensaje a incluir en `response_MadyBot`.
+    :param retry_after: Segundos sugeridos para reintentar.
+    """
+    await send_json_response(send, code, message,
+                             [(b'retry-after', str(retry_after).encode('latin-1'))])
+
+async def send_empty_response(send, code=200):
+    """Envía una respuesta sin cuerpo (por ejemplo para HEAD)."""
+    await _send_body(send, code, b'', 'text/plain')
+
+async def send_redirect(send, location):
+    """Envía una redirección 302 a la URL indicada."""
+    await _send_body(send, 302, b'', 'text/plain', [(b'location', (location or '/').encode('utf-8'))])
+
+async def send_stream_response(send, chunks, ndjson=False):
+    """
+    Envía una respuesta en streaming a partir de un generador asíncrono de fragmentos.
+
+    Cada `await send(...)` espera a que el servidor acepte el fragmento, de modo que un
+    cliente lento frena la lectura del modelo (backpressure).
+
+    :param send: Callable `send` de ASGI.
+    :param chunks: Generador asíncrono de fragmentos de texto.
+    :param ndjson: Si es True se usa NDJSON en lugar de Server-Sent Events.
+    """
+    mimetype = 'application/x-ndjson' if ndjson else 'text/event-stream'
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', mimetype.encode('latin-1')),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+            (b'access-control-allow-origin', b'*'),
+        ],
+    })
+    sent = 0
+    try:
+        async for chunk in chunks:
+            sent += len(chunk)
+            event = format_stream_event(
+                {"response_MadyBot": None, "response_MadyBot_stream": chunk}, "delta", ndjson
+            )
+            await send({'type': 'http.response.body', 'body': event.encode('utf-8'), 'more_body': True})
+    except OSError as e:
+        logger.info("El cliente se desconectó durante el streaming: %s", e)
+        return
+    except Exception as e:  # pylint: disable=W0718
+        logger.error("Error durante el streaming de la respuesta: %s", e)
+        event = format_stream_event(
+            {"response_MadyBot": "Error durante la generación de la respuesta.",
+             "response_MadyBot_stream": None, "error": True}, "error", ndjson
+        )
+        await send({'type': 'http.response.body', 'body': event.encode('utf-8')})
+        return
+    finally:
+        await chunks.aclose()
+    logger.info("Streaming finalizado: %d caracteres enviados.", sent)
+    event = format_stream_event({"response_MadyBot": None, "response_MadyBot_stream": None,
+                                 "done": True}, "done", ndjson)
+    await send({'type': 'http.response.body', 'body': event.encode('utf-8')})
+
+async def send_batch_stream_response(send, results):
+    """
+    Envía los resultados de un lote como NDJSON, uno por línea, en orden de finalización.
+
+    :param send: Callable `send` de ASGI.
+    :param results: Generador asíncrono de resultados por item.
+    """
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'application/x-ndjson'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+            (b'access-control-allow-origin', b'*'),
+        ],
+    })
+    try:
+        async for result in results:
+            line = json.dumps(result, ensure_ascii=False) + "\n"
+            await send({'type': 'http.response.body', 'body': line.encode('utf-8'), 'more_body': True})
+    except OSError as e:
+        logger.info("El cliente se desconectó durante el lote: %s", e)
+        return
+    finally:
+        await results.aclose()
+    await send({'type': 'http.response.body', 'body': b''})
+
+async def send_ndjson_stream_response(send, batches):
+    """
+    Envía como NDJSON los objetos de un generador síncrono de bloques (por ejemplo, filas
+    leídas de la base de datos). Cada bloque se obtiene en un hilo para no bloquear el
+    event loop y se envía en un único mensaje.
+
+    :param send: Callable `send` de ASGI.
+    :param batches: Generador síncrono de listas de objetos serializables a JSON.
+    """
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'application/x-ndjson'),
+            (b'cache-control', b'no-cache'),
+            (b'access-control-allow-origin', b'*'),
+        ],
+    })
+    try:
+        while True:
+            batch = await asyncio.to_thread(next, batches, None)
+            if batch is None:
+                break
+            body = ''.join(json.dumps(item, ensure_ascii=False) + "\n" for item in batch)
+            await send({'type': 'http.response.body', 'body': body.encode('utf-8'), 'more_body': True})
+    except OSError as e:
+        logger.info("El cliente se desconectó durante la exportación: %s", e)
+        return
+    finally:
+        await asyncio.to_thread(batches.close)
+    await send({'type': 'http.response.body', 'body': b''})
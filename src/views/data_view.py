@@ -1,37 +1,156 @@
-"""
-Path: src/views/data_view.py
-"""
-
-from flask import jsonify
-from src.logs.config_logger import LoggerConfigurator
-
-
-logger = LoggerConfigurator().configure()
-
-def render_json_response(code, message, stream = False):
-    """
-    Genera una respuesta JSON estándar con metadatos adicionales.
-    
-    :param data: Datos a incluir en la respuesta.
-    :param status: Estado de la respuesta (por defecto "success").
-    :param code: Código de estado HTTP (por defecto 200).
-    :param message: Mensaje adicional para la respuesta.
-    :param detailed: Indica si la respuesta debe ser detallada (por defecto False).
-    :return: Respuesta JSON.
-    """
-    if not stream:
-        response = {
-            "response_MadyBot": message,
-            "response_MadyBot_stream": None
-        }
-
-        logger.info("response: %s", response)
-        return jsonify(response), code
-    else:
-        response = {
-            "response_MadyBot": None,
-            "response_MadyBot_stream": message
-        }
-
-        logger.info("response: %s", response)
-        return jsonify(response), code
+"""
+Path: src/views/data_view.py
+"""
+
+import json
+from flask import jsonify, Response, stream_with_context
+from src.logs.config_logger import LoggerConfigurator
+from src.views.stream_format import format_stream_event
+
+
+logger = LoggerConfigurator().configure()
+
+def render_json_response(code, message, stream = False):
+    """
+    Genera una respuesta JSON estándar con metadatos adicionales.
+    
+    :param data: Datos a incluir en la respuesta.
+    :param status: Estado de la respuesta (por defecto "success").
+    :param code: Código de estado HTTP (por defecto 200).
+    :param message: Mensaje adicional para la respuesta.
+    :param detailed: Indica si la respuesta debe ser detallada (por defecto False).
+    :return: Respuesta JSON.
+    """
+    if not stream:
+        response = {
+            "response_MadyBot": message,
+            "response_MadyBot_stream": None
+        }
+        return jsonify(response), code
+    else:
+        response = {
+            "response_MadyBot": None,
+            "response_MadyBot_stream": message
+        }
+        return jsonify(response), code
+
+def render_rejection_response(code, message, retry_after):
+    """
+    Genera la respuesta JSON estándar de una solicitud no admitida (429 o 503) con el
+    encabezado Retry-After.
+
+    :param code: Código de estado HTTP.
+    :param message: Mensaje a incluir en `response_MadyBot`.
+    :param retry_after: Segundos sugeridos para reintentar.
+    :return: Respuesta JSON.
+    """
+    response, code = render_json_response(code, message, stream=False)
+    response.headers['Retry-After'] = str(retry_after)
+    return response, code
+
+def render_stats_response(stats, code=200):
+    """
+    Genera una respuesta JSON con las métricas internas del servidor.
+
+    :param stats: Diccionario con las métricas a exponer.
+    :param code: Código de estado HTTP (por defecto 200).
+    :return: Respuesta JSON.
+    """
+    return jsonify(stats), code
+
+def render_batch_response(results, code=200):
+    """
+    Genera la respuesta JSON de un lote con el resultado de cada item.
+
+    :param results: Lista de resultados por item, ordenada por índice.
+    :param code: Código de estado HTTP (por defecto 200).
+    :return: Respuesta JSON.
+    """
+    return jsonify({"results": results}), code
+
+def render_ndjson_stream_response(items):
+    """
+    Genera una respuesta NDJSON en streaming con un objeto JSON por línea.
+
+    :param items: Iterable de objetos serializables a JSON.
+    :return: Respuesta Flask en streaming.
+    """
+    def item_stream():
+        try:
+            for item in items:
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+        finally:
+            close = getattr(items, 'close', None)
+            if close is not None:
+                close()
+
+    return Response(
+        stream_with_context(item_stream()),
+        status=200,
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def render_batch_stream_response(results):
+    """
+    Genera una respuesta NDJSON en streaming con un resultado de item por línea,
+    en el orden en que se completan.
+
+    :param results: Iterable de resultados por item.
+    :return: Respuesta Flask en streaming.
+    """
+    return render_ndjson_stream_response(results)
+
+def render_history_response(page, code=200):
+    """
+    Genera la respuesta JSON de una página del historial de conversaciones.
+
+    :param page: Diccionario con `items` y `next_cursor`.
+    :param code: Código de estado HTTP (por defecto 200).
+    :return: Respuesta JSON.
+    """
+    return jsonify(page), code
+
+def render_stream_response(chunks, ndjson=False):
+    """
+    Genera una respuesta HTTP en streaming a partir de un iterable de fragmentos de texto.
+
+    Cada fragmento se envía al cliente apenas se produce. Como el servidor WSGI consume
+    el generador a medida que escribe en el socket, un cliente lento frena la lectura
+    del modelo (backpressure) en lugar de acumular el texto en memoria.
+
+    :param chunks: Iterable de fragmentos de texto (deltas) de la respuesta.
+    :param ndjson: Si es True se usa NDJSON en lugar de Server-Sent Events.
+    :return: Respuesta Flask en streaming.
+    """
+    def event_stream():
+        sent = 0
+        try:
+            for chunk in chunks:
+                sent += len(chunk)
+                yield format_stream_event(
+                    {"response_MadyBot": None, "response_MadyBot_stream": chunk}, "delta", ndjson
+                )
+        except Exception as e:  # pylint: disable=W0718
+            logger.error("Error durante el streaming de la respuesta: %s", e)
+            yield format_stream_event(
+                {"response_MadyBot": "Error durante la generación de la respuesta.",
+                 "response_MadyBot_stream": None, "error": True}, "error", ndjson
+            )
+            return
+        finally:
+            # Si el cliente se desconecta se cierra el generador original y se liberan sus recursos.
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+        logger.info("Streaming finalizado: %d caracteres enviados.", sent)
+        yield format_stream_event({"response_MadyBot": None, "response_MadyBot_stream": None,
+                             "done": True}, "done", ndjson)
+
+    mimetype = 'application/x-ndjson' if ndjson else 'text/event-stream'
+    return Response(
+        stream_with_context(event_stream()),
+        status=200,
+        mimetype=mimetype,
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
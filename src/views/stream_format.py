@@ -0,0 +1,16 @@
+"""
+Path: src/views/stream_format.py
+Este módulo serializa los eventos del stream. Lo comparten las vistas de Flask y de
+ASGI; no importa Flask para que el modo ASGI no lo cargue.
+"""
+
+import json
+
+def format_stream_event(payload, event, ndjson):
+    """
+    Serializa un evento del stream como Server-Sent Event o como una línea NDJSON.
+    """
+    body = json.dumps(payload, ensure_ascii=False)
+    if ndjson:
+        return f"{body}\n"
+    return f"event: {event}\ndata: {body}\n\n"